@@ -10,4 +10,39 @@ COLOR_EXPENSE = "#C0392B"
 COLOR_NET = "#2980B9"
 
 # Other settings
-DEFAULT_GEOMETRY = "1600x900" 
\ No newline at end of file
+DEFAULT_GEOMETRY = "1600x900"
+
+# Columns kept after analysis, in display order
+ANALYSIS_COLUMNS = ["Accounting date", "Description", "Amount", "Category"]
+
+# Categorization: worker processes for analysis (1 = serial) and descriptions per worker task
+ANALYSIS_WORKERS = 1
+ANALYSIS_CHUNK_SIZE = 50_000
+
+# Parsed-workbook cache size cap (bytes); least recently used workbooks are evicted above it
+WORKBOOK_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Milliseconds between two polls of a background task's progress queue by the GUI
+TASK_POLL_MS = 50
+
+# Rows searched for the statement's header row when loading a workbook
+HEADER_SNIFF_ROWS = 50
+
+# Milliseconds the search box waits after the last keystroke before filtering
+SEARCH_DEBOUNCE_MS = 150
+
+# Filtered views (rows, category summary and totals) kept for quick switching between filters
+FILTER_CACHE_SIZE = 32
+
+# Virtualized tables: row height in pixels, rows rendered past the viewport, and rows per mouse-wheel step
+TABLE_ROW_HEIGHT = 25
+TABLE_BUFFER_ROWS = 5
+TABLE_WHEEL_ROWS = 3
+
+# Accounting date formats, tried in order for each value: unambiguous year-first formats, then the numeric
+# formats for day-first (default; set "dayfirst": false in a bank profile for month-first) statements.
+# A bank profile may give one explicit "date_format" instead.
+ISO_DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d", "%Y%m%d")
+DAY_FIRST_DATE_FORMATS = ("%d.%m.%Y", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%y")
+MONTH_FIRST_DATE_FORMATS = ("%d.%m.%Y", "%m/%d/%Y", "%m-%d-%Y", "%d.%m.%y")  # Dotted dates are day-first anyway
+DEFAULT_DAYFIRST = True
@@ -9,11 +9,11 @@ with open(KEYWORDS_FILE, "r", encoding="utf-8") as f:
     old_keywords = json.load(f)
 
 # --- Step 2: Convert to new nested structure ---
-# The new structure is: {category: {"exact": [list of exact matches], "contains": []}}
+# The new structure is: {category: {"exact": [list of exact matches], "prefix": [], "contains": []}}
 new_keywords = {}
 for description, category in old_keywords.items():
     if category not in new_keywords:
-        new_keywords[category] = {"exact": [], "contains": []}
+        new_keywords[category] = {"exact": [], "prefix": [], "contains": []}
     # Add the description to the 'exact' list for this category
     if description not in new_keywords[category]["exact"]:
         new_keywords[category]["exact"].append(description)
@@ -24,7 +24,9 @@ with open(KEYWORDS_FILE, "w", encoding="utf-8") as f:
 
 # --- Comments ---
 # 1. The script loads the old flat dictionary where each key is a description and each value is a category.
-# 2. It creates a new dictionary where each key is a category, and the value is a dict with 'exact' and 'contains' lists.
-# 3. All old descriptions are added to the 'exact' list for their category. The 'contains' list is left empty for manual editing later.
+# 2. It creates a new dictionary where each key is a category, and the value is a dict with 'exact', 'prefix' and 'contains' lists.
+# 3. All old descriptions are added to the 'exact' list for their category. The 'prefix' and 'contains' lists are left empty for manual editing later.
+#    'prefix' entries match any description that starts with them (e.g. "PAYPAL *OPENAI" for every card reference variant);
+#    they are case-sensitive, checked after 'exact' and before 'contains', and the longest matching prefix wins.
 # 4. The script then overwrites the original keywords.json with the new nested structure.
 # 5. You can run this script once to migrate your keywords file to the new format. 
\ No newline at end of file
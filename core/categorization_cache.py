@@ -0,0 +1,83 @@
+# file: core/categorization_cache.py
+import json
+import os
+from typing import Optional, Tuple
+
+from core import data_processor
+from core.lru_cache import LRUCache
+
+DEFAULT_MAX_ENTRIES = 50_000
+# Bumped whenever the stored entry layout changes; files with another version are ignored
+CACHE_FORMAT_VERSION = 2
+
+
+class CategorizationCache:
+    """
+    Disk-backed description -> matched rule cache tagged with the fingerprint of the keywords map it was built for.
+    The rule is stored as its (category, rule_type, value) key, or () when no rule matched, so cached
+    descriptions still count towards per-rule statistics.
+    Descriptions are stored verbatim, because exact rules are case- and whitespace-sensitive.
+    Entries are kept in LRU order and the least recently used ones are dropped above max_entries.
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, path_pattern: Optional[str] = None):
+        """Create an unbound cache; call bind() with a keywords fingerprint before use."""
+        self.path_pattern = path_pattern or data_processor.CATEGORIZATION_CACHE_PATTERN
+        self.fingerprint: Optional[str] = None
+        self.entries = LRUCache(max_entries)
+        self.dirty = False
+
+    @property
+    def path(self) -> Optional[str]:
+        """Path of the cache file for the bound fingerprint."""
+        if self.fingerprint is None:
+            return None
+        return self.path_pattern.format(self.fingerprint)
+
+    def bind(self, fingerprint: str) -> None:
+        """Switch to the cache of the given keywords fingerprint, loading it from disk if needed."""
+        if fingerprint == self.fingerprint:
+            return
+        self.fingerprint = fingerprint
+        self.entries.clear()
+        self.dirty = False
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if data.get("fingerprint") != fingerprint or data.get("version") != CACHE_FORMAT_VERSION:
+            return
+        # Entries are stored least recently used first, so re-inserting them restores the LRU order
+        for description, rule in data.get("entries", []):
+            self.entries.put(description, tuple(rule))
+
+    def get(self, description: str) -> Optional[Tuple[str, ...]]:
+        """Return the cached rule key (() for uncategorized) or None if the description is unknown."""
+        return self.entries.get(description)
+
+    def put(self, description: str, rule: Tuple[str, ...]) -> None:
+        """Cache the rule key that decided a description (() if none matched)."""
+        self.entries.put(description, tuple(rule))
+        self.dirty = True
+
+    def save(self) -> None:
+        """
+        Write the cache to disk (if it changed). Cache files of other keyword maps are kept: the map saved on
+        disk may differ from the one in memory, and save_keywords drops the stale ones when the map is saved.
+        """
+        if self.fingerprint is None or not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = {
+            "version": CACHE_FORMAT_VERSION,
+            "fingerprint": self.fingerprint,
+            "entries": [[description, list(rule)] for description, rule in self.entries.items()],
+        }
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return len(self.entries)
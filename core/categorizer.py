@@ -0,0 +1,503 @@
+# file: core/categorizer.py
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.categorization_cache import CategorizationCache
+from core.data_processor import keywords_fingerprint
+from core.prefix_trie import PrefixTrie
+from config.constants import ANALYSIS_CHUNK_SIZE, ANALYSIS_WORKERS
+
+# Rule id returned when no rule matches a description
+NO_RULE = -1
+
+# Patterns referring to group numbers, or setting flags for the whole pattern, cannot share a combined pattern
+_UNCOMBINABLE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(|\(\?[aiLmsux]+\)")
+
+# A rule is identified by (category, rule_type, value), e.g. ("Subscription", "exact", "COMVIQ.SE")
+RuleKey = Tuple[str, str, str]
+
+
+@dataclass
+class RuleStats:
+    """
+    Instrumentation of a categorization run: matched rows per rule and per category,
+    and the wall time spent in each pass (summed over workers in parallel mode).
+    """
+    rule_hits: Dict[RuleKey, int] = field(default_factory=dict)
+    category_hits: Dict[str, int] = field(default_factory=dict)
+    pass_seconds: Dict[str, float] = field(default_factory=lambda: {"exact": 0.0, "prefix": 0.0, "contains": 0.0})
+    rows: int = 0
+    uncategorized_rows: int = 0
+
+    def add_timing(self, pass_name: str, seconds: float) -> None:
+        """Add the wall time of one pass."""
+        self.pass_seconds[pass_name] = self.pass_seconds.get(pass_name, 0.0) + seconds
+
+    def merge_timings(self, pass_seconds: Dict[str, float]) -> None:
+        """Add the pass timings collected elsewhere (e.g. in a worker process)."""
+        for pass_name, seconds in pass_seconds.items():
+            self.add_timing(pass_name, seconds)
+
+    def add_hits(self, matcher: "KeywordMatcher", rule_ids: np.ndarray, weights: np.ndarray) -> None:
+        """Count weights[i] matched rows for rule rule_ids[i] (NO_RULE counts as uncategorized)."""
+        hits = np.bincount(rule_ids + 1, weights=weights, minlength=len(matcher.rules) + 1)
+        self.rows += int(weights.sum())
+        self.uncategorized_rows += int(hits[0])
+        for rule_id in np.flatnonzero(hits[1:]):
+            rule = matcher.rules[rule_id]
+            self.rule_hits[rule] = self.rule_hits.get(rule, 0) + int(hits[rule_id + 1])
+            self.category_hits[rule[0]] = self.category_hits.get(rule[0], 0) + int(hits[rule_id + 1])
+
+    def to_report(self, keywords_map: dict) -> dict:
+        """
+        Build a JSON-serializable report listing every rule of keywords_map with its hit count,
+        so rules that no longer match anything show up under 'dead_rules'.
+        """
+        rules = []
+        for category, category_rules in keywords_map.items():
+            for rule_type in ("exact", "prefix", "contains"):
+                for value in category_rules.get(rule_type, []):
+                    hits = self.rule_hits.get((category, rule_type, value), 0)
+                    rules.append({"category": category, "type": rule_type, "value": value, "hits": hits})
+        return {
+            "rows": self.rows,
+            "uncategorized_rows": self.uncategorized_rows,
+            "pass_seconds": dict(self.pass_seconds),
+            "category_hits": dict(sorted(self.category_hits.items(), key=lambda item: -item[1])),
+            "rules": rules,
+            "dead_rules": [rule for rule in rules if rule["hits"] == 0],
+        }
+
+
+@dataclass
+class CategorizationResult:
+    """
+    Outcome of categorizing a 'Description' column.
+    """
+    categories: pd.Series
+    distinct_descriptions: int
+    uncategorized_descriptions: int
+    uncategorized_rows: int
+    cache_hits: int = 0
+    stats: Optional[RuleStats] = None
+
+
+class KeywordMatcher:
+    """
+    Compiled form of the nested keywords map ({category: {"exact": [...], "prefix": [...], "contains": [...]}}).
+    All 'exact' lists are merged into one description -> rule dict, all 'prefix' entries into one
+    character trie and the 'contains' keywords into one case-insensitive pattern, so a description is
+    resolved with one hash lookup, one trie walk and at most one regex scan instead of one pass per keyword.
+    Keywords that cannot share that pattern (backreferences, named groups, global inline flags) are searched
+    on their own, in their place in the keyword order, so each keyword matches exactly as str.contains did.
+    Every rule gets an integer id; rules[id] is its (category, rule_type, value) key.
+
+    Precedence (exact and contains are the same as the old two-pass loop in the GUI):
+    - exact matches win over prefix matches, which win over contains matches;
+    - a description listed as exact under several categories gets the last one
+      (the old loop overwrote earlier assignments);
+    - prefix rules are literal and case-sensitive like exact ones; the longest matching prefix wins,
+      and an identical prefix listed under several categories gets the last one, as exact rules do;
+    - for contains, the first category in map order wins, then the first keyword in its list.
+    """
+
+    def __init__(self, keywords_map: dict):
+        """Compile the given keywords map."""
+        self._compile(keywords_map)
+
+    def _compile(self, keywords_map: dict) -> None:
+        """(Re)build every compiled structure from keywords_map."""
+        self.fingerprint = keywords_fingerprint(keywords_map)
+        self.rules: List[RuleKey] = []
+        self.rule_index: Dict[RuleKey, int] = {}
+        self.exact: Dict[str, int] = {}
+        self.prefix = PrefixTrie()
+        self.contains: List[int] = []
+        for category, rules in keywords_map.items():
+            for description in rules.get("exact", []):
+                self.exact[description] = self._add_rule(category, "exact", description)
+            for prefix in rules.get("prefix", []):
+                self.prefix.insert(prefix, self._add_rule(category, "prefix", prefix), overwrite=True)
+            for keyword in rules.get("contains", []):
+                self.contains.append(self._add_rule(category, "contains", keyword))
+        self.contains_patterns = self._compile_contains()
+
+    def _add_rule(self, category: str, rule_type: str, value: str) -> int:
+        """Register a rule and return its id."""
+        key = (category, rule_type, value)
+        if key not in self.rule_index:
+            self.rule_index[key] = len(self.rules)
+            self.rules.append(key)
+        return self.rule_index[key]
+
+    def refresh_rule(self, keywords_map: dict, rule_type: str, value: str) -> None:
+        """
+        Bring the compiled rules in line with keywords_map after a single rule was added, moved or removed.
+        Exact rules are patched in place; prefix and contains changes rebuild the compiled rules.
+        """
+        if rule_type == "exact":
+            self.refresh_exact_rules(keywords_map, [value])
+        elif rule_type in ("prefix", "contains"):
+            self._compile(keywords_map)
+        else:
+            raise ValueError(f"Unknown rule type: {rule_type}")
+
+    def refresh_exact_rules(self, keywords_map: dict, values: Iterable[str]) -> None:
+        """
+        Patch the compiled exact rules of many descriptions at once after they were added, moved or removed
+        in keywords_map, reading the map a single time. The rules of these descriptions that are no longer
+        in the map are replaced by the new ones (keeping their ids) or dropped, so rules matches the map.
+        """
+        values = set(values)
+        self.fingerprint = keywords_fingerprint(keywords_map)
+        # Categories listing each description as exact, in map order
+        listed: Dict[str, List[str]] = {}
+        for cat, rules in keywords_map.items():
+            for value in rules.get("exact", []):
+                if value in values:
+                    listed.setdefault(value, []).append(cat)
+        stale: Dict[str, List[int]] = {}
+        for rule_id, (cat, rule_type, value) in enumerate(self.rules):
+            if rule_type == "exact" and value in values and cat not in listed.get(value, ()):
+                stale.setdefault(value, []).append(rule_id)
+        for value in values:
+            free = stale.get(value, [])
+            for cat in listed.get(value, []):
+                key = (cat, "exact", value)
+                if key in self.rule_index:
+                    continue
+                if free:
+                    # Moved to another category: the old rule becomes the new one
+                    rule_id = free.pop()
+                    del self.rule_index[self.rules[rule_id]]
+                    self.rules[rule_id] = key
+                    self.rule_index[key] = rule_id
+                else:
+                    self._add_rule(*key)
+            if value in listed:
+                # Last category listing the description wins, as in _compile
+                self.exact[value] = self.rule_index[(listed[value][-1], "exact", value)]
+            else:
+                self.exact.pop(value, None)
+        dropped = [rule_id for free in stale.values() for rule_id in free]
+        if dropped:
+            self._drop_rules(dropped)
+
+    def _drop_rules(self, rule_ids: Iterable[int]) -> None:
+        """Remove rules no description resolves to any more and renumber the others, keeping ids dense."""
+        dropped = set(rule_ids)
+        kept = [rule_id for rule_id in range(len(self.rules)) if rule_id not in dropped]
+        new_ids = {old_id: new_id for new_id, old_id in enumerate(kept)}
+        self.rules = [self.rules[rule_id] for rule_id in kept]
+        self.rule_index = {key: rule_id for rule_id, key in enumerate(self.rules)}
+        self.exact = {value: new_ids[rule_id] for value, rule_id in self.exact.items()}
+        self.prefix.remap(new_ids)
+        self.contains = [new_ids[rule_id] for rule_id in self.contains]
+        self.contains_patterns = [
+            (pattern, {group: new_ids[rule_id] for group, rule_id in group_rules.items()}, new_ids.get(rule_id))
+            for pattern, group_rules, rule_id in self.contains_patterns
+        ]
+
+    def _compile_contains(self) -> List[Tuple[re.Pattern, Dict[str, int], Optional[int]]]:
+        """
+        Build the contains patterns, tried in order: (pattern, group_rules, rule_id).
+        Runs of keywords that can be combined become one anchored alternation
+        '\\A(?:[\\s\\S]*?(?:kw1)(?P<_r1>)|[\\s\\S]*?(?:kw2)(?P<_r2>)|...)' with group_rules mapping the empty
+        marker group after each keyword to its rule. The regex engine only tries an alternative once all
+        earlier ones failed on the whole string, so the matching marker is always the highest-priority
+        keyword, not the leftmost hit. Any other keyword is a pattern of its own with rule_id set.
+        Raises:
+            ValueError: If a keyword is not a valid regular expression, naming its rule.
+        """
+        patterns = []
+        alternatives: List[str] = []
+        group_rules: Dict[str, int] = {}
+
+        def close_run() -> None:
+            if alternatives:
+                pattern = re.compile(r"\A(?:" + "|".join(alternatives) + ")", re.IGNORECASE)
+                patterns.append((pattern, dict(group_rules), None))
+                alternatives.clear()
+                group_rules.clear()
+
+        for rule_id in self.contains:
+            category, _, keyword = self.rules[rule_id]
+            try:
+                alone = re.compile(keyword, re.IGNORECASE)
+            except re.error as error:
+                raise ValueError(f"Invalid 'contains' keyword {keyword!r} in category {category!r}: {error}") from error
+            if alone.groupindex or _UNCOMBINABLE.search(keyword):
+                close_run()
+                patterns.append((alone, {}, rule_id))
+                continue
+            # [\s\S] rather than '.': the keyword's own '.' keeps not matching newlines, as with str.contains
+            alternatives.append(f"[\\s\\S]*?(?:{keyword})(?P<_r{rule_id}>)")
+            group_rules[f"_r{rule_id}"] = rule_id
+        close_run()
+        return patterns
+
+    def category_lookup(self) -> np.ndarray:
+        """Return an array of categories indexed by rule id, with '' appended so NO_RULE (-1) maps to ''."""
+        return np.array([rule[0] for rule in self.rules] + [""], dtype=object)
+
+    def rule_key(self, rule_id: int) -> Optional[RuleKey]:
+        """Return the (category, rule_type, value) key of a rule id, or None for NO_RULE."""
+        return None if rule_id == NO_RULE else self.rules[rule_id]
+
+    def match_prefix_rule(self, description) -> int:
+        """Return the id of the longest matching 'prefix' rule, or NO_RULE."""
+        if not len(self.prefix) or not isinstance(description, str):
+            return NO_RULE
+        rule_id = self.prefix.longest_match(description)
+        return NO_RULE if rule_id is None else rule_id
+
+    def match_contains_rule(self, description) -> int:
+        """Return the id of the first matching 'contains' keyword, or NO_RULE."""
+        if not isinstance(description, str):
+            return NO_RULE
+        for pattern, group_rules, rule_id in self.contains_patterns:
+            if not group_rules:
+                if pattern.search(description):
+                    return rule_id
+                continue
+            match = pattern.match(description)
+            if match is not None:
+                return group_rules[match.lastgroup]
+        return NO_RULE
+
+    def match_rule(self, description) -> int:
+        """Return the id of the rule deciding a single description, or NO_RULE."""
+        rule_id = self.exact.get(description)
+        if rule_id is not None:
+            return rule_id
+        rule_id = self.match_prefix_rule(description)
+        if rule_id != NO_RULE:
+            return rule_id
+        return self.match_contains_rule(description)
+
+    def match(self, description) -> str:
+        """Return the category for a single description, or '' if no rule matches."""
+        rule_id = self.match_rule(description)
+        return "" if rule_id == NO_RULE else self.rules[rule_id][0]
+
+    def categorize_rules(self, descriptions: pd.Series, stats: Optional[RuleStats] = None) -> np.ndarray:
+        """
+        Resolve a whole column to rule ids in one pass per rule type.
+        Args:
+            descriptions: The descriptions to categorize.
+            stats: Optional RuleStats receiving the wall time of each pass.
+        Returns:
+            Array of rule ids aligned with the input, NO_RULE where no rule matches.
+        """
+        values = descriptions.to_numpy(dtype=object)
+        # --- Pass 1: Exact Matching (vectorized hash lookup) ---
+        start = time.perf_counter()
+        rule_ids = descriptions.map(self.exact).fillna(NO_RULE).to_numpy(dtype=np.int64)
+        if stats is not None:
+            stats.add_timing("exact", time.perf_counter() - start)
+        # --- Pass 2: Prefix Matching (trie walk, only for rows without an exact match) ---
+        unmatched = rule_ids == NO_RULE
+        if len(self.prefix) and unmatched.any():
+            start = time.perf_counter()
+            rule_ids[unmatched] = [self.match_prefix_rule(d) for d in values[unmatched]]
+            unmatched = rule_ids == NO_RULE
+            if stats is not None:
+                stats.add_timing("prefix", time.perf_counter() - start)
+        # --- Pass 3: Contains Matching (only for rows still uncategorized) ---
+        if self.contains_patterns and unmatched.any():
+            start = time.perf_counter()
+            rule_ids[unmatched] = [self.match_contains_rule(d) for d in values[unmatched]]
+            if stats is not None:
+                stats.add_timing("contains", time.perf_counter() - start)
+        return rule_ids
+
+    def categorize(self, descriptions: pd.Series) -> pd.Series:
+        """
+        Categorize a whole column in one pass per rule type.
+        Args:
+            descriptions: The 'Description' column.
+        Returns:
+            Series of categories aligned with the input, '' where no rule matches.
+        """
+        rule_ids = self.categorize_rules(descriptions)
+        return pd.Series(self.category_lookup()[rule_ids], index=descriptions.index, dtype=object)
+
+
+def rule_matches(rule_type: str, value: str, description) -> bool:
+    """Return True if a single 'exact', 'prefix' or 'contains' rule applies to the description, ignoring precedence."""
+    if rule_type == "exact":
+        return description == value
+    if rule_type == "prefix":
+        return isinstance(description, str) and bool(value) and description.startswith(value)
+    if rule_type == "contains":
+        return isinstance(description, str) and re.search(value, description, re.IGNORECASE) is not None
+    raise ValueError(f"Unknown rule type: {rule_type}")
+
+
+# --- Parallel categorization ---
+# Each worker process receives the compiled matcher once (through the pool initializer) and then only
+# gets chunks of descriptions; it sends back integer rule ids rather than category strings.
+_worker_matcher: Optional[KeywordMatcher] = None
+
+
+def _init_worker(matcher: KeywordMatcher) -> None:
+    """Store the compiled matcher in the worker process."""
+    global _worker_matcher
+    _worker_matcher = matcher
+
+
+def _categorize_chunk(descriptions: list) -> Tuple[np.ndarray, Dict[str, float]]:
+    """Categorize one chunk in a worker, returning rule ids (NO_RULE for uncategorized) and pass timings."""
+    stats = RuleStats()
+    rule_ids = _worker_matcher.categorize_rules(pd.Series(descriptions, dtype=object), stats)
+    return rule_ids.astype(np.int32), stats.pass_seconds
+
+
+def categorize_rules_parallel(
+    matcher: KeywordMatcher,
+    descriptions: pd.Series,
+    workers: int,
+    chunk_size: int = ANALYSIS_CHUNK_SIZE,
+    stats: Optional[RuleStats] = None,
+    progress: Optional[Callable[[float, str], None]] = None,
+) -> np.ndarray:
+    """
+    Resolve descriptions to rule ids in chunks across a pool of worker processes.
+    Gives exactly the same result as matcher.categorize_rules(descriptions).
+    Args:
+        matcher: The compiled keyword rules, shipped once to every worker.
+        descriptions: The descriptions to categorize.
+        workers: Number of worker processes.
+        chunk_size: Number of descriptions sent to a worker at a time.
+        stats: Optional RuleStats receiving the pass timings of all workers.
+        progress: Optional progress(fraction, message) callback, called as chunks complete.
+    Returns:
+        Array of rule ids aligned with the input, NO_RULE where no rule matches.
+    """
+    values = descriptions.tolist()
+    chunks = [values[start:start + chunk_size] for start in range(0, len(values), chunk_size)]
+    if not chunks:
+        return np.empty(0, dtype=np.int64)
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(matcher,))
+    results = []
+    try:
+        for result in pool.map(_categorize_chunk, chunks):
+            results.append(result)
+            if progress is not None:
+                progress(len(results) / len(chunks), f"Categorized {len(results)} of {len(chunks)} chunks")
+    finally:
+        # On an error or a cancelled progress callback, drop the chunks not started yet
+        pool.shutdown(wait=True, cancel_futures=True)
+    if stats is not None:
+        for _, pass_seconds in results:
+            stats.merge_timings(pass_seconds)
+    return np.concatenate([rule_ids for rule_ids, _ in results]).astype(np.int64)
+
+
+def categorize_parallel(
+    matcher: KeywordMatcher,
+    descriptions: pd.Series,
+    workers: int,
+    chunk_size: int = ANALYSIS_CHUNK_SIZE,
+) -> pd.Series:
+    """Categorize descriptions across worker processes; same result as matcher.categorize(descriptions)."""
+    rule_ids = categorize_rules_parallel(matcher, descriptions, workers, chunk_size)
+    return pd.Series(matcher.category_lookup()[rule_ids], index=descriptions.index, dtype=object)
+
+
+def _run_matcher(
+    matcher: KeywordMatcher,
+    descriptions: pd.Series,
+    workers: int,
+    chunk_size: int,
+    stats: Optional[RuleStats],
+    progress: Optional[Callable[[float, str], None]] = None,
+) -> np.ndarray:
+    """
+    Resolve rule ids serially, or in parallel when several workers are requested and there is more than one chunk.
+    With a progress callback the serial path also works chunk by chunk, so it can report and be cancelled.
+    """
+    if workers > 1 and len(descriptions) > chunk_size:
+        return categorize_rules_parallel(matcher, descriptions, workers, chunk_size, stats, progress)
+    if progress is None or len(descriptions) <= chunk_size:
+        return matcher.categorize_rules(descriptions, stats)
+    parts = []
+    for start in range(0, len(descriptions), chunk_size):
+        parts.append(matcher.categorize_rules(descriptions.iloc[start:start + chunk_size], stats))
+        done = min(start + chunk_size, len(descriptions))
+        progress(done / len(descriptions), f"Categorized {done:,} of {len(descriptions):,} descriptions")
+    return np.concatenate(parts)
+
+
+def categorize_descriptions(
+    matcher: KeywordMatcher,
+    descriptions: pd.Series,
+    cache: Optional[CategorizationCache] = None,
+    workers: int = ANALYSIS_WORKERS,
+    chunk_size: int = ANALYSIS_CHUNK_SIZE,
+    progress: Optional[Callable[[float, str], None]] = None,
+) -> CategorizationResult:
+    """
+    Categorize each distinct description once and broadcast the result back to all rows.
+    Args:
+        matcher: The compiled keyword rules.
+        descriptions: The 'Description' column.
+        cache: Optional persistent cache; descriptions already cached for this keywords map are not re-matched.
+        workers: Number of worker processes for the distinct descriptions (1 = serial).
+        chunk_size: Descriptions per worker task in parallel mode.
+        progress: Optional progress(fraction, message) callback for the matching of uncached descriptions.
+    Returns:
+        CategorizationResult with the per-row categories, distinct/uncategorized counts and rule statistics.
+    """
+    stats = RuleStats()
+    # codes[i] is the position of row i's description in 'uniques' (-1 for missing values)
+    codes, uniques = pd.factorize(descriptions)
+    unique_descriptions = pd.Series(uniques, dtype=object)
+    cache_hits = 0
+    if cache is None:
+        rule_ids = _run_matcher(matcher, unique_descriptions, workers, chunk_size, stats, progress)
+    else:
+        cache.bind(matcher.fingerprint)
+        rule_ids = np.full(len(uniques), NO_RULE, dtype=np.int64)
+        missing = np.ones(len(uniques), dtype=bool)
+        for position, description in enumerate(uniques):
+            rule = cache.get(description) if isinstance(description, str) else None
+            if rule is None:
+                continue
+            rule_id = matcher.rule_index.get(rule, NO_RULE) if rule else NO_RULE
+            if rule and rule_id == NO_RULE:
+                continue  # Rule unknown to this matcher: match the description again
+            rule_ids[position] = rule_id
+            missing[position] = False
+        cache_hits = int(len(uniques) - missing.sum())
+        if missing.any():
+            fresh = _run_matcher(matcher, unique_descriptions[missing], workers, chunk_size, stats, progress)
+            rule_ids[missing] = fresh
+            for description, rule_id in zip(unique_descriptions[missing], fresh):
+                if isinstance(description, str):
+                    cache.put(description, matcher.rule_key(rule_id) or ())
+    # Rows without a description never match, but still count towards the row totals
+    row_counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    stats.add_hits(matcher, rule_ids, row_counts)
+    missing_rows = int((codes < 0).sum())
+    stats.rows += missing_rows
+    stats.uncategorized_rows += missing_rows
+
+    unique_categories = matcher.category_lookup()[rule_ids]
+    # Append '' so that code -1 (missing description) lands on the uncategorized slot
+    lookup = np.append(unique_categories, "")
+    categories = pd.Series(lookup[codes], index=descriptions.index, dtype=object)
+    return CategorizationResult(
+        categories=categories,
+        distinct_descriptions=len(uniques),
+        uncategorized_descriptions=int((unique_categories == "").sum()),
+        uncategorized_rows=int((categories == "").sum()),
+        cache_hits=cache_hits,
+        stats=stats,
+    )
@@ -1,7 +1,48 @@
-from typing import Optional, List
+import functools
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, List, Hashable, Iterable, Tuple
+import numpy as np
 import pandas as pd
-from core.data_utils import filter_dataframe, sort_dataframe, calculate_summaries
-from core.data_processor import get_category_summary, load_keywords, save_keywords, load_categories
+from core.data_utils import (
+    FilterView, Range, filter_dataframe, parse_dates, sort_codes, calculate_summaries, normalize_transactions,
+    add_category,
+)
+from core.data_processor import (
+    get_category_summary, load_keywords, save_keywords, load_categories, save_rule_report, load_bank_profiles
+)
+from core.categorizer import KeywordMatcher, CategorizationResult, RuleStats, categorize_descriptions, rule_matches
+from core.categorization_cache import CategorizationCache
+from core.description_index import DescriptionIndex
+from core.partition_index import PartitionIndex
+from core.sorted_index import SortedIndex
+from core.row_index import RowIndex, assign_row_ids
+from core.running_aggregates import RunningAggregates
+from core.rollup import RollupCube
+from core.excel_loader import HeaderLayout, LoadStats, read_statement, STATEMENT_COLUMNS
+from core.workbook_cache import WorkbookCache
+from core.lru_cache import LRUCache
+from core.tasks import ProgressCallback, Task, TaskRunner
+from config.constants import (
+    ANALYSIS_COLUMNS, ANALYSIS_WORKERS, ANALYSIS_CHUNK_SIZE, DEFAULT_DAYFIRST, FILTER_CACHE_SIZE
+)
+
+# A finished analysis job, as _categorize returns it and _apply_analysis applies it
+Analysis = Tuple[
+    pd.DataFrame, KeywordMatcher, CategorizationResult, DescriptionIndex, PartitionIndex, SortedIndex, SortedIndex,
+    RollupCube, pd.Series, pd.Index,
+]
+
+
+def _holding_data_lock(method):
+    """Run a Controller method while holding the controller's data lock (see Controller._data_lock)."""
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._data_lock:
+            return method(self, *args, **kwargs)
+    return locked
 
 
 class Controller:
@@ -15,46 +56,657 @@ class Controller:
         self.selected_df: Optional[pd.DataFrame] = None
         self.keywords_map = load_keywords()
         self.categories = load_categories()
+        self.bank_profiles = load_bank_profiles()
+        self.categorization_cache = CategorizationCache()
+        self.matcher: Optional[KeywordMatcher] = None
+        self.description_index: Optional[DescriptionIndex] = None
+        self.partitions: Optional[PartitionIndex] = None
+        self.date_index: Optional[SortedIndex] = None
+        self.amount_index: Optional[SortedIndex] = None
+        self.rollup: Optional[RollupCube] = None
+        self.row_index: Optional[RowIndex] = None  # Row id (the index of selected_df) -> position
+        # 'Accounting date' of selected_df parsed to datetime64; the column itself keeps the loaded values
+        self.dates: Optional[pd.Series] = None
+        self.unparsed_dates: pd.Index = pd.Index([])  # Row ids whose date matched no date format
+        self.rule_stats: Optional[RuleStats] = None  # Hits of the last full categorization, None once rows changed
+        self.load_stats: Optional[LoadStats] = None
+        self.header_layout: Optional[HeaderLayout] = None
+        self.workbook_cache = WorkbookCache()
+        self.tasks = TaskRunner()
+        self.filter_tasks = TaskRunner()  # Search evaluations, kept apart so they never queue behind a load
+        # Bumped by every change to selected_df; filtered views are cached per data version
+        self.data_version = 0
+        # Sort keys of the filtered views, most significant first: ((column, ascending), ...)
+        self.sort_state: Tuple[Tuple[str, bool], ...] = ()
+        self._sort_codes: Dict[Tuple[str, int], np.ndarray] = {}  # (column, data version) -> rank codes
+        # Totals of the last computed view, updated row by row on edits; keyed by (filters, data version)
+        self.aggregates: Optional[RunningAggregates] = None
+        self._aggregates_key: Optional[Tuple[tuple, int]] = None
+        self.check_aggregates = False  # Verify the running totals against a full recomputation after each edit
+        self.filter_cache = LRUCache(FILTER_CACHE_SIZE)
+        self._filter_cache_lock = threading.Lock()
+        # Held while a view is computed from the data (background searches included) and while the data or its
+        # indexes change, so an edit waits for a running search instead of changing the rows under it
+        self._data_lock = threading.RLock()
         self.currently_selected_row_index = None
 
     def load_data(self, filepath: str) -> None:
-        """Load Excel data from the given filepath, skipping the first 7 rows."""
-        self.df = pd.read_excel(filepath, skiprows=7)
+        """
+        Load Excel data from the given filepath. The header row is detected in the first rows of the sheet,
+        matching column names against the bank profiles, and kept in header_layout.
+        Only the statement columns are parsed, streaming the sheet row by row; load speed is kept in load_stats.
+        Unchanged workbooks that were loaded before are read back from the local workbook cache.
+        """
+        self._apply_loaded(self._read_data(filepath))
+
+    def load_data_async(self, filepath: str) -> Task:
+        """Like load_data, but parse the file in the background. The data is applied by Task.result()."""
+        return self.tasks.submit(
+            "Loading file", lambda progress: self._read_data(filepath, progress), self._apply_loaded
+        )
+
+    def _read_data(self, filepath: str, progress: Optional[ProgressCallback] = None) -> Tuple[pd.DataFrame, LoadStats]:
+        """
+        Parse a workbook (or read it from the workbook cache) into the compact in-memory layout,
+        without changing the controller state.
+        """
+        options = json.dumps({"columns": STATEMENT_COLUMNS, "profiles": self.bank_profiles}, ensure_ascii=False)
+        start = time.perf_counter()
+        cached, key = self._read_workbook_cache(filepath, options)
+        if cached is not None:
+            stats = LoadStats(rows=len(cached), seconds=time.perf_counter() - start, engine="cache")
+            return normalize_transactions(cached), stats
+        df, stats = read_statement(filepath, progress=progress, profiles=self.bank_profiles)
+        if progress is not None:
+            progress(1.0, "Caching workbook")
+        try:
+            self.workbook_cache.put(filepath, df, options, key)
+        except OSError as e:
+            print(f"Could not cache workbook: {e}")
+        return normalize_transactions(df), stats
+
+    @_holding_data_lock
+    def _apply_loaded(self, loaded: Tuple[pd.DataFrame, LoadStats]) -> LoadStats:
+        """Make a parsed workbook the current data. Returns its load statistics."""
+        self.df, self.load_stats = loaded
+        assign_row_ids(self.df)
+        header = self.df.attrs.get("header")
+        self.header_layout = HeaderLayout(**header) if header else None
         self.selected_df = self.df.copy()
+        self.row_index = RowIndex(self.selected_df.index)
+        self.dates, self.unparsed_dates = self._parse_dates(self.selected_df)
+        self.matcher = None
+        self.description_index = None
+        self.partitions = None
+        self.date_index = None
+        self.amount_index = None
+        self.rollup = None
+        self.sort_state = ()
+        self.aggregates = None
+        self._data_changed()
+        return self.load_stats
+
+    def _parse_dates(self, df: pd.DataFrame) -> Tuple[pd.Series, pd.Index]:
+        """
+        Parse the 'Accounting date' column of df (see parse_dates) with the 'dayfirst' and 'date_format'
+        settings of the bank profile the header matched. Returns the dates and the rows that failed to parse.
+        """
+        if "Accounting date" not in df.columns:
+            return pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]"), df.index[:0]
+        return parse_dates(df["Accounting date"], *self._date_settings())
+
+    def _date_settings(self) -> Tuple[bool, Optional[str]]:
+        """Return the 'dayfirst' and 'date_format' settings of the bank profile the header matched."""
+        profile = self.bank_profiles.get(self.header_layout.profile, {}) if self.header_layout is not None else {}
+        return profile.get("dayfirst", DEFAULT_DAYFIRST), profile.get("date_format")
+
+    def parse_date(self, text: str) -> Optional[pd.Timestamp]:
+        """
+        Parse a date typed into a filter the way the loaded dates were parsed, so it means the same day as
+        the dates shown in the table: in the profile's date_format, else an ISO date or a numeric date in the
+        profile's day/month order. Returns None if the text is empty or no format matches.
+        """
+        dayfirst, date_format = self._date_settings()
+        value = parse_dates(pd.Series([text]), dayfirst, date_format)[0].iloc[0]
+        if pd.isna(value) and date_format:
+            value = parse_dates(pd.Series([text]), dayfirst)[0].iloc[0]
+        return None if pd.isna(value) else value
+
+    def _read_workbook_cache(self, filepath: str, options: str) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """
+        Return the cached parse of a workbook, or None if it is not cached (or the cache is unreadable),
+        and its cache key, hashed once for the lookup and the store after a miss (None if it could not be computed).
+        """
+        key = None
+        try:
+            key = self.workbook_cache.key(filepath, options)
+            return self.workbook_cache.get(filepath, options, key), key
+        except OSError as e:
+            print(f"Could not read workbook cache: {e}")
+            return None, key
+
+    def clear_workbook_cache(self) -> int:
+        """Remove all cached workbooks. Returns the number of entries removed."""
+        return self.workbook_cache.clear()
+
+    def analyze_data(self, workers: int = ANALYSIS_WORKERS, chunk_size: int = ANALYSIS_CHUNK_SIZE) -> Optional[CategorizationResult]:
+        """
+        Categorize every transaction in the selected DataFrame using the compiled keyword rules (exact, then contains).
+        Each distinct description is matched once, and descriptions already known for the current keywords map
+        come from the persistent categorization cache. With workers > 1 the remaining descriptions are matched
+        in chunks of chunk_size across worker processes. Returns the result with distinct/uncategorized counts.
+        """
+        if self.selected_df is None:
+            return None
+        return self._apply_analysis(self._categorize(self.selected_df, workers, chunk_size))
+
+    def analyze_data_async(self, workers: int = ANALYSIS_WORKERS, chunk_size: int = ANALYSIS_CHUNK_SIZE) -> Optional[Task]:
+        """
+        Like analyze_data, but categorize in the background. Task.result() applies the categories and
+        returns the CategorizationResult. Returns None when no data is loaded.
+        """
+        if self.selected_df is None:
+            return None
+        df = self.selected_df
+        return self.tasks.submit(
+            "Analyzing", lambda progress: self._categorize(df, workers, chunk_size, progress), self._apply_analysis
+        )
+
+    def _categorize(
+        self, df: pd.DataFrame, workers: int, chunk_size: int, progress: Optional[ProgressCallback] = None
+    ) -> Analysis:
+        """
+        Categorize a copy of df, index its descriptions, categories, amount signs, parsed dates and amounts,
+        and roll its amounts up by category and period; only the categorization cache is updated.
+        """
+        df = df.reindex(columns=ANALYSIS_COLUMNS, fill_value="")
+        matcher = KeywordMatcher(self.keywords_map)
+        result = categorize_descriptions(
+            matcher, df["Description"], self.categorization_cache, workers=workers, chunk_size=chunk_size,
+            progress=progress,
+        )
+        try:
+            self.categorization_cache.save()
+        except OSError as e:
+            print(f"Could not save categorization cache: {e}")
+        df["Category"] = result.categories
+        df = normalize_transactions(df, self._category_names())
+        if progress is not None:
+            progress(1.0, "Indexing descriptions")
+        partitions = PartitionIndex(df["Category"], df["Amount"])
+        dates, unparsed_dates = self._parse_dates(df)
+        date_index, amount_index = SortedIndex(dates), SortedIndex(df["Amount"])
+        rollup = RollupCube(df["Category"], dates, df["Amount"])
+        return (
+            df, matcher, result, DescriptionIndex(df["Description"]), partitions, date_index, amount_index, rollup,
+            dates, unparsed_dates,
+        )
+
+    @_holding_data_lock
+    def _apply_analysis(self, analysis: Analysis) -> CategorizationResult:
+        """Make a finished categorization the current data. Returns its CategorizationResult."""
+        (
+            self.selected_df, self.matcher, result, self.description_index, self.partitions,
+            self.date_index, self.amount_index, self.rollup, self.dates, self.unparsed_dates,
+        ) = analysis
+        self.row_index = RowIndex(self.selected_df.index)
+        self.aggregates = None
+        self._data_changed()
+        self.rule_stats = result.stats
+        return result
+
+    def get_rule_report(self, persist: bool = False) -> Optional[dict]:
+        """
+        Return per-rule and per-category hit counts and per-pass timings of the last analysis,
+        listing rules without hits under 'dead_rules'. With persist=True the report is also saved next to keywords.json.
+        Returns None before an analysis, and after edits or re-learned rules changed the rows until the next
+        analysis: incremental re-categorization does not count hits, so the old counts would be wrong.
+        """
+        if self.rule_stats is None:
+            return None
+        report = self.rule_stats.to_report(self.keywords_map)
+        if persist:
+            save_rule_report(report)
+        return report
+
+    def _category_names(self) -> List[str]:
+        """Return every category name known from the category list and the keywords map."""
+        return [*self.categories, *self.keywords_map]
+
+    def _positions(self, labels: Iterable[Hashable]) -> np.ndarray:
+        """Return the positions in selected_df of rows given by row id, read from the row index."""
+        if self.row_index is None:
+            return self.selected_df.index.get_indexer(list(labels))
+        return self.row_index.positions(labels)
+
+    def get_row(self, label: Hashable) -> pd.Series:
+        """
+        Return the row of selected_df with the given row id, found through the row index.
+        Raises:
+            KeyError: If there is no such row.
+        """
+        position = self._positions([label])[0]
+        if position < 0:
+            raise KeyError(label)
+        return self.selected_df.iloc[position]
+
+    def _set_category(self, labels: List[Hashable], category: str) -> None:
+        """
+        Set the category of the given rows, extending the Categorical column if the category is new
+        and keeping the category partitions, rollup cube and running aggregates in sync.
+        """
+        before = self._rows_in_view(labels)
+        if "Category" in self.selected_df.columns:
+            column = self.selected_df["Category"]
+            positions = self._positions(labels)
+            for index in (self.partitions, self.rollup):
+                if index is not None:
+                    index.set_category(positions, category)
+            extended = add_category(column, category)
+            if extended is not column:
+                self.selected_df["Category"] = extended
+        self.selected_df.loc[labels, "Category"] = category
+        self._retally(before, labels)
+
+    @_holding_data_lock
+    def recategorize_descriptions(self, descriptions: Iterable[Hashable]) -> int:
+        """
+        Re-run the compiled rules for the given descriptions only and update the rows carrying them.
+        Uses the description index, so the cost is proportional to the affected rows; rows that end up in the
+        same category are updated together. Returns the number of rows touched.
+        """
+        if self.selected_df is None or self.matcher is None or self.description_index is None:
+            return 0
+        by_category: Dict[str, List[Hashable]] = {}
+        for description in descriptions:
+            labels = self.description_index.rows(description)
+            if labels:
+                by_category.setdefault(self.matcher.match(description), []).extend(labels)
+        for category, labels in by_category.items():
+            self._set_category(labels, category)
+        touched = sum(len(labels) for labels in by_category.values())
+        if touched:
+            self._data_changed()
+        return touched
+
+    @_holding_data_lock
+    def apply_category(self, labels: Iterable[Hashable], category: str, learn: bool = True) -> int:
+        """
+        Set one category on many rows, given by row id, with a single assignment and a single data change.
+        With learn, the distinct descriptions of the rows are learned as exact matches for category in one
+        batch (see learn_descriptions), which also updates the other rows carrying them.
+        Returns the number of rows whose category was set.
+        """
+        labels = list(dict.fromkeys(labels))
+        if self.selected_df is None or not labels:
+            return 0
+        self._set_category(labels, category)
+        touched = set(labels)
+        learned = 0
+        if learn:
+            descriptions = self.selected_df["Description"].iloc[self._positions(labels)].dropna()
+            learned = self.learn_descriptions(descriptions, category)
+            if learned and self.description_index is not None:
+                touched |= self.description_index.rows_for(descriptions)
+        if not learned:
+            self._data_changed()
+        return len(touched)
 
-    def filter_data(self, category: Optional[str], search_term: Optional[str], value_filter: Optional[str]) -> pd.DataFrame:
-        """Filter the selected DataFrame by category, search term, and value filter."""
-        return filter_dataframe(self.selected_df, category, search_term, value_filter)
+    @_holding_data_lock
+    def apply_category_to_descriptions(
+        self, descriptions: Iterable[Hashable], category: str, learn: bool = False
+    ) -> int:
+        """
+        Set category on every row carrying one of the given descriptions, found through the description
+        index instead of a scan (see apply_category). Returns the number of rows whose category was set.
+        """
+        if self.description_index is None:
+            return 0
+        return self.apply_category(self.description_index.rows_for(descriptions), category, learn=learn)
 
-    def sort_data(self, column: str, ascending: bool = True) -> None:
-        """Sort the selected DataFrame by the given column and order."""
-        if self.selected_df is not None:
-            self.selected_df = sort_dataframe(self.selected_df, column, ascending)
+    def _affected_descriptions(self, rule_type: str, value: str) -> List[Hashable]:
+        """Return the loaded descriptions a single rule applies to."""
+        if self.description_index is None:
+            return []
+        if rule_type == "exact":
+            return [value] if value in self.description_index else []
+        return [d for d in self.description_index.descriptions() if rule_matches(rule_type, value, d)]
+
+    @_holding_data_lock
+    def _rule_changed(self, rule_type: str, value: str) -> int:
+        """Refresh the compiled rules after one rule changed and re-categorize only the affected rows."""
+        if self.matcher is None:
+            return 0
+        self.matcher.refresh_rule(self.keywords_map, rule_type, value)
+        return self.recategorize_descriptions(self._affected_descriptions(rule_type, value))
+
+    def add_rule(self, category: str, rule_type: str, value: str) -> int:
+        """Add an 'exact', 'prefix' or 'contains' rule to a category and apply it to the affected rows. Returns rows touched."""
+        rules = self.keywords_map.setdefault(category, {"exact": [], "prefix": [], "contains": []})
+        values = rules.setdefault(rule_type, [])
+        if value in values:
+            return 0
+        values.append(value)
+        return self._rule_changed(rule_type, value)
+
+    def remove_rule(self, rule_type: str, value: str, category: Optional[str] = None) -> int:
+        """
+        Remove an 'exact', 'prefix' or 'contains' rule from the given category (or from every category if None)
+        and re-evaluate the affected rows. Returns rows touched.
+        """
+        removed = False
+        for cat, rules in self.keywords_map.items():
+            if (category is None or cat == category) and value in rules.get(rule_type, []):
+                rules[rule_type].remove(value)
+                removed = True
+        if not removed:
+            return 0
+        return self._rule_changed(rule_type, value)
+
+    def move_rule(self, rule_type: str, value: str, category: str) -> int:
+        """Make a rule belong to the given category only, re-evaluating the affected rows once. Returns rows touched."""
+        for rules in self.keywords_map.values():
+            if value in rules.get(rule_type, []):
+                rules[rule_type].remove(value)
+        rules = self.keywords_map.setdefault(category, {"exact": [], "prefix": [], "contains": []})
+        rules.setdefault(rule_type, []).append(value)
+        return self._rule_changed(rule_type, value)
+
+    def learn_description(self, old_description: str, new_description: str, category: str) -> int:
+        """
+        Learn new_description as an exact match for category, forgetting the exact rule of old_description,
+        and update every row with either description. Returns rows touched.
+        """
+        touched = 0
+        if old_description != new_description:
+            touched += self.remove_rule("exact", old_description)
+        touched += self.move_rule("exact", new_description, category)
+        return touched
+
+    @_holding_data_lock
+    def learn_descriptions(self, descriptions: Iterable[Hashable], category: str) -> int:
+        """
+        Learn many descriptions as exact matches for category only, as move_rule does for one: the keywords
+        map and the compiled rules are updated in one pass each and the affected rows are re-categorized
+        once. Returns rows touched.
+        """
+        descriptions = [d for d in dict.fromkeys(descriptions) if isinstance(d, str)]
+        if not descriptions:
+            return 0
+        learned = set(descriptions)
+        for rules in self.keywords_map.values():
+            exact = rules.get("exact", [])
+            if any(value in learned for value in exact):
+                exact[:] = [value for value in exact if value not in learned]
+        rules = self.keywords_map.setdefault(category, {"exact": [], "prefix": [], "contains": []})
+        rules.setdefault("exact", []).extend(descriptions)
+        if self.matcher is None:
+            return 0
+        self.matcher.refresh_exact_rules(self.keywords_map, descriptions)
+        return self.recategorize_descriptions(descriptions)
+
+    @_holding_data_lock
+    def update_row(self, label: Hashable, description: str, amount: float, category: str) -> None:
+        """
+        Update a single row, given by row id, of the selected DataFrame and keep its indexes, rollup cube
+        and running aggregates in sync.
+        """
+        old_description = self.get_row(label)["Description"]
+        self._set_category([label], category)
+        before = self._rows_in_view([label])
+        position = self._positions([label])[0]
+        if self.partitions is not None:
+            self.partitions.set_amount(position, amount)
+        if self.amount_index is not None:
+            self.amount_index.set_value(position, amount)
+        if self.rollup is not None:
+            self.rollup.set_amount(position, amount)
+        self.selected_df.loc[label, "Amount"] = amount
+        self.selected_df.loc[label, "Description"] = description
+        if self.description_index is not None:
+            self.description_index.move(label, old_description, description)
+        self._retally(before, [label])
+        self._data_changed()
+
+    @_holding_data_lock
+    def delete_row(self, label: Hashable) -> None:
+        """
+        Delete a single row, given by row id, from the selected DataFrame and keep its indexes and the
+        running aggregates in sync. The ids of the other rows do not change.
+        """
+        before = self._rows_in_view([label])
+        if self.description_index is not None:
+            self.description_index.remove(label, self.get_row(label)["Description"])
+        position = self._positions([label])[0]
+        for index in (self.partitions, self.date_index, self.amount_index, self.rollup):
+            if index is not None:
+                index.remove(position)
+        if self.row_index is not None:
+            self.row_index.remove(label)
+        if self.dates is not None:
+            self.dates = self.dates.drop(label)
+            self.unparsed_dates = self.unparsed_dates.drop(label, errors="ignore")
+        self.selected_df.drop(label, inplace=True)
+        self._retally(before, [])
+        self._data_changed()
+
+    @_holding_data_lock
+    def filter_data(
+        self,
+        category: Optional[str],
+        search_term: Optional[str],
+        value_filter: Optional[str],
+        date_range: Optional[Range] = None,
+        amount_range: Optional[Range] = None,
+    ) -> pd.DataFrame:
+        """
+        Filter the selected DataFrame by category, search term, value filter, date range and amount range,
+        then order the filtered rows by sort_state.
+        After analysis the search uses the trigram index of the description index, the category and value
+        filters use the category and sign partitions, and the ranges use the sorted date and amount indexes.
+        """
+        return filter_dataframe(
+            self.selected_df, category, search_term, value_filter, self.description_index, self.partitions,
+            date_range, amount_range, self.date_index, self.amount_index, self._sort_keys(), self.dates,
+        )
+
+    def _sort_keys(self) -> List[Tuple[np.ndarray, bool]]:
+        """Return the sort keys of sort_state, ranking each column once per data version."""
+        keys = []
+        for column, ascending in self.sort_state:
+            if self.selected_df is None or column not in self.selected_df.columns:
+                continue
+            with self._filter_cache_lock:
+                key = (column, self.data_version)
+                codes = self._sort_codes.get(key)
+            if codes is None:
+                # Dates sort by their parsed value, not by the text of the column
+                values = self.dates if column == "Accounting date" and self.dates is not None else self.selected_df[column]
+                codes = sort_codes(values)
+                with self._filter_cache_lock:
+                    self._sort_codes[key] = codes
+            keys.append((codes, ascending))
+        return keys
+
+    def _rows_in_view(self, labels: Iterable[Hashable]) -> Optional[pd.DataFrame]:
+        """Return the rows at labels that pass the filters of the running aggregates, or None if none are kept."""
+        if self.aggregates is None or self.selected_df is None:
+            return None
+        category, search_term, value_filter, date_range, amount_range = self._aggregates_key[0]
+        rows = self.selected_df.iloc[self._positions(labels)]
+        return filter_dataframe(
+            rows, category, search_term, value_filter, date_range=date_range, amount_range=amount_range,
+            dates=self.dates,
+        )
+
+    def _retally(self, before: Optional[pd.DataFrame], labels: Iterable[Hashable]) -> None:
+        """
+        Move changed rows in the running aggregates: take out their old values (before, from _rows_in_view
+        ahead of the change) and count in the rows at labels that pass the filters now.
+        """
+        if before is None or self.aggregates is None:
+            return
+        self.aggregates.remove_rows(before)
+        self.aggregates.add_rows(self._rows_in_view(labels))
+
+    def _data_changed(self) -> None:
+        """
+        Bump the data version after any change to selected_df, so no stale filtered view is served.
+        Drops the rule stats, which only a full categorization counts (see get_rule_report).
+        """
+        self.rule_stats = None
+        with self._filter_cache_lock:
+            self.data_version += 1
+            self.filter_cache.clear()
+            self._sort_codes.clear()
+            if self.aggregates is not None:
+                # Every edit retallies the aggregates, so they stay valid for the new version
+                self._aggregates_key = (self._aggregates_key[0], self.data_version)
+        if self.check_aggregates and self.aggregates is not None:
+            self.aggregates.verify(self.filter_data(*self._aggregates_key[0]))
+
+    @_holding_data_lock
+    def filtered_view(
+        self,
+        category: Optional[str],
+        search_term: Optional[str],
+        value_filter: Optional[str],
+        date_range: Optional[Range] = None,
+        amount_range: Optional[Range] = None,
+    ) -> FilterView:
+        """
+        Return the filtered rows with their category summary and totals.
+        Views are memoized in an LRU cache keyed by the filters, the sort state and the data version. The cache
+        keeps only the row positions and the aggregates of a view, not a copy of its rows: the rows are taken
+        from selected_df when the view is served, which the data version guarantees has not changed since.
+        Summary and totals come from running aggregates: they are computed in full when the filters change,
+        and edits then update them row by row (see _retally) instead of regrouping the view.
+        """
+        filters = (category, search_term or "", value_filter, tuple(date_range or ()), tuple(amount_range or ()))
+        with self._filter_cache_lock:
+            version = self.data_version
+            key = (*filters, self.sort_state, version)
+            cached = self.filter_cache.get(key)
+            aggregates = self.aggregates if self._aggregates_key == (filters, version) else None
+        if cached is not None:
+            positions, snapshot = cached
+            return FilterView(self.selected_df.iloc[positions], snapshot, positions)
+        df = self.filter_data(category, search_term, value_filter, date_range, amount_range)
+        if aggregates is None:
+            aggregates = RunningAggregates(df)
+            with self._filter_cache_lock:
+                if self.data_version == version:
+                    self.aggregates, self._aggregates_key = aggregates, (filters, version)
+        view = FilterView(df, aggregates.snapshot(), self._positions(df.index))
+        with self._filter_cache_lock:
+            # A view computed while the data changed is keyed by the old version and never served
+            self.filter_cache.put(key, (view.positions, view.aggregates))
+        return view
+
+    def filtered_view_async(
+        self,
+        category: Optional[str],
+        search_term: Optional[str],
+        value_filter: Optional[str],
+        date_range: Optional[Range] = None,
+        amount_range: Optional[Range] = None,
+    ) -> Task:
+        """
+        Like filtered_view, but evaluate in the background. Cancel the Task to drop an evaluation that is stale.
+        The evaluation holds the data lock, so edits made meanwhile wait for it to finish.
+        """
+        return self.filter_tasks.submit(
+            "Filtering",
+            lambda progress: self.filtered_view(category, search_term, value_filter, date_range, amount_range),
+        )
+
+    @_holding_data_lock
+    def sort_data(self, column: str, ascending: bool = True, add: bool = False) -> None:
+        """
+        Sort the filtered views by the given column and order. With add, the column becomes an extra key after
+        the current ones (or changes direction if it already is one), for a stable multi-key sort.
+        The selected DataFrame keeps its order; each view sorts only its own rows, from rank codes cached per
+        column, so flipping the direction or re-sorting a column never ranks the whole table again.
+        """
+        if self.selected_df is None or column not in self.selected_df.columns:
+            return
+        if add:
+            keys = [(name, order) for name, order in self.sort_state if name != column]
+            position = next((i for i, (name, _) in enumerate(self.sort_state) if name == column), len(keys))
+            keys.insert(position, (column, ascending))
+            self.sort_state = tuple(keys)
+        else:
+            self.sort_state = ((column, ascending),)
+
+    def rollup_table(
+        self,
+        period: str = "month",
+        measure: str = "net",
+        categories: Optional[List[str]] = None,
+        start=None,
+        end=None,
+    ) -> pd.DataFrame:
+        """
+        Return a measure by period and category from the rollup cube (see RollupCube.table), e.g.
+        rollup_table("month", "expenses", ["Food & Groceries"], "2025-01-01", "2025-12-31").
+        Empty until the data is analyzed.
+        """
+        if self.rollup is None:
+            return pd.DataFrame()
+        return self.rollup.table(period, measure, categories, start, end)
 
     def get_summary(self, df: Optional[pd.DataFrame]) -> pd.DataFrame:
         """Return a summary DataFrame with totals by category for the given DataFrame."""
         return get_category_summary(df)
 
-    def export_data(self, df: pd.DataFrame, filepath: str) -> None:
-        """Export the given DataFrame to Excel, starting at row 8 (index 7)."""
-        with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Sheet1', index=False, startrow=7)
+    def export_data(self, df: pd.DataFrame, filepath: str, progress: Optional[ProgressCallback] = None) -> None:
+        """
+        Export the given DataFrame to Excel with the header on the same row as in the loaded file (row 8 by default).
+        The workbook is written next to the target and moved into place, so a failed or cancelled export leaves no partial file.
+        """
+        startrow = self.header_layout.skiprows if self.header_layout is not None else 7
+        root, ext = os.path.splitext(filepath)
+        temp_path = f"{root}.partial{ext}"
+        try:
+            with pd.ExcelWriter(temp_path, engine='openpyxl') as writer:
+                df.to_excel(writer, sheet_name='Sheet1', index=False, startrow=startrow)
+            if progress is not None:
+                progress(1.0, "Saving file")
+            os.replace(temp_path, filepath)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def export_data_async(self, df: pd.DataFrame, filepath: str) -> Task:
+        """Like export_data, but write the workbook in the background. Task.result() returns the filepath."""
+        def job(progress: ProgressCallback) -> str:
+            self.export_data(df, filepath, progress)
+            return filepath
+        return self.tasks.submit("Exporting", job)
+
+    def cancel_tasks(self) -> None:
+        """Request cancellation of all background loads, analyses, exports and searches."""
+        self.tasks.cancel_all()
+        self.filter_tasks.cancel_all()
 
     def calculate_summaries(self, df: Optional[pd.DataFrame]):
         """Calculate total income, expenses, and net balance for the given DataFrame."""
         return calculate_summaries(df)
 
     def update_keywords(self, description: str, category: str) -> None:
-        """Add a description to the exact match list for a category and save the updated keywords map."""
-        if category not in self.keywords_map:
-            self.keywords_map[category] = {"exact": [], "contains": []}
-        if description not in self.keywords_map[category]["exact"]:
-            self.keywords_map[category]["exact"].append(description)
+        """
+        Add a description to the exact match list for a category, apply it to the rows with that description
+        and save the updated keywords map.
+        """
+        self.add_rule(category, "exact", description)
         save_keywords(self.keywords_map)
 
+    @_holding_data_lock
     def save_keywords_map(self, keywords_map: dict) -> None:
         """Replace and save the entire keywords map."""
         self.keywords_map = keywords_map
+        if self.matcher is not None:
+            self.matcher = KeywordMatcher(self.keywords_map)
         save_keywords(self.keywords_map)
 
     def get_categories(self) -> List[str]:
@@ -68,3 +720,7 @@ class Controller:
     def clear_filters(self) -> None:
         """Delegate to main app's clear_filters method. Overridden by the main app."""
         pass
+
+    def search_changed(self, event=None) -> None:
+        """Delegate to main app's search_changed method. Overridden by the main app."""
+        pass
@@ -1,9 +1,13 @@
 # file: core/data_processor.py
+import glob
+import hashlib
 import json
 import sys
 import os
 import pandas as pd
 
+from core.data_utils import aggregate_by_category
+
 
 def get_config_path():
     """Get config path that works in both development and frozen executable."""
@@ -17,10 +21,45 @@ def get_config_path():
     return os.path.join(base_path, 'config')
 
 
+def get_cache_path():
+    """Get a writable cache directory that works in both development and frozen executable."""
+    if getattr(sys, 'frozen', False):
+        # The bundle directory is temporary, so keep caches in the user's home directory
+        base_path = os.path.join(os.path.expanduser("~"), ".finance_analyzer")
+    else:
+        # Running in development
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    return os.path.join(base_path, 'cache')
+
+
 # This creates a path that works in both development and frozen executable
 CONFIG_DIR = get_config_path()
 KEYWORDS_FILE = os.path.join(CONFIG_DIR, "keywords.json")
 CATEGORIES_FILE = os.path.join(CONFIG_DIR, "categories_list.txt")
+RULE_STATS_FILE = os.path.join(CONFIG_DIR, "keywords_stats.json")
+BANK_PROFILES_FILE = os.path.join(CONFIG_DIR, "bank_profiles.json")
+CACHE_DIR = get_cache_path()
+# One file per keyword-map fingerprint: categorization_cache_<fingerprint>.json
+CATEGORIZATION_CACHE_PATTERN = os.path.join(CACHE_DIR, "categorization_cache_{}.json")
+
+
+def keywords_fingerprint(keywords):
+    """Return a content hash of a keywords map. Order matters, since rule precedence follows map order."""
+    payload = json.dumps(keywords, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def remove_stale_categorization_caches(fingerprint, path_pattern=None):
+    """Delete categorization cache files that were built for a different keywords map."""
+    path_pattern = path_pattern or CATEGORIZATION_CACHE_PATTERN
+    keep = path_pattern.format(fingerprint)
+    for path in glob.glob(path_pattern.format("*")):
+        if path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
 
 
 def load_keywords():
@@ -33,9 +72,31 @@ def load_keywords():
 
 
 def save_keywords(keywords):
-    """Saves the updated keywords dictionary to the config directory."""
+    """
+    Saves the updated keywords dictionary to the config directory.
+    Cached categorizations built for any other keywords map are invalidated.
+    """
     with open(KEYWORDS_FILE, "w", encoding="utf-8") as file:
         json.dump(keywords, file, indent=4, ensure_ascii=False)
+    remove_stale_categorization_caches(keywords_fingerprint(keywords))
+
+
+def save_rule_report(report):
+    """Saves the rule hit/timing report next to the keywords file."""
+    with open(RULE_STATS_FILE, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=4, ensure_ascii=False)
+
+
+def load_bank_profiles():
+    """
+    Loads the bank profiles (header aliases per statement column) from the config directory.
+    Returns an empty dict if the file is missing, in which case only the standard column names are recognized.
+    """
+    try:
+        with open(BANK_PROFILES_FILE, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
 
 
 def load_categories():
@@ -47,39 +108,12 @@ def load_categories():
         return []
 
 
-# --- UPDATED AND SAFER FUNCTION ---
 def get_category_summary(dataframe):
     """
     Calculates the sum of 'Amount' for each 'Category', sorts them,
-    and returns a summary DataFrame.
+    and returns a summary DataFrame (uncategorized rows are left out).
     """
-    # First, check if the dataframe or the required columns exist.
-    if (
-        dataframe is None
-        or "Category" not in dataframe.columns
-        or "Amount" not in dataframe.columns
-    ):
+    if dataframe is None or "Category" not in dataframe.columns:
         return pd.DataFrame(columns=["Category", "Total"])
-
-    # Now that we know the 'Category' column exists, check if it's all empty.
-    if dataframe["Category"].eq("").all():
-        return pd.DataFrame(columns=["Category", "Total"])
-
-    # Filter out uncategorized items for the summary table
-    categorized_df = dataframe[dataframe["Category"] != ""].copy()
-    if categorized_df.empty:
-        return pd.DataFrame(columns=["Category", "Total"])
-
-    # Group by 'Category', sum the 'Amount', and make it a DataFrame again
-    summary = (
-        categorized_df.groupby("Category").agg(Total=("Amount", "sum")).reset_index()
-    )
-
-    # Round the Total column to two decimal places
-    summary["Total"] = summary["Total"].round(2)
-
-    # Sort by amount to see the biggest items first
-    summary = summary.sort_values(by="Total", ascending=True)
-
-    # Do NOT format 'Total' as string here; keep as float for charting
-    return summary
+    # One bincount pass over the category codes; Total stays a float for charting
+    return aggregate_by_category(dataframe).summary()
@@ -1,5 +1,164 @@
+import numpy as np
 import pandas as pd
-from typing import Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Union
+
+from config.constants import DAY_FIRST_DATE_FORMATS, DEFAULT_DAYFIRST, ISO_DATE_FORMATS, MONTH_FIRST_DATE_FORMATS
+from core.description_index import DescriptionIndex
+from core.partition_index import PartitionIndex
+from core.sorted_index import SortedIndex
+
+# An inclusive (low, high) range; either bound may be None for an open end
+Range = Tuple[Optional[Any], Optional[Any]]
+# Sort keys, most significant first: (rank codes of a column from sort_codes, ascending)
+SortKeys = Sequence[Tuple[np.ndarray, bool]]
+
+# Indexed search looks matching rows up by label when they are under 1/SEARCH_MASK_RATIO of the frame
+SEARCH_MASK_RATIO = 8
+
+
+@dataclass
+class CategoryAggregates:
+    """
+    Amount totals of a set of rows by category ('' for uncategorized), as computed by aggregate_by_category.
+    The arrays are aligned with categories.
+    """
+    categories: List[str]
+    counts: np.ndarray  # Rows per category
+    positive: np.ndarray  # Sum of the positive amounts per category
+    negative: np.ndarray  # Sum of the negative amounts per category
+
+    @property
+    def category_totals(self) -> np.ndarray:
+        """Net total per category."""
+        return self.positive + self.negative
+
+    def totals(self) -> Tuple[float, float, float]:
+        """Return (income, expenses, net) over all rows."""
+        income, expenses = float(self.positive.sum()), float(self.negative.sum())
+        return income, expenses, income + expenses
+
+    def summary(self) -> pd.DataFrame:
+        """Return the totals of the categorized rows as a Category/Total table, smallest total first."""
+        present = [i for i, name in enumerate(self.categories) if name != "" and self.counts[i] > 0]
+        if not present:
+            return pd.DataFrame(columns=["Category", "Total"])
+        summary = pd.DataFrame({
+            "Category": [self.categories[i] for i in present],
+            "Total": self.category_totals[present].round(2),
+        })
+        return summary.sort_values(by="Total", ascending=True)
+
+
+@dataclass
+class FilterView:
+    """
+    A filtered view of the transactions with everything the UI shows for it.
+    The summary table, chart and totals all read the one CategoryAggregates of its rows.
+    positions are the positions of the rows in the frame they were taken from, in view order.
+    """
+    df: pd.DataFrame
+    aggregates: CategoryAggregates
+    positions: np.ndarray
+    summary: pd.DataFrame = field(init=False)  # Totals by category (get_category_summary)
+
+    def __post_init__(self):
+        self.summary = self.aggregates.summary()
+
+    @property
+    def totals(self) -> Tuple[float, float, float]:
+        """Income, expenses and net (calculate_summaries)."""
+        return self.aggregates.totals()
+
+
+def numeric_amounts(df: pd.DataFrame) -> pd.Series:
+    """Return the 'Amount' column as numbers, converting only if it is not numeric already (e.g. not normalized)."""
+    amounts = df["Amount"]
+    if pd.api.types.is_numeric_dtype(amounts):
+        return amounts
+    return pd.to_numeric(amounts, errors="coerce")
+
+
+def intern_strings(values: pd.Series) -> pd.Series:
+    """
+    Dictionary-encode a text column and decode it back, so equal strings share a single object.
+    Missing values stay NaN.
+    """
+    codes, uniques = pd.factorize(values)
+    # Append NaN so that code -1 (missing value) lands on a missing slot
+    lookup = np.append(np.asarray(uniques, dtype=object), np.nan)
+    return pd.Series(lookup[codes], index=values.index, dtype=object, name=values.name)
+
+
+def to_category(values: pd.Series, categories: Iterable[str] = ()) -> pd.Series:
+    """
+    Convert a category column to a pandas Categorical over the given categories plus any other value present.
+    Categories are kept sorted, with '' (uncategorized) first, so sorting the column sorts by name.
+    Missing values become ''.
+    """
+    present = values.astype(str) if isinstance(values.dtype, pd.CategoricalDtype) else values.fillna("")
+    names = sorted(set(categories) | set(present.unique()) | {""})
+    return present.astype(pd.CategoricalDtype(names))
+
+
+def add_category(values: pd.Series, category: str) -> pd.Series:
+    """Return a Categorical column that can hold the given category, keeping the categories sorted."""
+    if not isinstance(values.dtype, pd.CategoricalDtype) or category in values.cat.categories:
+        return values
+    return values.cat.set_categories(sorted([*values.cat.categories, category]))
+
+
+def normalize_transactions(df: pd.DataFrame, categories: Iterable[str] = ()) -> pd.DataFrame:
+    """
+    Compact in-memory layout of a statement, applied once at load and after analysis:
+    'Amount' as float64 (coerced once, so filters and summaries need no conversion),
+    'Description' with equal strings sharing one object, and 'Category' as a Categorical.
+    Args:
+        df: The DataFrame to normalize; it is modified in place.
+        categories: Known category names to include in the Categorical.
+    Returns:
+        The same DataFrame.
+    """
+    if "Amount" in df.columns and df["Amount"].dtype != "float64":
+        df["Amount"] = pd.to_numeric(df["Amount"], errors="coerce").astype("float64")
+    if "Description" in df.columns and df["Description"].dtype == object:
+        df["Description"] = intern_strings(df["Description"])
+    if "Category" in df.columns:
+        df["Category"] = to_category(df["Category"], categories)
+    return df
+
+
+def parse_dates(
+    values: pd.Series, dayfirst: bool = DEFAULT_DAYFIRST, date_format: Optional[str] = None
+) -> Tuple[pd.Series, pd.Index]:
+    """
+    Parse an 'Accounting date' column into a separate datetime64 Series; the column itself is left as loaded.
+    Each distinct value is tried against date_format if given, else against ISO_DATE_FORMATS and then the
+    day-first (or, with dayfirst False, month-first) numeric formats, so a column mixing formats is parsed
+    value by value instead of being guessed from its first rows. Datetime columns are returned as they are.
+    Returns:
+        The parsed dates, aligned with values (NaT where blank or unparseable), and the labels of the rows
+        whose non-blank value matched no format.
+    """
+    if values.dtype.kind == "M":
+        return values, values.index[:0]
+    formats = (date_format,) if date_format else (
+        ISO_DATE_FORMATS + (DAY_FIRST_DATE_FORMATS if dayfirst else MONTH_FIRST_DATE_FORMATS)
+    )
+    # Statements repeat dates on many rows: parse each distinct text once
+    codes, uniques = pd.factorize(values)
+    text = pd.Series([str(value).strip() for value in uniques], dtype=object)
+    parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+    for fmt in formats:
+        remaining = parsed.isna() & (text != "")
+        if not remaining.any():
+            break
+        # Values not in this format stay NaT here and are tried against the next one
+        parsed[remaining] = pd.to_datetime(text[remaining], format=fmt, errors="coerce")
+    failed = np.append((parsed.isna() & (text != "")).to_numpy(), False)  # Code -1 (missing) never fails
+    dates = pd.Series(np.append(parsed.to_numpy(), np.datetime64("NaT", "ns"))[codes], index=values.index,
+                      name=values.name)
+    return dates, values.index[failed[codes]]
 
 
 def filter_dataframe(
@@ -7,46 +166,138 @@ def filter_dataframe(
     category: Optional[str] = None,
     search_term: Optional[str] = None,
     value_filter: Optional[str] = None,
+    search_index: Optional[DescriptionIndex] = None,
+    partitions: Optional[PartitionIndex] = None,
+    date_range: Optional[Range] = None,
+    amount_range: Optional[Range] = None,
+    date_index: Optional[SortedIndex] = None,
+    amount_index: Optional[SortedIndex] = None,
+    sort_keys: Optional[SortKeys] = None,
+    dates: Optional[pd.Series] = None,
 ) -> Optional[pd.DataFrame]:
     """
-    Filter the DataFrame by category, search term, and value (positive/negative/all).
+    Filter the DataFrame by category, search term, value (positive/negative/all), date range and amount range.
     Args:
         df: The DataFrame to filter.
         category: Category filter ('All Categories', 'Uncategorized', or specific category).
-        search_term: Substring to search for in the 'Description' column.
+        search_term: Substring to search for in the 'Description' column (case-insensitive, literal).
         value_filter: 'All', 'Positive', or 'Negative'.
+        search_index: Optional DescriptionIndex of df; the search then only looks at candidate rows from its
+            trigram index instead of scanning the whole column.
+        partitions: Optional PartitionIndex of df; the category and value filters then read its row groups
+            instead of building masks over the whole frame.
+        date_range: Optional (start, end) for 'Accounting date', both inclusive; either end may be None.
+        amount_range: Optional (min, max) for 'Amount', both inclusive; either end may be None.
+        date_index: Optional SortedIndex of the parsed dates; the date range is then two binary searches.
+        amount_index: Optional SortedIndex of 'Amount'; the amount range is then two binary searches.
+        sort_keys: Optional sort keys aligned with the rows of df; only the filtered rows are then sorted.
+        dates: Optional parsed dates of df by row label (see parse_dates), for a date range without date_index;
+            otherwise the 'Accounting date' column is parsed with the default formats.
     Returns:
-        Filtered DataFrame or None if input is None.
+        Filtered DataFrame, keeping the row labels (row ids) of df, or None if input is None.
     """
     if df is None:
         return df
-    filtered = df
-    if category == "Uncategorized":
-        filtered = filtered[filtered["Category"] == ""]
-    elif category and category != "All Categories":
-        filtered = filtered[filtered["Category"] == category]
-    if search_term:
-        filtered = filtered[filtered["Description"].str.contains(search_term, case=False, na=False)]
-    if value_filter == "Positive":
-        filtered = filtered[pd.to_numeric(filtered["Amount"], errors="coerce") > 0]
-    elif value_filter == "Negative":
-        filtered = filtered[pd.to_numeric(filtered["Amount"], errors="coerce") < 0]
-    return filtered.reset_index(drop=True)
-
-
-def sort_dataframe(df: Optional[pd.DataFrame], column: str, ascending: bool = True) -> Optional[pd.DataFrame]:
-    """
-    Sort the DataFrame by the given column and order.
+    category_key = "" if category == "Uncategorized" else category
+    if category_key == "All Categories":
+        category_key = None
+    date_range = date_range if date_range is not None and any(bound is not None for bound in date_range) else None
+    amount_range = amount_range if amount_range is not None and any(bound is not None for bound in amount_range) else None
+    # Sorted row positions selected through the indexes (None = not narrowed yet)
+    selections = []
+    if partitions is not None:
+        selections.append(partitions.rows(category_key, value_filter))
+    if date_range is not None and date_index is not None:
+        selections.append(date_index.between(*date_range))
+    if amount_range is not None and amount_index is not None:
+        selections.append(amount_index.between(*amount_range))
+    broad_matches = None
+    if search_term and search_index is not None:
+        # Broad terms match a large share of the rows, and then a membership mask is cheaper than row lookups
+        matches = search_index.matching_descriptions(search_term)
+        if search_index.row_count(matches) * SEARCH_MASK_RATIO < len(df):
+            found = df.index.get_indexer(list(search_index.rows_for(matches)))
+            selections.append(np.sort(found[found >= 0]))
+        else:
+            broad_matches = matches
+    positions = None
+    for selected in sorted((s for s in selections if s is not None), key=len):
+        positions = selected if positions is None else np.intersect1d(positions, selected, assume_unique=True)
+    filtered = df if positions is None else df.iloc[positions]
+    if broad_matches is not None:
+        filtered = filtered[filtered["Description"].isin(broad_matches)]
+    if partitions is None:
+        if category_key is not None:
+            filtered = filtered[filtered["Category"] == category_key]
+        if value_filter == "Positive":
+            filtered = filtered[numeric_amounts(filtered) > 0]
+        elif value_filter == "Negative":
+            filtered = filtered[numeric_amounts(filtered) < 0]
+    if date_range is not None and date_index is None:
+        start, end = date_range
+        dates = dates.loc[filtered.index] if dates is not None else parse_dates(filtered["Accounting date"])[0]
+        filtered = filtered[_between_mask(dates, pd.Timestamp(start) if start is not None else None,
+                                          pd.Timestamp(end) if end is not None else None)]
+    if amount_range is not None and amount_index is None:
+        filtered = filtered[_between_mask(numeric_amounts(filtered), *amount_range)]
+    if search_term and search_index is None:
+        filtered = filtered[filtered["Description"].str.contains(search_term, case=False, na=False, regex=False)]
+    if sort_keys:
+        filtered = filtered.iloc[sort_order(df.index.get_indexer(filtered.index), sort_keys)]
+    return filtered
+
+
+def _between_mask(values: pd.Series, low, high) -> pd.Series:
+    """Return low <= values <= high as a mask; a bound of None is open and missing values never match."""
+    mask = values.notna()
+    if low is not None:
+        mask &= values >= low
+    if high is not None:
+        mask &= values <= high
+    return mask
+
+
+def sort_codes(values: pd.Series) -> np.ndarray:
+    """
+    Return the dense rank of each value: equal values share a code, codes follow the sort order of the values
+    (the category order for a Categorical) and missing values are -1. Both directions sort from the same codes.
+    """
+    codes, _ = pd.factorize(values, sort=True)
+    return codes
+
+
+def sort_order(positions: np.ndarray, sort_keys: SortKeys) -> np.ndarray:
+    """
+    Return the order (indices into positions) that sorts the rows at positions by the keys.
+    The sort is stable and puts missing values last in either direction, like DataFrame.sort_values.
+    """
+    columns = []
+    for codes, ascending in reversed(sort_keys):  # np.lexsort takes the most significant key last
+        key = codes[positions].astype(np.int64)
+        if ascending:
+            key[key < 0] = len(codes)
+        else:
+            key = -key  # Missing (-1) becomes 1, after every other -code <= 0
+        columns.append(key)
+    return np.lexsort(columns)
+
+
+def sort_dataframe(
+    df: Optional[pd.DataFrame], column: Union[str, List[str]], ascending: Union[bool, List[bool]] = True
+) -> Optional[pd.DataFrame]:
+    """
+    Sort the DataFrame by the given column(s) and order(s), keeping the order of equal rows.
     Args:
         df: The DataFrame to sort.
-        column: Column name to sort by.
-        ascending: Sort order.
+        column: Column name, or list of column names, to sort by (most significant first).
+        ascending: Sort order, or one order per column.
     Returns:
-        Sorted DataFrame or None if input is None or column not found.
+        Sorted DataFrame or None if input is None or a column is not found.
     """
-    if df is None or column not in df.columns:
+    columns = [column] if isinstance(column, str) else list(column)
+    if df is None or any(name not in df.columns for name in columns):
         return df
-    return df.sort_values(by=column, ascending=ascending)
+    return df.sort_values(by=columns, ascending=ascending, kind="stable")
 
 
 def prepare_export(
@@ -68,6 +319,41 @@ def prepare_export(
     return filter_dataframe(df, category, search_term, value_filter)
 
 
+def aggregate_by_category(df: Optional[pd.DataFrame]) -> CategoryAggregates:
+    """
+    Aggregate the amounts of the DataFrame by category in one vectorized pass: np.bincount over the category
+    codes, weighted by the positive and the negative amounts, gives the row count and both sums of every
+    category at once, without grouping or copying the rows.
+    Missing amounts count as 0 and rows without a category as uncategorized ('').
+    Args:
+        df: The DataFrame to aggregate.
+    Returns:
+        CategoryAggregates with categories in sorted order (the category order for a Categorical).
+    """
+    if df is None or "Amount" not in df.columns:
+        return CategoryAggregates([], np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0))
+    if "Category" not in df.columns:
+        codes, categories = np.zeros(len(df), dtype=np.intp), [""]
+    elif isinstance(df["Category"].dtype, pd.CategoricalDtype):
+        codes = df["Category"].cat.codes.to_numpy()
+        categories = [str(name) for name in df["Category"].cat.categories]
+    else:
+        codes, uniques = pd.factorize(df["Category"], sort=True)
+        categories = [str(name) for name in uniques]
+    if (codes < 0).any():
+        if "" not in categories:
+            categories = [*categories, ""]
+        codes = np.where(codes < 0, categories.index(""), codes)
+    amounts = numeric_amounts(df).to_numpy(dtype="float64", na_value=0.0)
+    size = len(categories)
+    return CategoryAggregates(
+        categories=categories,
+        counts=np.bincount(codes, minlength=size),
+        positive=np.bincount(codes, weights=np.maximum(amounts, 0.0), minlength=size),
+        negative=np.bincount(codes, weights=np.minimum(amounts, 0.0), minlength=size),
+    )
+
+
 def calculate_summaries(df: Optional[pd.DataFrame]) -> Tuple[float, float, float]:
     """
     Calculate total income, expenses, and net balance from the DataFrame.
@@ -76,10 +362,4 @@ def calculate_summaries(df: Optional[pd.DataFrame]) -> Tuple[float, float, float
     Returns:
         Tuple of (income, expenses, net balance).
     """
-    if df is None or "Amount" not in df.columns:
-        return 0.0, 0.0, 0.0
-    amounts = pd.to_numeric(df["Amount"], errors="coerce").fillna(0)
-    total_income = amounts[amounts > 0].sum()
-    total_expenses = amounts[amounts < 0].sum()
-    net_balance = amounts.sum()
-    return total_income, total_expenses, net_balance
+    return aggregate_by_category(df).totals()
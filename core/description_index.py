@@ -0,0 +1,92 @@
+# file: core/description_index.py
+from typing import Dict, Hashable, Iterable, Optional, Set, Tuple
+
+import pandas as pd
+
+from core.search_index import TrigramIndex
+
+
+class DescriptionIndex:
+    """
+    Inverted index from description to the labels of the rows that carry it.
+    Lets a rule change touch only the rows whose description is affected instead of the whole frame.
+    A trigram index over the distinct text descriptions answers substring searches; a search whose term
+    extends the previous term only re-tests the previous matches.
+    """
+    def __init__(self, descriptions: pd.Series):
+        """Build the index from a 'Description' column; row labels are taken from its index."""
+        self._rows: Dict[Hashable, Set[Hashable]] = {}
+        groups = descriptions.groupby(descriptions, sort=False).groups
+        for description, labels in groups.items():
+            self._rows[description] = set(labels)
+        self._search = TrigramIndex(d for d in self._rows if isinstance(d, str))
+        # Bumped whenever the set of descriptions changes, which invalidates the last search
+        self._version = 0
+        self._last_search: Optional[Tuple[int, str, Set[str]]] = None
+
+    def rows(self, description: Hashable) -> Set[Hashable]:
+        """Return the labels of the rows with the given description (empty if none)."""
+        return self._rows.get(description, set())
+
+    def rows_for(self, descriptions: Iterable[Hashable]) -> Set[Hashable]:
+        """Return the labels of all rows carrying any of the given descriptions."""
+        labels: Set[Hashable] = set()
+        for description in descriptions:
+            labels |= self.rows(description)
+        return labels
+
+    def matching_descriptions(self, term: str) -> Set[str]:
+        """Return the distinct descriptions containing term, ignoring case."""
+        version, last = self._version, self._last_search
+        if last is not None and last[0] == version and last[1].lower() in term.lower():
+            matches = self._search.refine(term, last[2])
+        else:
+            matches = self._search.search(term)
+        self._last_search = (version, term, matches)
+        return matches
+
+    def search(self, term: str) -> Set[Hashable]:
+        """Return the labels of the rows whose description contains term, ignoring case."""
+        return self.rows_for(self.matching_descriptions(term))
+
+    def row_count(self, descriptions: Iterable[Hashable]) -> int:
+        """Return the number of rows carrying any of the given descriptions."""
+        return sum(len(self.rows(description)) for description in descriptions)
+
+    def descriptions(self) -> Iterable[Hashable]:
+        """Return all distinct descriptions currently present."""
+        return self._rows.keys()
+
+    def add(self, label: Hashable, description: Hashable) -> None:
+        """Register a row under a description."""
+        if pd.isna(description):
+            return
+        if description not in self._rows and isinstance(description, str):
+            self._search.add(description)
+            self._version += 1
+        self._rows.setdefault(description, set()).add(label)
+
+    def remove(self, label: Hashable, description: Hashable) -> None:
+        """Unregister a row from a description, dropping the description once no row uses it."""
+        labels = self._rows.get(description)
+        if labels is None:
+            return
+        labels.discard(label)
+        if not labels:
+            del self._rows[description]
+            if isinstance(description, str):
+                self._search.remove(description)
+                self._version += 1
+
+    def move(self, label: Hashable, old_description: Hashable, new_description: Hashable) -> None:
+        """Re-register a row whose description was edited."""
+        if old_description == new_description:
+            return
+        self.remove(label, old_description)
+        self.add(label, new_description)
+
+    def __contains__(self, description: Hashable) -> bool:
+        return description in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
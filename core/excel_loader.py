@@ -0,0 +1,215 @@
+# file: core/excel_loader.py
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from config.constants import HEADER_SNIFF_ROWS
+
+# Use the Rust-based calamine reader when it is installed (pandas engine="calamine"); it is optional
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+# The only columns the app keeps from a bank statement
+STATEMENT_COLUMNS = ["Accounting date", "Description", "Amount"]
+# A header row must contain at least these columns
+REQUIRED_COLUMNS = ["Description", "Amount"]
+
+# Rows read between two progress reports of the streaming reader
+PROGRESS_EVERY_ROWS = 5_000
+
+
+@dataclass
+class LoadStats:
+    """
+    Size and speed of one workbook load.
+    """
+    rows: int
+    seconds: float
+    engine: str
+
+    @property
+    def rows_per_second(self) -> float:
+        """Rows parsed per second of wall time."""
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+
+@dataclass
+class HeaderLayout:
+    """
+    Where the header of a statement sheet is, and which sheet column holds each statement column.
+    """
+    skiprows: int  # Rows above the header row
+    profile: str  # Bank profile whose aliases matched
+    positions: Dict[str, int]  # Statement column -> 0-based sheet column
+
+
+def _typed_frame(columns: dict) -> pd.DataFrame:
+    """Build the statement DataFrame, coercing 'Amount' to float64 once and empty cells to NaN."""
+    df = pd.DataFrame(columns)
+    for name in df.columns:
+        if df[name].dtype == object:
+            df[name] = df[name].where(df[name].notna(), np.nan)
+    if "Amount" in df.columns:
+        df["Amount"] = pd.to_numeric(df["Amount"], errors="coerce").astype("float64")
+    return df
+
+
+def _normalize(cell) -> str:
+    """Return a header cell as comparable text."""
+    return str(cell).strip().casefold() if cell is not None else ""
+
+
+def match_header(
+    cells: Sequence, profiles: Dict[str, Dict[str, List[str]]], columns: Sequence[str] = STATEMENT_COLUMNS
+) -> Optional[Tuple[str, Dict[str, int]]]:
+    """
+    Match one sheet row against the bank profiles.
+    A profile maps each statement column to its header aliases; the column's own name always matches too.
+    Returns (profile name, {column: sheet position}) for the profile matching the most columns,
+    or None if no profile finds all REQUIRED_COLUMNS in the row.
+    """
+    names: Dict[str, int] = {}
+    for position, cell in enumerate(cells):
+        if cell is not None:
+            names.setdefault(_normalize(cell), position)
+    if not names:
+        return None
+    best = None
+    for profile, aliases in (profiles or {"Default": {}}).items():
+        positions = {}
+        for column in columns:
+            for alias in [column, *aliases.get(column, [])]:
+                if _normalize(alias) in names:
+                    positions[column] = names[_normalize(alias)]
+                    break
+        required = [column for column in REQUIRED_COLUMNS if column in columns]
+        if all(column in positions for column in required) and (best is None or len(positions) > len(best[1])):
+            best = (profile, positions)
+    return best
+
+
+def _find_header(
+    rows: Iterator[Sequence],
+    profiles: Dict[str, Dict[str, List[str]]],
+    columns: Sequence[str],
+    skiprows: Optional[int],
+    sniff_rows: int,
+) -> HeaderLayout:
+    """
+    Consume rows up to and including the header row and return its layout.
+    With skiprows given only that row is considered; otherwise the first sniff_rows rows are searched.
+    """
+    last = skiprows if skiprows is not None else sniff_rows - 1
+    for index, row in enumerate(rows):
+        if index > last:
+            break
+        if skiprows is not None and index < skiprows:
+            continue
+        match = match_header(row, profiles, columns)
+        if match is not None:
+            return HeaderLayout(skiprows=index, profile=match[0], positions=match[1])
+    where = f"row {skiprows + 1}" if skiprows is not None else f"the first {sniff_rows} rows"
+    raise ValueError(f"No header with the columns {', '.join(REQUIRED_COLUMNS)} found in {where}.")
+
+
+def detect_header(
+    filepath: str,
+    profiles: Optional[Dict[str, Dict[str, List[str]]]] = None,
+    columns: Sequence[str] = STATEMENT_COLUMNS,
+    skiprows: Optional[int] = None,
+    sniff_rows: int = HEADER_SNIFF_ROWS,
+) -> HeaderLayout:
+    """Find the header row of the first sheet, reading only the rows up to it (at most sniff_rows)."""
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(min_row=1, values_only=True)
+        return _find_header(rows, profiles or {}, columns, skiprows, sniff_rows)
+    finally:
+        workbook.close()
+
+
+def _read_streaming(
+    filepath: str,
+    profiles: Dict[str, Dict[str, List[str]]],
+    columns: Sequence[str],
+    skiprows: Optional[int],
+    progress: Optional[Callable[[float, str], None]] = None,
+) -> Tuple[pd.DataFrame, HeaderLayout]:
+    """
+    Read the first sheet with openpyxl in read-only mode, iterating rows as plain values.
+    The header is found while streaming, then only the wanted columns of the rows below it are kept.
+    Trailing blank rows are dropped, as pd.read_excel does.
+    """
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        rows = sheet.iter_rows(min_row=1, values_only=True)
+        layout = _find_header(rows, profiles, columns, skiprows, HEADER_SNIFF_ROWS)
+        # The sheet dimension can be missing from the file, in which case progress is reported by row count only
+        total_rows = max((sheet.max_row or 0) - layout.skiprows - 1, 0)
+        positions = list(layout.positions.items())
+        values: List[List] = [[] for _ in positions]
+        last_filled = 0
+        for count, row in enumerate(rows, 1):
+            if progress is not None and count % PROGRESS_EVERY_ROWS == 0:
+                progress(count / total_rows if total_rows else 0.0, f"Read {count:,} rows")
+            if any(cell is not None for cell in row):
+                last_filled = len(values[0]) + 1 if values else 0
+            for target, (_, position) in zip(values, positions):
+                target.append(row[position] if position < len(row) else None)
+    finally:
+        workbook.close()
+    return _typed_frame({name: column[:last_filled] for (name, _), column in zip(positions, values)}), layout
+
+
+def _read_calamine(
+    filepath: str, profiles: Dict[str, Dict[str, List[str]]], columns: Sequence[str], skiprows: Optional[int]
+) -> Tuple[pd.DataFrame, HeaderLayout]:
+    """Find the header with a short openpyxl sniff, then read the wanted columns with the calamine engine."""
+    layout = detect_header(filepath, profiles, columns, skiprows)
+    by_position = sorted((position, name) for name, position in layout.positions.items())
+    df = pd.read_excel(
+        filepath, skiprows=layout.skiprows, engine="calamine", usecols=[position for position, _ in by_position]
+    )
+    df.columns = [name for _, name in by_position]
+    return _typed_frame({name: df[name] for name in columns if name in df.columns}), layout
+
+
+def read_statement(
+    filepath: str,
+    skiprows: Optional[int] = None,
+    columns: Sequence[str] = STATEMENT_COLUMNS,
+    engine: Optional[str] = None,
+    progress: Optional[Callable[[float, str], None]] = None,
+    profiles: Optional[Dict[str, Dict[str, List[str]]]] = None,
+) -> Tuple[pd.DataFrame, LoadStats]:
+    """
+    Load a bank statement workbook, parsing only the needed columns into typed arrays.
+    Args:
+        filepath: Path to the .xlsx file.
+        skiprows: Number of rows above the header row; None detects the header in the first HEADER_SNIFF_ROWS rows.
+        columns: Columns to keep, under these names; optional columns missing from the sheet are left out.
+        engine: 'calamine' or 'openpyxl'; by default calamine is used when installed.
+        progress: Optional progress(fraction, message) callback, called every few thousand rows by the streaming reader.
+        profiles: Bank profiles mapping each column to its header aliases (see config/bank_profiles.json).
+    Returns:
+        Tuple of (DataFrame, LoadStats). The detected HeaderLayout is stored as a dict in df.attrs["header"].
+    Raises:
+        ValueError: If no header row with the required columns is found.
+    """
+    if engine is None:
+        engine = "calamine" if CALAMINE_AVAILABLE else "openpyxl"
+    start = time.perf_counter()
+    if engine == "calamine":
+        df, layout = _read_calamine(filepath, profiles or {}, columns, skiprows)
+    else:
+        df, layout = _read_streaming(filepath, profiles or {}, columns, skiprows, progress)
+    df.attrs["header"] = asdict(layout)
+    return df, LoadStats(rows=len(df), seconds=time.perf_counter() - start, engine=engine)
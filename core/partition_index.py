@@ -0,0 +1,113 @@
+# file: core/partition_index.py
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Value filter names and the amount sign each one selects
+SIGNS = {"Positive": 1, "Negative": -1}
+
+
+def _group_positions(codes: np.ndarray) -> Dict[int, np.ndarray]:
+    """Return the sorted row positions of each code."""
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    keys, starts = np.unique(sorted_codes, return_index=True)
+    bounds = np.append(starts, len(codes))
+    return {int(key): order[bounds[i]:bounds[i + 1]] for i, key in enumerate(keys)}
+
+
+def _signs(amounts: Iterable) -> np.ndarray:
+    """Return the sign of each amount as int8 (0 for zero or missing amounts)."""
+    values = np.asarray(pd.to_numeric(pd.Series(amounts), errors="coerce"), dtype="float64")
+    return np.nan_to_num(np.sign(values)).astype(np.int8)
+
+
+class PartitionIndex:
+    """
+    Row positions grouped by category ('' for uncategorized) and by amount sign, aligned with the row order
+    of the indexed frame. Each group is a sorted position array and every row also keeps its category and
+    sign code, so a filter takes the smallest matching group and checks the other conditions on it alone:
+    the cost follows the result size, not the table size.
+    """
+    def __init__(self, categories: pd.Series, amounts: pd.Series):
+        """Build the partitions from the 'Category' and 'Amount' columns of a frame."""
+        codes, uniques = pd.factorize(categories.astype(str), sort=False)
+        self._category_ids: Dict[str, int] = {name: i for i, name in enumerate(uniques)}
+        self._category_codes = codes.astype(np.int32)
+        self._sign_codes = _signs(amounts)
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Regroup the positions from the per-row codes."""
+        self._category_rows = _group_positions(self._category_codes)
+        self._sign_rows = _group_positions(self._sign_codes)
+
+    def _category_id(self, category: str) -> int:
+        """Return the code of a category, registering it if it is new."""
+        return self._category_ids.setdefault(category, len(self._category_ids))
+
+    def rows(self, category: Optional[str] = None, value_filter: Optional[str] = None) -> Optional[np.ndarray]:
+        """
+        Return the sorted positions of the rows in category ('' for uncategorized) with the sign selected by
+        value_filter ('Positive' or 'Negative'). Conditions given as None are not applied; returns None when
+        neither is, meaning every row.
+        """
+        sign = SIGNS.get(value_filter)
+        if category is None and sign is None:
+            return None
+        empty = np.empty(0, dtype=np.intp)
+        category_id = self._category_ids.get(category) if category is not None else None
+        if category is not None and category_id is None:
+            return empty
+        by_category = self._category_rows.get(category_id, empty) if category_id is not None else None
+        by_sign = self._sign_rows.get(sign, empty) if sign is not None else None
+        if by_sign is None:
+            return by_category
+        if by_category is None:
+            return by_sign
+        if len(by_category) <= len(by_sign):
+            return by_category[self._sign_codes[by_category] == sign]
+        return by_sign[self._category_codes[by_sign] == category_id]
+
+    def set_category(self, positions: Iterable[int], category: str) -> None:
+        """Move rows to a new category, regrouping each affected category once however many rows move."""
+        positions = np.asarray(list(positions), dtype=np.intp)
+        new_id = self._category_id(category)
+        positions = positions[self._category_codes[positions] != new_id]
+        if not len(positions):
+            return
+        for old_id in np.unique(self._category_codes[positions]):
+            group = self._category_rows[int(old_id)]
+            self._category_rows[int(old_id)] = group[~np.isin(group, positions)]
+        new = self._category_rows.get(new_id, np.empty(0, dtype=positions.dtype))
+        self._category_rows[new_id] = np.union1d(new, positions)
+        self._category_codes[positions] = new_id
+
+    def set_amount(self, position: int, amount) -> None:
+        """Move a row to the sign group of its new amount."""
+        old_sign, sign = int(self._sign_codes[position]), int(_signs([amount])[0])
+        if old_sign != sign:
+            self._move(self._sign_rows, old_sign, sign, position)
+            self._sign_codes[position] = sign
+
+    def remove(self, position: int) -> None:
+        """Drop a deleted row; the rows after it move up one position."""
+        for groups, codes in ((self._category_rows, self._category_codes), (self._sign_rows, self._sign_codes)):
+            key = int(codes[position])
+            groups[key] = np.delete(groups[key], np.searchsorted(groups[key], position))
+            for key, group in groups.items():
+                group[group > position] -= 1
+        self._category_codes = np.delete(self._category_codes, position)
+        self._sign_codes = np.delete(self._sign_codes, position)
+
+    @staticmethod
+    def _move(groups: Dict[int, np.ndarray], old_key: int, new_key: int, position: int) -> None:
+        """Move one position from one sorted group to another."""
+        old = groups[old_key]
+        groups[old_key] = np.delete(old, np.searchsorted(old, position))
+        new = groups.get(new_key, np.empty(0, dtype=old.dtype))
+        groups[new_key] = np.insert(new, np.searchsorted(new, position), position)
+
+    def __len__(self) -> int:
+        return len(self._category_codes)
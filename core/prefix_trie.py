@@ -0,0 +1,71 @@
+# file: core/prefix_trie.py
+from typing import Any, Dict, List, Optional
+
+# Key under which a node stores its value; real keys are always single characters
+_VALUE = None
+
+
+class PrefixTrie:
+    """
+    Character trie mapping literal prefixes to values.
+    Finding the longest stored prefix of a text costs O(len(text)), however many prefixes are stored.
+    """
+    def __init__(self):
+        """Create an empty trie."""
+        self.root: Dict[Any, Any] = {}
+        self._size = 0
+
+    def insert(self, prefix: str, value: Any, overwrite: bool = False) -> None:
+        """
+        Store a value for a prefix. An existing value for the same prefix is kept unless overwrite is True.
+        Empty prefixes are ignored, since they would match every text.
+        """
+        if not prefix:
+            return
+        node = self.root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        if _VALUE not in node:
+            self._size += 1
+        elif not overwrite:
+            return
+        node[_VALUE] = value
+
+    def longest_match(self, text: str) -> Optional[Any]:
+        """Return the value of the longest stored prefix of text, or None if no prefix matches."""
+        node = self.root
+        found = None
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                break
+            if _VALUE in node:
+                found = node[_VALUE]
+        return found
+
+    def values(self) -> List[Any]:
+        """Return all stored values."""
+        values = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key is _VALUE:
+                    values.append(child)
+                else:
+                    stack.append(child)
+        return values
+
+    def remap(self, mapping: Dict[Any, Any]) -> None:
+        """Replace every stored value v by mapping[v]."""
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key is _VALUE:
+                    node[_VALUE] = mapping[child]
+                else:
+                    stack.append(child)
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,182 @@
+# file: core/rollup.py
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Period granularities of the cube
+PERIODS = ("day", "week", "month", "year")
+# Values a cube cell can report
+MEASURES = ("net", "income", "expenses", "count")
+
+# 1970-01-01 was a Thursday; weeks start on Monday, three days earlier
+_WEEK_OFFSET_DAYS = 3
+_NS_PER_DAY = 86_400 * 10**9
+
+
+def period_codes(days: np.ndarray, period: str) -> np.ndarray:
+    """Return the integer period (days, weeks, months or years since 1970) of each day number since 1970."""
+    days = np.asarray(days, dtype=np.int64)
+    if period == "day":
+        return days
+    if period == "week":
+        return (days + _WEEK_OFFSET_DAYS) // 7
+    if period == "month":
+        return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    if period == "year":
+        return days.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64)
+    raise ValueError(f"Unknown period: {period}")
+
+
+def period_starts(codes: np.ndarray, period: str) -> np.ndarray:
+    """Return the first day (datetime64[D]) of each period code."""
+    if period == "day":
+        return codes.astype("datetime64[D]")
+    if period == "week":
+        return (codes * 7 - _WEEK_OFFSET_DAYS).astype("datetime64[D]")
+    if period == "month":
+        return codes.astype("datetime64[M]").astype("datetime64[D]")
+    if period == "year":
+        return codes.astype("datetime64[Y]").astype("datetime64[D]")
+    raise ValueError(f"Unknown period: {period}")
+
+
+class RollupCube:
+    """
+    Amounts pre-aggregated by category ('' for uncategorized) and period, for every granularity in PERIODS.
+    Dates are turned into period codes once; each granularity keeps dense category x period arrays of
+    income, expenses and row counts, so "Food by month for 2025" or "this month vs. last month" is an
+    array slice instead of a groupby over the rows. Rows are addressed by position in the indexed frame
+    and edits update the cells of the rows they touch only. Rows without a date are left out.
+    """
+    def __init__(self, categories: pd.Series, dates: pd.Series, amounts: pd.Series):
+        """Build the cube from the 'Category' and 'Amount' columns of a frame and its parsed dates (see parse_dates)."""
+        codes, uniques = pd.factorize(categories.astype(str), sort=False)
+        self._category_ids: Dict[str, int] = {name: i for i, name in enumerate(uniques)}
+        self._category_codes = codes.astype(np.int32)
+        self._amounts = np.nan_to_num(pd.to_numeric(amounts, errors="coerce").to_numpy(dtype="float64"))
+        values = pd.to_datetime(dates, errors="coerce").to_numpy(dtype="datetime64[ns]")
+        missing = np.isnat(values)
+        days = values.view(np.int64) // _NS_PER_DAY
+        first_day = days[~missing].min() if (~missing).any() else 0
+        last_day = days[~missing].max() if (~missing).any() else -1
+        offsets = np.where(missing, 0, days - first_day)
+        self._columns: Dict[str, np.ndarray] = {}  # Row -> cube column (-1 without a date)
+        self._starts: Dict[str, np.ndarray] = {}  # Cube column -> first day of its period
+        self._cells: Dict[str, Dict[str, np.ndarray]] = {}  # Period -> measure -> category x period array
+        for period in PERIODS:
+            # Convert each calendar day in the data once, then look every row's period up by its day
+            by_day = period_codes(np.arange(first_day, last_day + 1), period)
+            first = by_day[0] if len(by_day) else 0
+            last = by_day[-1] if len(by_day) else -1
+            self._columns[period] = np.where(missing, -1, (by_day - first)[offsets] if len(by_day) else -1)
+            self._starts[period] = period_starts(np.arange(first, last + 1), period)
+            shape = (len(self._category_ids), len(self._starts[period]))
+            self._cells[period] = {
+                "income": np.zeros(shape), "expenses": np.zeros(shape), "count": np.zeros(shape, dtype=np.int64)
+            }
+        self._tally(np.arange(len(self._amounts)), 1)
+
+    def _tally(self, positions: np.ndarray, sign: int) -> None:
+        """Add (sign 1) or remove (sign -1) the rows at positions in every granularity."""
+        positions = np.asarray(positions, dtype=np.intp)
+        categories = self._category_codes[positions]
+        amounts = self._amounts[positions]
+        for period in PERIODS:
+            columns = self._columns[period][positions]
+            dated = columns >= 0
+            cells = self._cells[period]
+            shape = cells["count"].shape
+            flat = categories[dated].astype(np.intp) * shape[1] + columns[dated]  # Cell of each row
+            measures = {
+                "income": np.maximum(amounts[dated], 0.0),
+                "expenses": np.minimum(amounts[dated], 0.0),
+                "count": np.ones(len(flat), dtype=np.int64),
+            }
+            for measure, weights in measures.items():
+                target = cells[measure]
+                if len(flat) * 8 < target.size:
+                    # A few edited rows: touch their cells only
+                    np.add.at(target.reshape(-1), flat, sign * weights)
+                else:
+                    # A bulk pass: one bincount sums every row into its cell
+                    sums = np.bincount(flat, weights=weights, minlength=target.size).reshape(shape)
+                    target += (sign * sums).astype(target.dtype)
+
+    def _category_id(self, category: str) -> int:
+        """Return the cube row of a category, adding an empty row if it is new."""
+        if category not in self._category_ids:
+            self._category_ids[category] = len(self._category_ids)
+            for cells in self._cells.values():
+                for measure, values in cells.items():
+                    cells[measure] = np.vstack([values, np.zeros((1, values.shape[1]), dtype=values.dtype)])
+        return self._category_ids[category]
+
+    def set_category(self, positions: Iterable[int], category: str) -> None:
+        """Move rows to a new category."""
+        positions = np.asarray(list(positions), dtype=np.intp)
+        category_id = self._category_id(category)
+        self._tally(positions, -1)
+        self._category_codes[positions] = category_id
+        self._tally(positions, 1)
+
+    def set_amount(self, position: int, amount) -> None:
+        """Re-tally a row whose amount changed."""
+        self._tally(np.array([position]), -1)
+        self._amounts[position] = 0.0 if pd.isna(amount) else float(amount)
+        self._tally(np.array([position]), 1)
+
+    def remove(self, position: int) -> None:
+        """Drop a deleted row; the rows after it move up one position."""
+        self._tally(np.array([position]), -1)
+        self._category_codes = np.delete(self._category_codes, position)
+        self._amounts = np.delete(self._amounts, position)
+        for period in PERIODS:
+            self._columns[period] = np.delete(self._columns[period], position)
+
+    def table(
+        self,
+        period: str = "month",
+        measure: str = "net",
+        categories: Optional[List[str]] = None,
+        start=None,
+        end=None,
+    ) -> pd.DataFrame:
+        """
+        Return one measure per period (rows, by first day of the period) and category (columns).
+        Args:
+            period: One of PERIODS.
+            measure: 'net', 'income', 'expenses' or 'count'.
+            categories: Categories to include, in this order; default every category with rows.
+            start: Optional first date; the period containing it is the first row.
+            end: Optional last date; the period containing it is the last row.
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period: {period}")
+        if measure not in MEASURES:
+            raise ValueError(f"Unknown measure: {measure}")
+        cells = self._cells[period]
+        values = cells["income"] + cells["expenses"] if measure == "net" else cells[measure]
+        starts = self._starts[period]
+        first, last = 0, len(starts)
+        if start is not None:
+            first = np.searchsorted(starts, self._period_start(start, period), side="left")
+        if end is not None:
+            last = np.searchsorted(starts, self._period_start(end, period), side="right")
+        if categories is None:
+            categories = [name for name, i in self._category_ids.items() if cells["count"][i].any()]
+        rows = [self._category_ids.get(name) for name in categories]
+        columns = {
+            name: values[i, first:last] if i is not None else np.zeros(max(last - first, 0), dtype=values.dtype)
+            for name, i in zip(categories, rows)
+        }
+        return pd.DataFrame(columns, index=pd.DatetimeIndex(starts[first:last], name=period))
+
+    @staticmethod
+    def _period_start(value, period: str) -> np.datetime64:
+        """Return the first day of the period containing a date."""
+        day = np.datetime64(pd.Timestamp(value).date(), "D").astype(np.int64)
+        return period_starts(period_codes(np.array([day]), period), period)[0]
+
+    def __len__(self) -> int:
+        return len(self._amounts)
@@ -0,0 +1,66 @@
+# file: core/row_index.py
+from typing import Hashable, Iterable
+
+import numpy as np
+import pandas as pd
+
+
+def assign_row_ids(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Give every transaction a persistent integer row id, 0 to n - 1, as the index of df (modified in place).
+    Row ids are never reused or renumbered: filtered and sorted views keep them as their labels.
+    Returns the same DataFrame.
+    """
+    df.index = pd.RangeIndex(len(df))
+    return df
+
+
+class RowIndex:
+    """
+    Row id -> position of the row in the indexed frame, as a dense array over the ids (-1 once deleted).
+    Views, the table and edits address rows by id, so finding a row is one array read instead of a scan
+    over its values, and duplicate transactions are never confused with each other.
+    """
+    def __init__(self, ids: pd.Index):
+        """Build the index from the row ids of a frame (its index), in row order."""
+        ids = np.asarray(ids, dtype=np.int64)
+        self._positions = np.full(int(ids.max()) + 1 if len(ids) else 0, -1, dtype=np.int64)
+        self._positions[ids] = np.arange(len(ids))
+
+    def position(self, row_id: Hashable) -> int:
+        """
+        Return the position of a row.
+        Raises:
+            KeyError: If there is no row with this id.
+        """
+        return int(self.positions([row_id])[0])
+
+    def positions(self, row_ids: Iterable[Hashable]) -> np.ndarray:
+        """
+        Return the positions of rows, in the order of row_ids.
+        Raises:
+            KeyError: If any id has no row.
+        """
+        ids = np.asarray(row_ids if isinstance(row_ids, pd.Index) else list(row_ids), dtype=np.int64)
+        known = (ids >= 0) & (ids < len(self._positions))
+        positions = np.full(len(ids), -1, dtype=np.int64)
+        positions[known] = self._positions[ids[known]]
+        if (positions < 0).any():
+            raise KeyError(ids[positions < 0].tolist())
+        return positions
+
+    def remove(self, row_id: Hashable) -> None:
+        """Drop a deleted row; the rows after it move up one position."""
+        position = self.position(row_id)
+        self._positions[int(row_id)] = -1
+        self._positions[self._positions > position] -= 1
+
+    def __contains__(self, row_id: Hashable) -> bool:
+        try:
+            self.position(row_id)
+        except (KeyError, TypeError, ValueError):
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return int((self._positions >= 0).sum())
@@ -0,0 +1,102 @@
+# file: core/running_aggregates.py
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.data_utils import CategoryAggregates, aggregate_by_category, numeric_amounts
+
+# Largest difference verify() accepts between running and recomputed sums (rounding drift only)
+CHECK_TOLERANCE = 1e-6
+
+
+class RunningAggregates:
+    """
+    Per-category row counts and positive and negative sums of a set of rows, kept up to date row by row.
+    The first pass is aggregate_by_category; adding or removing a row is then O(1), so an edit never
+    regroups the whole view. verify() checks the running values against a full recomputation.
+    """
+    def __init__(self, df: Optional[pd.DataFrame] = None):
+        """Aggregate the rows of df with one full pass (no rows when df is None)."""
+        self._counts: Dict[Hashable, int] = {}
+        self._positive: Dict[Hashable, float] = {}
+        self._negative: Dict[Hashable, float] = {}
+        full = aggregate_by_category(df)
+        for i, name in enumerate(full.categories):
+            if full.counts[i] > 0:
+                self._counts[name] = self._counts.get(name, 0) + int(full.counts[i])
+                self._positive[name] = self._positive.get(name, 0.0) + float(full.positive[i])
+                self._negative[name] = self._negative.get(name, 0.0) + float(full.negative[i])
+
+    def add(self, category: str, amount: float) -> None:
+        """Count one row in."""
+        self._apply(category, amount, 1)
+
+    def remove(self, category: str, amount: float) -> None:
+        """Take one previously added row out."""
+        self._apply(category, amount, -1)
+
+    def add_rows(self, df: Optional[pd.DataFrame]) -> None:
+        """Count the rows of df in."""
+        self._apply_rows(df, 1)
+
+    def remove_rows(self, df: Optional[pd.DataFrame]) -> None:
+        """Take the rows of df out."""
+        self._apply_rows(df, -1)
+
+    def _apply_rows(self, df: Optional[pd.DataFrame], sign: int) -> None:
+        """Add (sign 1) or remove (sign -1) every row of df."""
+        if df is None or df.empty:
+            return
+        categories = df["Category"].astype(str) if "Category" in df.columns else [""] * len(df)
+        for category, amount in zip(categories, numeric_amounts(df)):
+            self._apply(category, amount, sign)
+
+    def _apply(self, category: str, amount: float, sign: int) -> None:
+        """Add (sign 1) or remove (sign -1) the contribution of one row; missing amounts count as 0."""
+        amount = 0.0 if pd.isna(amount) else float(amount)
+        count = self._counts.get(category, 0) + sign
+        if count <= 0:
+            # The last row of a category is gone: drop it rather than keep drifted near-zero sums
+            for values in (self._counts, self._positive, self._negative):
+                values.pop(category, None)
+            return
+        self._counts[category] = count
+        sums = self._positive if amount > 0 else self._negative
+        sums[category] = sums.get(category, 0.0) + sign * amount
+        self._positive.setdefault(category, 0.0)
+        self._negative.setdefault(category, 0.0)
+
+    def snapshot(self) -> CategoryAggregates:
+        """Return the current values in the form aggregate_by_category returns them."""
+        names = sorted(self._counts)
+        return CategoryAggregates(
+            categories=names,
+            counts=np.array([self._counts[name] for name in names], dtype=np.int64),
+            positive=np.array([self._positive[name] for name in names], dtype="float64"),
+            negative=np.array([self._negative[name] for name in names], dtype="float64"),
+        )
+
+    def totals(self) -> Tuple[float, float, float]:
+        """Return (income, expenses, net), as calculate_summaries does."""
+        return self.snapshot().totals()
+
+    def summary(self) -> pd.DataFrame:
+        """Return the totals by category of the categorized rows, as get_category_summary does."""
+        return self.snapshot().summary()
+
+    def verify(self, df: Optional[pd.DataFrame]) -> None:
+        """
+        Check the running values against a full recomputation over df, the rows they should cover.
+        Raises:
+            AssertionError: If a category, its row count or any sum differs.
+        """
+        expected = RunningAggregates(df)
+        if self._counts != expected._counts:
+            raise AssertionError(f"Running row counts {self._counts} differ from {expected._counts}")
+        for label, values, totals in (
+            ("income", self._positive, expected._positive), ("expenses", self._negative, expected._negative)
+        ):
+            for name, total in totals.items():
+                if abs(values[name] - total) > CHECK_TOLERANCE:
+                    raise AssertionError(f"Running {label} of {name!r} is {values[name]}, expected {total}")
@@ -0,0 +1,68 @@
+# file: core/search_index.py
+from typing import Dict, Iterable, Set
+
+# Length of the substrings indexed for each text
+GRAM_SIZE = 3
+
+
+def _grams(text: str) -> Set[str]:
+    """Return the distinct trigrams of a text (none if it is shorter than GRAM_SIZE)."""
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class TrigramIndex:
+    """
+    Inverted trigram index over a set of texts for case-insensitive substring search.
+    A query only verifies the texts containing all of its trigrams, found by intersecting the posting sets,
+    smallest first. Queries shorter than a trigram fall back to scanning the (distinct) texts.
+    """
+    def __init__(self, texts: Iterable[str] = ()):
+        """Build the index over the given texts."""
+        self._lowered: Dict[str, str] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        for text in texts:
+            self.add(text)
+
+    def add(self, text: str) -> None:
+        """Index a text; adding a text twice has no effect."""
+        if text in self._lowered:
+            return
+        lowered = text.lower()
+        self._lowered[text] = lowered
+        for gram in _grams(lowered):
+            self._postings.setdefault(gram, set()).add(text)
+
+    def remove(self, text: str) -> None:
+        """Remove a text from the index, dropping postings that become empty."""
+        lowered = self._lowered.pop(text, None)
+        if lowered is None:
+            return
+        for gram in _grams(lowered):
+            posting = self._postings[gram]
+            posting.discard(text)
+            if not posting:
+                del self._postings[gram]
+
+    def search(self, term: str) -> Set[str]:
+        """Return the indexed texts containing term, ignoring case."""
+        term = term.lower()
+        grams = _grams(term)
+        if not grams:
+            return {text for text, lowered in self._lowered.items() if term in lowered}
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        return {text for text in candidates if term in self._lowered[text]}
+
+    def refine(self, term: str, candidates: Iterable[str]) -> Set[str]:
+        """
+        Return the candidates that are still indexed and contain term, ignoring case.
+        Used when term extends an earlier query: its matches can only be among that query's matches.
+        """
+        term = term.lower()
+        return {text for text in candidates if term in self._lowered.get(text, "\0")}
+
+    def __contains__(self, text: str) -> bool:
+        return text in self._lowered
+
+    def __len__(self) -> int:
+        return len(self._lowered)
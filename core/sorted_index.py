@@ -0,0 +1,58 @@
+# file: core/sorted_index.py
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class SortedIndex:
+    """
+    The values of one numeric or datetime column sorted once, with the row position of each value.
+    A range query is two binary searches and a slice; missing values are left out of the index.
+    Positions follow the row order of the indexed frame and are kept in sync through set_value and remove.
+    """
+    def __init__(self, values: pd.Series):
+        """Build the index from a float or datetime64 column."""
+        array = values.to_numpy()
+        present = ~pd.isna(array)
+        positions = np.flatnonzero(present)
+        order = np.argsort(array[present], kind="stable")
+        self._values = array[present][order]
+        self._positions = positions[order]
+
+    def _key(self, value: Any) -> Any:
+        """Convert a bound or a new value to the dtype of the indexed column."""
+        if self._values.dtype.kind == "M":
+            return pd.Timestamp(value).to_datetime64()
+        return float(value)
+
+    def between(self, low: Optional[Any] = None, high: Optional[Any] = None) -> np.ndarray:
+        """Return the sorted positions of the rows with low <= value <= high; a bound of None is open."""
+        start = np.searchsorted(self._values, self._key(low), side="left") if low is not None else 0
+        stop = np.searchsorted(self._values, self._key(high), side="right") if high is not None else len(self._values)
+        return np.sort(self._positions[start:stop])
+
+    def set_value(self, position: int, value: Any) -> None:
+        """Re-index a row whose value changed."""
+        self._drop(position)
+        if pd.isna(value):
+            return
+        key = self._key(value)
+        at = np.searchsorted(self._values, key, side="right")
+        self._values = np.insert(self._values, at, key)
+        self._positions = np.insert(self._positions, at, position)
+
+    def remove(self, position: int) -> None:
+        """Drop a deleted row; the rows after it move up one position."""
+        self._drop(position)
+        self._positions[self._positions > position] -= 1
+
+    def _drop(self, position: int) -> None:
+        """Remove the entry of a row, if it has one."""
+        found = np.flatnonzero(self._positions == position)
+        if len(found):
+            self._values = np.delete(self._values, found[0])
+            self._positions = np.delete(self._positions, found[0])
+
+    def __len__(self) -> int:
+        return len(self._values)
@@ -0,0 +1,147 @@
+# file: core/table_window.py
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _column_array(series: pd.Series) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Return a column as NumPy arrays that windows can slice without touching pandas: the values, or for a
+    Categorical its codes plus the categories they index (code -1, missing, picks the trailing '').
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), np.append(series.cat.categories.to_numpy(dtype=object), "")
+    return series.to_numpy(), None
+
+
+def _display(values: np.ndarray) -> List:
+    """Return display values for a slice of one column: dates as YYYY-MM-DD and missing values as ''."""
+    if values.dtype.kind == "M":
+        text = np.datetime_as_string(values, unit="D")
+        return np.where(np.isnat(values), "", text).tolist()
+    if values.dtype.kind == "f":
+        return ["" if np.isnan(value) else value for value in values.tolist()]
+    return ["" if value is None or value is pd.NA or value != value else value for value in values.tolist()]
+
+
+class TableRows:
+    """
+    The rows of a DataFrame held as one NumPy array per column, so a window of rows is read by slicing the
+    arrays instead of iterating the frame; only the rows of a window are ever converted for display,
+    and building the table copies nothing.
+    """
+    def __init__(self, df: Optional[pd.DataFrame] = None):
+        """Take the columns and row labels of df (no rows when df is None)."""
+        df = df if df is not None else pd.DataFrame()
+        self.columns: List[str] = [str(column) for column in df.columns]
+        self.labels = df.index.to_numpy()
+        self._arrays = [_column_array(df[column]) for column in df.columns]
+
+    def window(self, start: int, stop: int) -> Tuple[List[Hashable], List[List]]:
+        """Return the labels and display values of rows start to stop (exclusive)."""
+        start, stop = max(start, 0), min(stop, len(self))
+        if start >= stop:
+            return [], []
+        columns = [
+            _display(array[start:stop] if lookup is None else lookup[array[start:stop]])
+            for array, lookup in self._arrays
+        ]
+        return self.labels[start:stop].tolist(), [list(row) for row in zip(*columns)]
+
+    def present(self, labels: Iterable[Hashable]) -> Set[Hashable]:
+        """Return those of labels that are rows of this table, e.g. the selected rows that survive a re-filter."""
+        labels = list(labels)
+        if not labels:
+            return set()
+        found = pd.Index(labels).isin(self.labels)
+        return {label for label, kept in zip(labels, found) if kept}
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+def clamp_offset(offset: int, visible: int, total: int) -> int:
+    """Return the first shown row, kept so the viewport never runs past the last row."""
+    return max(0, min(offset, total - visible))
+
+
+def scroll_fractions(offset: int, visible: int, total: int) -> Tuple[float, float]:
+    """Return the (first, last) scrollbar fractions of a viewport showing rows offset to offset + visible."""
+    if total <= visible:
+        return 0.0, 1.0
+    return offset / total, min(offset + visible, total) / total
+
+
+def offset_for_fraction(fraction: float, visible: int, total: int) -> int:
+    """Return the first row to show for a scrollbar position (the fraction of the rows above the viewport)."""
+    return clamp_offset(int(round(float(fraction) * total)), visible, total)
+
+
+@dataclass
+class WindowDiff:
+    """
+    The item operations that turn the shown rows of a table into new ones, applied in this order:
+    delete the items in deleted, set the new values of the items in updated, then for each (item, index)
+    in placed insert the item (with its values in inserted) or move it, at index among the other items.
+    """
+    deleted: List[Hashable] = field(default_factory=list)
+    updated: List[Tuple[Hashable, Any]] = field(default_factory=list)
+    placed: List[Tuple[Hashable, int]] = field(default_factory=list)
+    inserted: Dict[Hashable, Any] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        """Return the number of item operations."""
+        return len(self.deleted) + len(self.updated) + len(self.placed)
+
+
+def _longest_increasing(sequence: Sequence[int]) -> Set[int]:
+    """Return the indexes of one longest strictly increasing subsequence of sequence."""
+    tails: List[int] = []  # Value ending the best subsequence of each length
+    tail_indexes: List[int] = []
+    previous = [-1] * len(sequence)
+    for i, value in enumerate(sequence):
+        length = bisect_left(tails, value)
+        if length == len(tails):
+            tails.append(value)
+            tail_indexes.append(i)
+        else:
+            tails[length] = value
+            tail_indexes[length] = i
+        previous[i] = tail_indexes[length - 1] if length else -1
+    kept, i = set(), tail_indexes[-1] if tail_indexes else -1
+    while i >= 0:
+        kept.add(i)
+        i = previous[i]
+    return kept
+
+
+def diff_window(shown: Sequence[Tuple[Hashable, Any]], rows: Sequence[Tuple[Hashable, Any]]) -> WindowDiff:
+    """
+    Compare the (item id, values) pairs on screen with the ones to show, by item id, and return the
+    operations that reconcile them. Items present in both stay where they are when their order allows it
+    (the longest run already in the new order is not moved), so an edit or a scroll step touches only the
+    rows it changed.
+    """
+    new_values = dict(rows)
+    new_index = {iid: i for i, (iid, _) in enumerate(rows)}
+    diff = WindowDiff(deleted=[iid for iid, _ in shown if iid not in new_values])
+    current = [iid for iid, _ in shown if iid in new_values]
+    diff.updated = [(iid, new_values[iid]) for iid, values in shown if iid in new_values and values != new_values[iid]]
+    staying = _longest_increasing([new_index[iid] for iid in current])
+    fixed = {iid for i, iid in enumerate(current) if i in staying}
+    # Walk the new rows backwards, placing each item that is new or out of order right before its successor
+    successor = None
+    for iid, values in reversed(rows):
+        if iid not in fixed:
+            if iid in current:
+                current.remove(iid)
+            else:
+                diff.inserted[iid] = values
+            index = current.index(successor) if successor is not None else len(current)
+            current.insert(index, iid)
+            diff.placed.append((iid, index))
+        successor = iid
+    return diff
@@ -0,0 +1,122 @@
+# file: core/tasks.py
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+# progress(fraction, message): fraction in [0, 1]. Raises TaskCancelled once the task was cancelled.
+ProgressCallback = Callable[[float, str], None]
+
+
+class TaskCancelled(Exception):
+    """Raised inside a background task (and by Task.result) when the task was cancelled."""
+
+
+@dataclass
+class ProgressEvent:
+    """
+    One progress report of a background task.
+    """
+    fraction: float
+    message: str
+
+
+class Task:
+    """
+    Handle to a background job: a future for its result, a queue of progress events and a cancel flag.
+    The job computes its result without touching shared state; the optional commit callable then applies
+    it in the thread calling result(), so a GUI can apply it atomically on its own thread.
+    """
+    def __init__(self, name: str, commit: Optional[Callable[[Any], Any]] = None):
+        """Create a task; commit(value) is run once by result() and its return value becomes the result."""
+        self.name = name
+        self.future: Future = Future()
+        self.progress: "queue.Queue[ProgressEvent]" = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._commit = commit
+        self._committed = False
+        self._value: Any = None
+
+    def report(self, fraction: float, message: str = "") -> None:
+        """Queue a progress event. Called from the job; raises TaskCancelled if cancellation was requested."""
+        if self._cancel_event.is_set():
+            raise TaskCancelled(self.name)
+        self.progress.put(ProgressEvent(min(max(fraction, 0.0), 1.0), message))
+
+    def cancel(self) -> None:
+        """Request cancellation. The job stops at its next progress report."""
+        self._cancel_event.set()
+        self.future.cancel()
+
+    def cancel_requested(self) -> bool:
+        """Return True once cancel() was called."""
+        return self._cancel_event.is_set()
+
+    def done(self) -> bool:
+        """Return True when the job finished, failed or was cancelled."""
+        return self.future.done()
+
+    def drain_progress(self) -> List[ProgressEvent]:
+        """Return the progress events queued since the last call, without blocking."""
+        events = []
+        while True:
+            try:
+                events.append(self.progress.get_nowait())
+            except queue.Empty:
+                return events
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """
+        Wait for the job and return its result, applying it with the commit callable the first time.
+        Raises TaskCancelled if the task was cancelled, or the job's own exception if it failed.
+        """
+        if not self._committed:
+            if self.future.cancelled():
+                raise TaskCancelled(self.name)
+            value = self.future.result(timeout)
+            if self._cancel_event.is_set():
+                # Cancelled after the job's last checkpoint: drop the result instead of applying it
+                raise TaskCancelled(self.name)
+            self._value = self._commit(value) if self._commit is not None else value
+            self._committed = True
+        return self._value
+
+
+class TaskRunner:
+    """
+    Runs tasks one at a time on a background thread, in submission order.
+    """
+    def __init__(self):
+        """Create a runner with a single worker thread."""
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="finance-task")
+        self._tasks: List[Task] = []
+
+    def submit(
+        self, name: str, job: Callable[[ProgressCallback], Any], commit: Optional[Callable[[Any], Any]] = None
+    ) -> Task:
+        """Schedule job(progress) in the background and return its Task."""
+        task = Task(name, commit)
+
+        def run():
+            if not task.future.set_running_or_notify_cancel():
+                return
+            try:
+                task.report(0.0, name)
+                task.future.set_result(job(task.report))
+            except BaseException as e:
+                task.future.set_exception(e)
+
+        self._tasks = [t for t in self._tasks if not t.done()] + [task]
+        self._executor.submit(run)
+        return task
+
+    def cancel_all(self) -> None:
+        """Request cancellation of every pending or running task."""
+        for task in self._tasks:
+            task.cancel()
+
+    def shutdown(self) -> None:
+        """Cancel all tasks and wait for the worker thread to stop."""
+        self.cancel_all()
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,154 @@
+# file: core/workbook_cache.py
+import hashlib
+import json
+import os
+import shutil
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from core import data_processor
+from config.constants import WORKBOOK_CACHE_MAX_BYTES
+
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def _file_digest(filepath: str) -> str:
+    """Return the SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as file:
+        for block in iter(lambda: file.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class WorkbookCache:
+    """
+    Local cache of parsed workbooks stored as one .npy file per column, so re-opening an unchanged
+    statement is a memory-mapped read instead of a full .xlsx parse.
+    Entries are keyed by file path, size, mtime, content hash and the parse options, and the least
+    recently used entries are evicted once the cache grows beyond max_bytes.
+    """
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = WORKBOOK_CACHE_MAX_BYTES):
+        """Create a cache rooted at cache_dir (defaults to the app cache directory)."""
+        self.cache_dir = cache_dir or os.path.join(data_processor.CACHE_DIR, "workbooks")
+        self.max_bytes = max_bytes
+
+    def key(self, filepath: str, options: str = "") -> str:
+        """Return the cache key of a workbook file parsed with the given options."""
+        stat = os.stat(filepath)
+        parts = [os.path.abspath(filepath), str(stat.st_size), str(stat.st_mtime_ns), _file_digest(filepath), options]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, filepath: str, options: str = "", key: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """
+        Return the cached DataFrame for the workbook, or None on a miss.
+        key is self.key(filepath, options) if already computed; pass it on to put after a miss,
+        so the workbook is hashed once.
+        """
+        entry_dir = os.path.join(self.cache_dir, key or self.key(filepath, options))
+        meta_path = os.path.join(entry_dir, "meta.json")
+        try:
+            with open(meta_path, "r", encoding="utf-8") as file:
+                meta = json.load(file)
+            columns = {}
+            for position, column in enumerate(meta["columns"]):
+                columns[column["name"]] = self._load_column(entry_dir, position, column["kind"])
+        except (OSError, ValueError, KeyError):
+            return None
+        # Mark the entry as recently used for eviction
+        os.utime(meta_path)
+        # Copy out of the memory maps so no file handle outlives this call (eviction must be able to delete)
+        df = pd.DataFrame(columns, copy=True)
+        df.attrs.update(meta.get("attrs", {}))
+        return df
+
+    def put(self, filepath: str, df: pd.DataFrame, options: str = "", key: Optional[str] = None) -> None:
+        """
+        Store a parsed workbook (its df.attrs must be JSON-serializable), then evict old entries
+        if the cache is over its size cap. key is self.key(filepath, options) if already computed (see get).
+        """
+        entry_dir = os.path.join(self.cache_dir, key or self.key(filepath, options))
+        temp_dir = entry_dir + ".tmp"
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        os.makedirs(temp_dir)
+        columns = []
+        for position, name in enumerate(df.columns):
+            kind = self._save_column(temp_dir, position, df[name])
+            columns.append({"name": name, "kind": kind})
+        meta = {"source": os.path.abspath(filepath), "rows": len(df), "columns": columns, "attrs": df.attrs}
+        with open(os.path.join(temp_dir, "meta.json"), "w", encoding="utf-8") as file:
+            json.dump(meta, file, ensure_ascii=False)
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(temp_dir, entry_dir)
+        self.evict()
+
+    @staticmethod
+    def _save_column(entry_dir: str, position: int, series: pd.Series) -> str:
+        """Save one column and return how it was encoded ('array', 'str' or 'object')."""
+        path = os.path.join(entry_dir, f"{position}.npy")
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in "biufmM":
+            np.save(path, series.to_numpy())
+            return "array"
+        missing = series.isna().to_numpy()
+        present = series[~missing]
+        if present.map(type).eq(str).all():
+            # Fixed-width unicode plus a missing-value mask can be memory-mapped
+            np.save(path, series.where(~missing, "").to_numpy(dtype=str))
+            np.save(os.path.join(entry_dir, f"{position}.mask.npy"), missing)
+            return "str"
+        np.save(path, series.to_numpy(dtype=object), allow_pickle=True)
+        return "object"
+
+    @staticmethod
+    def _load_column(entry_dir: str, position: int, kind: str) -> np.ndarray:
+        """Load one column saved by _save_column."""
+        path = os.path.join(entry_dir, f"{position}.npy")
+        if kind == "array":
+            return np.load(path, mmap_mode="r")
+        if kind == "str":
+            values = np.load(path, mmap_mode="r").astype(object)
+            values[np.load(os.path.join(entry_dir, f"{position}.mask.npy"))] = np.nan
+            return values
+        if kind == "object":
+            return np.load(path, allow_pickle=True)
+        raise ValueError(f"Unknown column kind: {kind}")
+
+    def _entries(self):
+        """Return (last_used, size_in_bytes, path) for every cache entry."""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            meta_path = os.path.join(entry_dir, "meta.json")
+            if not os.path.isfile(meta_path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(entry_dir) if entry.is_file())
+            entries.append((os.path.getmtime(meta_path), size, entry_dir))
+        return entries
+
+    def size_bytes(self) -> int:
+        """Return the total size of the cache on disk."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits in max_bytes. Returns entries removed."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry_dir in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Remove every cached workbook. Returns the number of entries removed."""
+        entries = self._entries()
+        for _, _, entry_dir in entries:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+        return len(entries)
@@ -10,7 +10,11 @@ from .frames.table_frame import TableFrame
 from .frames.bottom_frame import BottomFrame
 from .frames.summary_chart_frame import SummaryChartFrame
 from core.controller import Controller
-from config.constants import APP_TITLE, COLOR_INCOME, COLOR_EXPENSE, CATEGORY_ALL, CATEGORY_UNCATEGORIZED
+from core.data_utils import FilterView
+from core.tasks import Task, TaskCancelled
+from config.constants import (
+    APP_TITLE, COLOR_INCOME, COLOR_EXPENSE, CATEGORY_ALL, CATEGORY_UNCATEGORIZED, TASK_POLL_MS, SEARCH_DEBOUNCE_MS
+)
 
 
 class App(ctk.CTk):
@@ -27,9 +31,13 @@ class App(ctk.CTk):
         # Override controller methods to point to main app methods
         self.controller.apply_filters = self.apply_filters
         self.controller.clear_filters = self.clear_filters
-        self.sort_column: str | None = None
-        self.sort_ascending: bool = True
+        self.controller.search_changed = self.search_changed
         self.current_displayed_df = None  # Track currently displayed DataFrame
+        self.current_task: Task | None = None  # Background load/analysis/export in progress
+        self._task_button_states: dict = {}
+        self._search_after_id: str | None = None  # Pending debounced search
+        self._filter_generation = 0  # Bumped per filter request; older in-flight results are dropped
+        self.selected_row_ids: list = []  # Row ids of every selected table row, for the batch category actions
 
         # UI Structure
         self.grid_columnconfigure(0, weight=1)
@@ -54,13 +62,18 @@ class App(ctk.CTk):
         self.tree.bind(
             "<<TreeviewSelect>>", lambda event: self.table_row_selected(event)
         )
+        # Shift-click on a heading adds the column as a further sort key
+        self.tree.bind("<Shift-Button-1>", self.add_sort_column)
 
         self.summary_panel = TableFrame(self.content_frame)
         self.summary_panel.grid(row=0, column=1, sticky="nsew")
         self.summary_tree = self.summary_panel.tree
 
         # Add the summary chart frame below the summary panel
-        self.summary_chart_frame = SummaryChartFrame(self.content_frame)
+        self.summary_chart_frame = SummaryChartFrame(
+            self.content_frame,
+            timeseries_source=lambda categories: self.controller.rollup_table("month", "net", categories),
+        )
         self.summary_chart_frame.grid(row=1, column=1, sticky="nsew", pady=(10, 0))
         self.content_frame.grid_rowconfigure(1, weight=1)
 
@@ -68,132 +81,142 @@ class App(ctk.CTk):
         self.bottom_frame.grid(row=3, column=0, padx=20, pady=(0, 10), sticky="ew")
 
         # Initial population
-        self.populate_treeview(self.tree, None)
-        self.populate_treeview(self.summary_tree, None)
-
-    def populate_treeview(self, tree, dataframe: pd.DataFrame | None, is_interactive: bool = False) -> None:
-        """Populate a treeview with the given DataFrame."""
-        # Clear previous contents and columns
-        tree.delete(*tree.get_children())
-        tree["columns"] = ()
-
-        if dataframe is None or dataframe.empty:
-            tree["columns"] = "1"
-            tree.heading("1", text="No Data")
-            tree.column("1")
-            return
-
-        # Define new columns
-        tree["columns"] = dataframe.columns.tolist()
+        self.populate_treeview(self.table_frame, None)
+        self.populate_treeview(self.summary_panel, None)
 
-        # Configure each column
-        for col in dataframe.columns:
-            # Prepare options for the heading
-            heading_options = {"text": col}
-            # Add the sort command ONLY if the table is interactive
-            if is_interactive:
-                heading_options["command"] = lambda c=col: self.sort_table(c)
-
-            # Apply the options using dictionary unpacking
-            tree.heading(col, **heading_options)
-            tree.column(col, width=150, anchor="center")
-
-        # Insert data rows
-        for i, (index, row) in enumerate(dataframe.iterrows()):
-            tag = "oddrow" if i % 2 != 0 else "evenrow"
-            iid = index if is_interactive else i
-            tree.insert("", "end", iid=iid, values=row.tolist(), tags=(tag,))
+    def populate_treeview(self, table: TableFrame, dataframe: pd.DataFrame | None, is_interactive: bool = False) -> None:
+        """Show a DataFrame in a table; interactive tables sort on heading clicks and show the sort keys."""
+        if not is_interactive:
+            table.show(dataframe)
+            return
+        sort_arrows = {column: " ▲" if ascending else " ▼" for column, ascending in self.controller.sort_state}
+        headings = {} if dataframe is None else {col: col + sort_arrows.get(col, "") for col in dataframe.columns}
+        table.show(dataframe, headings=headings, on_heading=self.sort_table, use_labels=True)
 
     def apply_filters(self, event=None) -> None:
         """Apply all filters and update the UI accordingly."""
         if self.controller.selected_df is None:
             return
+        self._filter_generation += 1  # Any search still in flight is now stale
         selected_category = self.filter_frame.category_filter_box.get()
         search_term = self.filter_frame.search_entry.get()
         value_filter = self.filter_frame.value_filter_box.get()
-        df_to_display = self.controller.filter_data(selected_category, search_term, value_filter)
-        self.current_displayed_df = df_to_display  # Store currently displayed DataFrame
-        summary_df = self.controller.get_summary(df_to_display)
-        self.populate_treeview(self.tree, df_to_display, is_interactive=True)
-        self.populate_treeview(self.summary_tree, summary_df, is_interactive=False)
-        self.summary_chart_frame.update_chart(summary_df)
-        self.calculate_and_display_summaries(df_to_display)
+        self.show_filtered(self.controller.filtered_view(
+            selected_category, search_term, value_filter,
+            self.filter_frame.get_date_range(), self.filter_frame.get_amount_range(),
+        ))
+
+    def search_changed(self, event=None) -> None:
+        """Filter once typing in the search box pauses for SEARCH_DEBOUNCE_MS."""
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(SEARCH_DEBOUNCE_MS, self._start_search)
+
+    def _start_search(self) -> None:
+        """Evaluate the filters in the background, so typing never waits for a search."""
+        self._search_after_id = None
+        if self.controller.selected_df is None:
+            return
+        self._filter_generation += 1
+        task = self.controller.filtered_view_async(
+            self.filter_frame.category_filter_box.get(),
+            self.filter_frame.search_entry.get(),
+            self.filter_frame.value_filter_box.get(),
+            self.filter_frame.get_date_range(),
+            self.filter_frame.get_amount_range(),
+        )
+        self.after(TASK_POLL_MS, self._poll_search, task, self._filter_generation)
+
+    def _poll_search(self, task: Task, generation: int) -> None:
+        """Show a finished search, unless a newer filter request made it stale."""
+        if generation != self._filter_generation:
+            task.cancel()
+            return
+        if not task.done():
+            self.after(TASK_POLL_MS, self._poll_search, task, generation)
+            return
+        try:
+            view = task.result()
+        except Exception as e:
+            print(f"Search failed: {e}")
+            return
+        self.show_filtered(view)
+
+    def show_filtered(self, view: FilterView) -> None:
+        """Display a filtered view with its summary, chart and totals."""
+        self.current_displayed_df = view.df  # Store currently displayed DataFrame
+        self.populate_treeview(self.table_frame, view.df, is_interactive=True)
+        self.populate_treeview(self.summary_panel, view.summary, is_interactive=False)
+        self.summary_chart_frame.update_chart(view.aggregates)
+        self.display_totals(*view.totals)
         self.reset_control_panel()
+        self.table_row_selected(None)  # Reload the edit controls for selected rows still in the view
 
     def calculate_and_display_summaries(self, dataframe: pd.DataFrame | None) -> None:
         """Calculate and display income, expenses, and net balance."""
-        income, expenses, net = self.controller.calculate_summaries(dataframe)
+        self.display_totals(*self.controller.calculate_summaries(dataframe))
+
+    def display_totals(self, income: float, expenses: float, net: float) -> None:
+        """Display income, expenses, and net balance."""
         self.bottom_frame.income_label.configure(text=f"Income: {income:,.2f}", text_color=COLOR_INCOME)
         self.bottom_frame.expense_label.configure(text=f"Expenses: {expenses:,.2f}", text_color=COLOR_EXPENSE)
         self.bottom_frame.net_label.configure(text=f"Net: {net:,.2f}")
 
     def load_file(self) -> None:
-        """Load an Excel file and initialize the data."""
+        """Load an Excel file in the background and initialize the data once it is parsed."""
         filepath = filedialog.askopenfilename(filetypes=(("Excel Files", "*.xlsx"),))
         if not filepath:
             return
+        self.run_task(self.controller.load_data_async(filepath), self._file_loaded, "Failed to load file")
 
-        try:
-            self.controller.load_data(filepath)
-            self.current_displayed_df = self.controller.selected_df  # Initialize current displayed DataFrame
-            self.populate_treeview(self.tree, self.controller.selected_df, is_interactive=False)
-            self.populate_treeview(self.summary_tree, None)
-
-            # --- CRITICAL CHANGE: Only enable the Analyze button ---
-            self.top_frame.analyze_button.configure(state="normal")
-
-            # --- Disable all other controls to enforce workflow ---
-            self.top_frame.save_button.configure(state="disabled")
-            self.top_frame.export_button.configure(state="disabled")
-            self.filter_frame.category_filter_box.configure(state="disabled")
-            self.filter_frame.search_entry.configure(state="disabled")
-            self.filter_frame.clear_button.configure(state="disabled")
-            self.filter_frame.value_filter_box.set("All")
-            self.filter_frame.value_filter_box.configure(state="disabled")
-            self.reset_control_panel()
-            self.calculate_and_display_summaries(None)
-
-            print("File loaded successfully. Waiting for analysis.")
+    def _file_loaded(self, stats) -> None:
+        """Show freshly loaded data and enforce the analyze-first workflow."""
+        self.current_displayed_df = self.controller.selected_df  # Initialize current displayed DataFrame
+        self.populate_treeview(self.table_frame, self.controller.selected_df, is_interactive=False)
+        self.populate_treeview(self.summary_panel, None)
+
+        # --- CRITICAL CHANGE: Only enable the Analyze button ---
+        self.top_frame.analyze_button.configure(state="normal")
+
+        # --- Disable all other controls to enforce workflow ---
+        self.top_frame.save_button.configure(state="disabled")
+        self.top_frame.export_button.configure(state="disabled")
+        self.filter_frame.category_filter_box.configure(state="disabled")
+        self.filter_frame.search_entry.configure(state="disabled")
+        self.filter_frame.clear_button.configure(state="disabled")
+        self.filter_frame.value_filter_box.set("All")
+        self.filter_frame.value_filter_box.configure(state="disabled")
+        self.filter_frame.clear_ranges()
+        self.filter_frame.set_range_state("disabled")
+        self.reset_control_panel()
+        self.calculate_and_display_summaries(None)
 
-        except Exception as e:
+        layout = self.controller.header_layout
+        header = f" Header on row {layout.skiprows + 1} ({layout.profile} profile)." if layout else ""
+        unparsed = self.controller.unparsed_dates
+        if len(unparsed):
             CTkMessagebox(
-                title="Error", message=f"Failed to load file:\n{e}", icon="cancel"
+                title="Unrecognized Dates",
+                message=(
+                    f"{len(unparsed)} accounting dates could not be read and are left out of date filters "
+                    f"and charts (first rows: {', '.join(str(row_id + 1) for row_id in unparsed[:5])})."
+                ),
+                icon="warning",
             )
+        print(
+            f"File loaded successfully: {stats.rows} rows in {stats.seconds:.2f}s "
+            f"({stats.rows_per_second:,.0f} rows/s, {stats.engine}).{header} Waiting for analysis."
+        )
 
     def analyze_data(self) -> None:
-        """Analyze the loaded data and categorize transactions using two-pass logic (exact, then contains)."""
-        if self.controller.selected_df is None:
+        """Categorize the loaded transactions in the background using the compiled keyword rules (exact, then contains)."""
+        task = self.controller.analyze_data_async()
+        if task is None:
             return
+        self.run_task(task, self._analysis_finished, "Failed to analyze data")
 
-        columns_to_show = ["Accounting date", "Description", "Amount", "Category"]
-        self.controller.selected_df["Category"] = ""
-        self.controller.selected_df = self.controller.selected_df.reindex(
-            columns=columns_to_show, fill_value=""
-        )
-        keywords_map = self.controller.keywords_map
-        df = self.controller.selected_df
-
-        # --- Pass 1: Exact Matching ---
-        for category, rules in keywords_map.items():
-            exact_list = rules.get("exact", [])
-            if exact_list:
-                mask = df["Description"].isin(exact_list)
-                df.loc[mask, "Category"] = category
-
-        # --- Pass 2: Contains Matching (only for uncategorized rows) ---
-        uncategorized_mask = df["Category"] == ""
-        for category, rules in keywords_map.items():
-            contains_list = rules.get("contains", [])
-            if contains_list:
-                for keyword in contains_list:
-                    # Only apply to still-uncategorized rows
-                    contains_mask = df.loc[uncategorized_mask, "Description"].str.contains(keyword, case=False, na=False)
-                    # Get the indices in the main DataFrame
-                    indices = df.loc[uncategorized_mask].index[contains_mask]
-                    df.loc[indices, "Category"] = category
-                    # Update uncategorized_mask for next iterations
-                    uncategorized_mask = df["Category"] == ""
-
+    def _analysis_finished(self, result) -> None:
+        """Enable the controls and show the categorized data once the analysis is applied."""
         # --- Enable Controls ---
         self.tree.bind(
             "<<TreeviewSelect>>", lambda event: self.table_row_selected(event)
@@ -205,6 +228,7 @@ class App(ctk.CTk):
         self.filter_frame.clear_button.configure(state="normal")
         self.filter_frame.value_filter_box.set("All")
         self.filter_frame.value_filter_box.configure(state="readonly")
+        self.filter_frame.set_range_state("normal")
 
         # --- THE FIX YOU SUGGESTED ---
         self.refresh_category_filter()  # Refresh category filter with current categories
@@ -213,8 +237,8 @@ class App(ctk.CTk):
         self.current_displayed_df = self.controller.selected_df  # Initialize current displayed DataFrame
         self.apply_filters()  # Now this will use the correct default filter
 
-        # --- Display completion message (Stays the same) ---
-        uncategorized_count = self.controller.selected_df["Category"].eq("").sum()
+        # --- Display completion message ---
+        uncategorized_count = result.uncategorized_rows
         if uncategorized_count == 0:
             CTkMessagebox(
                 title="Analysis Complete",
@@ -224,12 +248,70 @@ class App(ctk.CTk):
         else:
             CTkMessagebox(
                 title="Analysis Complete",
-                message=f"Analysis complete. Found {uncategorized_count} items to review.",
+                message=(
+                    f"Analysis complete. Found {uncategorized_count} items to review.\n"
+                    f"{result.distinct_descriptions} distinct merchants, "
+                    f"{result.uncategorized_descriptions} uncategorized."
+                ),
                 icon="info",
             )
 
+    def run_task(self, task: Task, on_success, error_message: str) -> None:
+        """
+        Follow a background controller task: show its progress, keep the action buttons disabled until it ends,
+        then apply its result on the Tk thread and call on_success(result).
+        """
+        self.current_task = task
+        buttons = self._task_buttons()
+        self._task_button_states = {button: button.cget("state") for button in buttons}
+        for button in buttons:
+            button.configure(state="disabled")
+        self.top_frame.show_progress(0.0, task.name)
+        self.after(TASK_POLL_MS, self._poll_task, task, on_success, error_message)
+
+    def _task_buttons(self) -> list:
+        """Return the buttons that must not be used while a background task runs."""
+        return [
+            self.top_frame.load_button,
+            self.top_frame.analyze_button,
+            self.top_frame.save_button,
+            self.top_frame.export_button,
+            self.top_frame.clear_cache_button,
+            self.bottom_frame.update_button,
+            self.bottom_frame.apply_selected_button,
+            self.bottom_frame.apply_description_button,
+            self.bottom_frame.delete_button,
+        ]
+
+    def _poll_task(self, task: Task, on_success, error_message: str) -> None:
+        """Show the task's queued progress events and finish the task once it is done."""
+        for event in task.drain_progress():
+            self.top_frame.show_progress(event.fraction, event.message or task.name)
+        if not task.done():
+            self.after(TASK_POLL_MS, self._poll_task, task, on_success, error_message)
+            return
+        self.current_task = None
+        self.top_frame.hide_progress()
+        for button, state in self._task_button_states.items():
+            button.configure(state=state)
+        self._task_button_states = {}
+        try:
+            on_success(task.result())  # result() applies the task's result to the controller
+        except TaskCancelled:
+            print(f"{task.name} cancelled.")
+        except Exception as e:
+            CTkMessagebox(title="Error", message=f"{error_message}:\n{e}", icon="cancel")
+
+    def cancel_task(self) -> None:
+        """Cancel the running background task; its result is discarded."""
+        if self.current_task is not None:
+            self.current_task.cancel()
+            self.top_frame.cancel_button.configure(state="disabled")
+            self.top_frame.progress_label.configure(text="Cancelling...")
+
     def clear_filters(self, reset_ui_controls: bool = False) -> None:
         """Clear all filters and reset the UI."""
+        self.filter_frame.clear_ranges()  # Before the entries may be disabled, which ignores edits
         if reset_ui_controls:
             self.top_frame.save_button.configure(state="disabled")
             self.top_frame.export_button.configure(state="disabled")
@@ -237,6 +319,7 @@ class App(ctk.CTk):
             self.filter_frame.search_entry.configure(state="disabled")
             self.filter_frame.clear_button.configure(state="disabled")
             self.filter_frame.value_filter_box.configure(state="disabled")
+            self.filter_frame.set_range_state("disabled")
         else:
             self.top_frame.save_button.configure(state="normal")
             self.top_frame.export_button.configure(state="normal")
@@ -244,6 +327,7 @@ class App(ctk.CTk):
             self.filter_frame.search_entry.configure(state="normal")
             self.filter_frame.clear_button.configure(state="normal")
             self.filter_frame.value_filter_box.configure(state="readonly")
+            self.filter_frame.set_range_state("normal")
         self.filter_frame.search_entry.delete(0, "end")
         self.refresh_category_filter()  # Refresh category filter with current categories
         self.bottom_frame.category_edit_box.configure(values=self.controller.get_categories())
@@ -251,37 +335,46 @@ class App(ctk.CTk):
         self.filter_frame.value_filter_box.set("All")
         if self.controller.selected_df is not None:
             self.apply_filters()
-        self.reset_control_panel()
+        else:
+            self.reset_control_panel()
 
-    def sort_table(self, column_name: str) -> None:
-        """Sort the table by the given column."""
+    def sort_table(self, column_name: str, add: bool = False) -> None:
+        """Sort the table by the given column, flipping its direction if it is already sorted by it."""
         if self.controller.selected_df is None:
             return
-        if self.sort_column == column_name:
-            self.sort_ascending = not self.sort_ascending
-        else:
-            self.sort_ascending = True
-        self.sort_column = column_name
-        self.controller.sort_data(column_name, ascending=self.sort_ascending)
+        current = dict(self.controller.sort_state)
+        ascending = not current[column_name] if column_name in current else True
+        self.controller.sort_data(column_name, ascending=ascending, add=add)
         self.apply_filters()
 
+    def add_sort_column(self, event) -> str | None:
+        """Handle shift-click on a table heading: sort by that column after the current sort keys."""
+        # Headings only sort once the data is analyzed (the table is interactive)
+        if self.controller.matcher is None or self.tree.identify_region(event.x, event.y) != "heading":
+            return None
+        column_id = self.tree.identify_column(event.x)  # '#1' is the first column
+        columns = self.tree["columns"]
+        index = int(column_id.lstrip("#") or 0) - 1
+        if 0 <= index < len(columns):
+            self.sort_table(columns[index], add=True)
+        return "break"  # Keep the plain heading command from also firing
+
     def table_row_selected(self, event) -> None:
-        """Handle row selection in the table."""
-        selected_items = self.tree.selection()
-        if not selected_items:
+        """
+        Handle row selection in the table; item ids are row ids, so rows are found without a scan.
+        A single row is loaded into the edit controls; several rows enable only the batch category actions.
+        """
+        row_ids = [int(label) for label in self.table_frame.selection()]
+        if not row_ids or set(row_ids) == set(self.selected_row_ids):
+            return  # Nothing selected, or re-selected by the table after scrolling; keep any edit in progress
+        if len(row_ids) > 1:
+            self.show_batch_selection(row_ids)
             return
-        selected_iid_str = selected_items[0]
         try:
-            # Use the currently displayed DataFrame instead of the original
-            if self.current_displayed_df is not None:
-                index_type = self.current_displayed_df.index.dtype.type
-                self.controller.currently_selected_row_index = index_type(selected_iid_str)
-                item_data = self.current_displayed_df.loc[self.controller.currently_selected_row_index]
-            else:
-                # Fallback to original DataFrame if no filtered data
-                index_type = self.controller.selected_df.index.dtype.type
-                self.controller.currently_selected_row_index = index_type(selected_iid_str)
-                item_data = self.controller.selected_df.loc[self.controller.currently_selected_row_index]
+            row_id = row_ids[0]
+            item_data = self.controller.get_row(row_id)
+            self.controller.currently_selected_row_index = row_id
+            self.selected_row_ids = row_ids
 
             self.bottom_frame.category_edit_box.configure(state="readonly")
             # Refresh the category edit box with current categories
@@ -299,13 +392,65 @@ class App(ctk.CTk):
             self.bottom_frame.description_edit_entry.insert(0, str(item_data["Description"]))
             self.bottom_frame.update_button.configure(state="normal")
             self.bottom_frame.delete_button.configure(state="normal")
+            self.bottom_frame.apply_selected_button.configure(state="normal")
+            self.bottom_frame.apply_description_button.configure(state="normal")
         except (KeyError, ValueError) as e:
             print(f"Error selecting row: {e}")
             self.reset_control_panel()
 
+    def show_batch_selection(self, row_ids: list) -> None:
+        """Set the edit controls up for several selected rows: only a category can be applied to all of them."""
+        self.reset_control_panel()
+        self.selected_row_ids = row_ids
+        self.bottom_frame.category_edit_box.configure(state="readonly")
+        self.bottom_frame.category_edit_box.set("Select Category")
+        self.bottom_frame.apply_selected_button.configure(state="normal")
+        self.bottom_frame.apply_description_button.configure(state="normal")
+
+    def _chosen_batch_category(self) -> str | None:
+        """Return the category chosen for the selected rows, or None if there is nothing to apply."""
+        if not self.selected_row_ids or self.current_task is not None:
+            return None
+        category = self.bottom_frame.category_edit_box.get()
+        if not category or category == "Select Category":
+            return None
+        return category
+
+    def apply_category_to_selected(self) -> None:
+        """
+        Set the chosen category on every selected row and learn their descriptions as exact matches,
+        with one batched controller update and one refresh of the view.
+        """
+        category = self._chosen_batch_category()
+        if category is None:
+            return
+        try:
+            touched = self.controller.apply_category(self.selected_row_ids, category)
+        except KeyError as e:
+            print(f"Error applying category: {e}")
+            CTkMessagebox(title="Error", message="Could not update the selected rows.", icon="cancel")
+            return
+        self.apply_filters()
+        print(f"Set {category} on {touched} rows.")
+
+    def apply_category_to_description(self) -> None:
+        """Set the chosen category on every row whose description matches one of the selected rows."""
+        category = self._chosen_batch_category()
+        if category is None:
+            return
+        try:
+            descriptions = {self.controller.get_row(row_id)["Description"] for row_id in self.selected_row_ids}
+            touched = self.controller.apply_category_to_descriptions(descriptions, category)
+        except KeyError as e:
+            print(f"Error applying category: {e}")
+            CTkMessagebox(title="Error", message="Could not update the rows.", icon="cancel")
+            return
+        self.apply_filters()
+        print(f"Set {category} on {touched} rows with the same description.")
+
     def update_row_data(self) -> None:
         """Update the description, category, and amount of the selected row and learn the new description as an exact match."""
-        if self.controller.currently_selected_row_index is None:
+        if self.controller.currently_selected_row_index is None or self.current_task is not None:
             return
         chosen_category = self.bottom_frame.category_edit_box.get()
         amount_str = self.bottom_frame.amount_edit_entry.get()
@@ -321,45 +466,13 @@ class App(ctk.CTk):
             CTkMessagebox(title="Error", message="Amount must be a valid number.", icon="cancel")
             return
         try:
-            if self.current_displayed_df is not None:
-                selected_row_data = self.current_displayed_df.loc[self.controller.currently_selected_row_index]
-                mask = True
-                for col in selected_row_data.index:
-                    if col in self.controller.selected_df.columns:
-                        mask = mask & (self.controller.selected_df[col] == selected_row_data[col])
-                matching_indices = self.controller.selected_df[mask].index
-                if len(matching_indices) > 0:
-                    original_index = matching_indices[0]
-                    old_description = selected_row_data["Description"]
-                    self.controller.selected_df.loc[original_index, "Category"] = chosen_category
-                    self.controller.selected_df.loc[original_index, "Amount"] = amount
-                    self.controller.selected_df.loc[original_index, "Description"] = new_description
-                else:
-                    raise KeyError("Could not find matching row in original DataFrame")
-            else:
-                old_description = self.controller.selected_df.loc[
-                    self.controller.currently_selected_row_index, "Description"
-                ]
-                self.controller.selected_df.loc[self.controller.currently_selected_row_index, "Category"] = (
-                    chosen_category
-                )
-                self.controller.selected_df.loc[self.controller.currently_selected_row_index, "Amount"] = amount
-                self.controller.selected_df.loc[self.controller.currently_selected_row_index, "Description"] = new_description
-
-            # --- Update the keywords map for the new structure ---
-            keywords_map = self.controller.keywords_map
-            # Remove old description from all categories' exact lists
-            for cat, rules in keywords_map.items():
-                if "exact" in rules and old_description in rules["exact"]:
-                    rules["exact"].remove(old_description)
-            # Add new description to the chosen category's exact list
-            if chosen_category not in keywords_map:
-                keywords_map[chosen_category] = {"exact": [], "contains": []}
-            if new_description not in keywords_map[chosen_category]["exact"]:
-                keywords_map[chosen_category]["exact"].append(new_description)
-            self.controller.keywords_map = keywords_map
+            row_id = self.controller.currently_selected_row_index
+            old_description = self.controller.get_row(row_id)["Description"]
+            self.controller.update_row(row_id, new_description, amount, chosen_category)
+
+            # --- Learn the new description and re-categorize only the rows it affects ---
+            self.controller.learn_description(old_description, new_description, chosen_category)
             self.apply_filters()
-            self.reset_control_panel()
         except (KeyError, ValueError) as e:
             print(f"Error updating row data: {e}")
             CTkMessagebox(
@@ -368,21 +481,14 @@ class App(ctk.CTk):
 
     def delete_selected_row(self) -> None:
         """Delete the selected row from the data."""
-        if self.controller.currently_selected_row_index is None:
+        if self.controller.currently_selected_row_index is None or self.current_task is not None:
             return
 
         # Get the description of the selected row for the confirmation message
+        row_id = self.controller.currently_selected_row_index
         try:
-            if self.current_displayed_df is not None:
-                # Get description from the currently displayed DataFrame
-                selected_row_data = self.current_displayed_df.loc[self.controller.currently_selected_row_index]
-                item_description = selected_row_data["Description"]
-            else:
-                # Get description from the original DataFrame
-                item_description = self.controller.selected_df.loc[
-                    self.controller.currently_selected_row_index, "Description"
-                ]
-        except (KeyError, ValueError) as e:
+            item_description = self.controller.get_row(row_id)["Description"]
+        except KeyError as e:
             print(f"Error getting row description: {e}")
             item_description = "Unknown"
 
@@ -395,33 +501,8 @@ class App(ctk.CTk):
         )
         if msg.get() == "Delete":
             try:
-                # Get the correct index for the original DataFrame
-                if self.current_displayed_df is not None:
-                    # Find the corresponding index in the original DataFrame
-                    # We need to find the row in the original DataFrame that matches the selected row
-                    selected_row_data = self.current_displayed_df.loc[self.controller.currently_selected_row_index]
-
-                    # Find the matching row in the original DataFrame
-                    # We'll match by all columns to ensure we get the right row
-                    mask = True
-                    for col in selected_row_data.index:
-                        if col in self.controller.selected_df.columns:
-                            mask = mask & (self.controller.selected_df[col] == selected_row_data[col])
-
-                    # Get the index of the matching row in the original DataFrame
-                    matching_indices = self.controller.selected_df[mask].index
-                    if len(matching_indices) > 0:
-                        original_index = matching_indices[0]
-                        # Delete from the original DataFrame using the correct index
-                        self.controller.selected_df.drop(original_index, inplace=True)
-                    else:
-                        raise KeyError("Could not find matching row in original DataFrame")
-                else:
-                    # If no filtered data, delete directly from original DataFrame
-                    self.controller.selected_df.drop(self.controller.currently_selected_row_index, inplace=True)
-
+                self.controller.delete_row(row_id)
                 self.apply_filters()
-                self.reset_control_panel()
             except (KeyError, ValueError) as e:
                 print(f"Error deleting row: {e}")
                 CTkMessagebox(
@@ -439,6 +520,8 @@ class App(ctk.CTk):
         """Reset the control panel to its default state."""
         self.bottom_frame.update_button.configure(state="disabled")
         self.bottom_frame.delete_button.configure(state="disabled")
+        self.bottom_frame.apply_selected_button.configure(state="disabled")
+        self.bottom_frame.apply_description_button.configure(state="disabled")
         self.bottom_frame.category_edit_box.set("")
         self.bottom_frame.category_edit_box.configure(state="disabled")
         self.bottom_frame.amount_edit_entry.delete(0, "end")
@@ -448,6 +531,7 @@ class App(ctk.CTk):
         # Refresh the category edit box with current categories
         self.bottom_frame.category_edit_box.configure(values=self.controller.get_categories())
         self.controller.currently_selected_row_index = None
+        self.selected_row_ids = []
 
     def export_to_excel(self) -> None:
         """Export the currently displayed data to an Excel file."""
@@ -456,7 +540,10 @@ class App(ctk.CTk):
         selected_category = self.filter_frame.category_filter_box.get()
         search_term = self.filter_frame.search_entry.get()
         value_filter = self.filter_frame.value_filter_box.get()
-        df_to_export = self.controller.filter_data(selected_category, search_term, value_filter)
+        df_to_export = self.controller.filter_data(
+            selected_category, search_term, value_filter,
+            self.filter_frame.get_date_range(), self.filter_frame.get_amount_range(),
+        )
         if df_to_export.empty:
             CTkMessagebox(
                 title="Warning",
@@ -464,22 +551,18 @@ class App(ctk.CTk):
                 icon="warning",
             )
             return
-        try:
-            filepath = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel Workbook", "*.xlsx"), ("All Files", "*.*")],
-                title="Save Processed Data As...",
-            )
-            if not filepath:
-                return
-            self.controller.export_data(df_to_export, filepath)
-            CTkMessagebox(
-                title="Success", message=f"Data successfully exported to:\n{filepath}"
-            )
-        except Exception as e:
-            CTkMessagebox(
-                title="Error", message=f"Failed to export file:\n{e}", icon="cancel"
-            )
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel Workbook", "*.xlsx"), ("All Files", "*.*")],
+            title="Save Processed Data As...",
+        )
+        if not filepath:
+            return
+        self.run_task(
+            self.controller.export_data_async(df_to_export, filepath),
+            lambda path: CTkMessagebox(title="Success", message=f"Data successfully exported to:\n{path}"),
+            "Failed to export file",
+        )
 
     def export_keywords(self) -> None:
         """Export the content of keywords.json to a user-specified location."""
@@ -498,6 +581,14 @@ class App(ctk.CTk):
         except Exception as e:
             CTkMessagebox(title="Error", message=f"Failed to export keywords:\n{e}", icon="cancel")
 
+    def clear_workbook_cache(self) -> None:
+        """Remove all cached parsed workbooks, so the next load parses the .xlsx again."""
+        try:
+            removed = self.controller.clear_workbook_cache()
+            CTkMessagebox(title="Cache Cleared", message=f"Removed {removed} cached workbook(s).")
+        except Exception as e:
+            CTkMessagebox(title="Error", message=f"Failed to clear cache:\n{e}", icon="cancel")
+
     def refresh_category_filter(self) -> None:
         """Refresh the category filter box with current categories."""
         current_categories = self.controller.get_categories()
@@ -505,6 +596,11 @@ class App(ctk.CTk):
             values=[CATEGORY_ALL, CATEGORY_UNCATEGORIZED] + current_categories
         )
 
+    def close_app(self) -> None:
+        """Cancel background tasks and quit the application."""
+        self.controller.cancel_tasks()
+        self.quit()
+
     def exit_fullscreen(self):
         self.attributes('-fullscreen', False)
 
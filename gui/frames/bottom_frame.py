@@ -46,6 +46,23 @@ class BottomFrame(ctk.CTkFrame):
         )
         self.update_button.pack(side="left", padx=5)
 
+        # --- Batch Category Actions ---
+        self.apply_selected_button = ctk.CTkButton(
+            self.control_frame,
+            text="Apply to Selected",
+            command=lambda: self.main_app.apply_category_to_selected(),
+            state="disabled",
+        )
+        self.apply_selected_button.pack(side="left", padx=5)
+
+        self.apply_description_button = ctk.CTkButton(
+            self.control_frame,
+            text="Apply to Same Description",
+            command=lambda: self.main_app.apply_category_to_description(),
+            state="disabled",
+        )
+        self.apply_description_button.pack(side="left", padx=5)
+
         self.delete_button = ctk.CTkButton(
             self.control_frame,
             text="Delete",
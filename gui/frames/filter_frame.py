@@ -1,11 +1,13 @@
 # new file: gui/frames/filter_frame.py
 import customtkinter as ctk
+import pandas as pd
+from typing import Optional, Tuple
 from config.constants import CATEGORY_ALL, CATEGORY_UNCATEGORIZED
 
 
 class FilterFrame(ctk.CTkFrame):
     """
-    Frame for filtering data by category, search, and value.
+    Frame for filtering data by category, search, value, date range and amount range.
     """
     def __init__(self, master, controller):
         super().__init__(master)
@@ -35,7 +37,7 @@ class FilterFrame(ctk.CTkFrame):
         )
         self.search_entry.grid(row=0, column=3, padx=5, pady=10, sticky="ew")
         self.search_entry.bind(
-            "<KeyRelease>", lambda event: self.controller.apply_filters(event)
+            "<KeyRelease>", lambda event: self.controller.search_changed(event)
         )
 
         self.clear_button = ctk.CTkButton(
@@ -54,3 +56,59 @@ class FilterFrame(ctk.CTkFrame):
         )
         self.value_filter_box.set("All")
         self.value_filter_box.grid(row=0, column=5, padx=(5, 10), pady=10)
+
+        # --- Date and Amount Range Filters (applied on Enter or when leaving the field) ---
+        range_row = ctk.CTkFrame(self, fg_color="transparent")
+        range_row.grid(row=1, column=0, columnspan=6, padx=5, pady=(0, 10), sticky="w")
+        ctk.CTkLabel(range_row, text="Date from:").pack(side="left", padx=(5, 5))
+        self.date_from_entry = ctk.CTkEntry(range_row, placeholder_text="YYYY-MM-DD", width=110, state="disabled")
+        self.date_from_entry.pack(side="left", padx=5)
+        ctk.CTkLabel(range_row, text="to:").pack(side="left", padx=(5, 5))
+        self.date_to_entry = ctk.CTkEntry(range_row, placeholder_text="YYYY-MM-DD", width=110, state="disabled")
+        self.date_to_entry.pack(side="left", padx=5)
+        ctk.CTkLabel(range_row, text="Amount min:").pack(side="left", padx=(20, 5))
+        self.amount_min_entry = ctk.CTkEntry(range_row, placeholder_text="Min", width=90, state="disabled")
+        self.amount_min_entry.pack(side="left", padx=5)
+        ctk.CTkLabel(range_row, text="max:").pack(side="left", padx=(5, 5))
+        self.amount_max_entry = ctk.CTkEntry(range_row, placeholder_text="Max", width=90, state="disabled")
+        self.amount_max_entry.pack(side="left", padx=5)
+        self.range_entries = [self.date_from_entry, self.date_to_entry, self.amount_min_entry, self.amount_max_entry]
+        for entry in self.range_entries:
+            entry.bind("<Return>", lambda event: self.controller.apply_filters())
+            entry.bind("<FocusOut>", lambda event: self.controller.apply_filters())
+
+    def set_range_state(self, state: str) -> None:
+        """Enable ('normal') or disable ('disabled') the range entries."""
+        for entry in self.range_entries:
+            entry.configure(state=state)
+
+    def clear_ranges(self) -> None:
+        """Empty the range entries."""
+        for entry in self.range_entries:
+            entry.delete(0, "end")
+
+    def get_date_range(self) -> Optional[Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]]:
+        """Return the entered (from, to) dates, 'to' covering its whole day; empty or invalid dates are open ends."""
+        start = self._parse_date(self.date_from_entry.get())
+        end = self._parse_date(self.date_to_entry.get())
+        if end is not None:
+            end = end.normalize() + pd.Timedelta(days=1) - pd.Timedelta(1, "ns")
+        return (start, end) if start is not None or end is not None else None
+
+    def get_amount_range(self) -> Optional[Tuple[Optional[float], Optional[float]]]:
+        """Return the entered (min, max) amounts; empty or invalid amounts are open ends."""
+        low = self._parse_amount(self.amount_min_entry.get())
+        high = self._parse_amount(self.amount_max_entry.get())
+        return (low, high) if low is not None or high is not None else None
+
+    def _parse_date(self, text: str) -> Optional[pd.Timestamp]:
+        """Parse a date entry with the date settings of the loaded bank profile, returning None if it is empty or invalid."""
+        return self.controller.parse_date(text)
+
+    @staticmethod
+    def _parse_amount(text: str) -> Optional[float]:
+        """Parse an amount entry (',' accepted as decimal separator), returning None if it is empty or invalid."""
+        try:
+            return float(text.strip().replace(",", "."))
+        except ValueError:
+            return None
@@ -1,5 +1,8 @@
 # new file: gui/frames/summary_chart_frame.py
 import customtkinter as ctk
+from typing import Callable, List
+import pandas as pd
+from core.data_utils import CategoryAggregates
 
 # Configure matplotlib backend for compatibility with frozen executables
 try:
@@ -17,17 +20,35 @@ if MATPLOTLIB_AVAILABLE:
     plt.style.use("dark_background")
 
 
+# Categories drawn as lines in the monthly view (the largest by absolute total)
+MAX_SERIES = 6
+
+
 class SummaryChartFrame(ctk.CTkFrame):
-    def __init__(self, master):
+    def __init__(self, master, timeseries_source: Callable[[List[str]], pd.DataFrame] | None = None):
+        """
+        timeseries_source(categories) returns the monthly net amount per category (rows: months,
+        columns: categories) for the "By Month" view; without it only the category view is offered.
+        """
         super().__init__(master)
 
         self.grid_rowconfigure(1, weight=1)
         self.grid_columnconfigure(0, weight=1)
+        self.timeseries_source = timeseries_source
+        self.aggregates: CategoryAggregates | None = None
 
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.grid(row=0, column=0, pady=10)
         self.title_label = ctk.CTkLabel(
-            self, text="Category Summary", font=ctk.CTkFont(size=16, weight="bold")
+            header, text="Category Summary", font=ctk.CTkFont(size=16, weight="bold")
+        )
+        self.title_label.pack(side="left", padx=(0, 10))
+        self.mode_button = ctk.CTkSegmentedButton(
+            header, values=["By Category", "By Month"], command=lambda value: self.redraw()
         )
-        self.title_label.grid(row=0, column=0, pady=10)
+        self.mode_button.set("By Category")
+        if timeseries_source is not None:
+            self.mode_button.pack(side="left")
 
         if MATPLOTLIB_AVAILABLE:
             # Create a figure and a subplot with a matching dark background
@@ -48,13 +69,63 @@ class SummaryChartFrame(ctk.CTkFrame):
             )
             self.fallback_label.grid(row=1, column=0, sticky="nsew")
 
-    def update_chart(self, summary_df):
-        """Clears the old chart and draws a new one with the provided summary data."""
+    def update_chart(self, aggregates: CategoryAggregates | None):
+        """Show the aggregates of a new view in the selected chart mode."""
+        self.aggregates = aggregates
+        self.redraw()
+
+    def redraw(self):
+        """Draw the current aggregates as the category chart or the monthly time series."""
         if not MATPLOTLIB_AVAILABLE:
             return
+        if self.mode_button.get() == "By Month" and self.timeseries_source is not None:
+            self.draw_timeseries(self.aggregates)
+        else:
+            self.draw_categories(self.aggregates)
+
+    def draw_timeseries(self, aggregates: CategoryAggregates | None):
+        """Draw the monthly net amount of the view's largest categories, read from the rollup cube."""
+        self.ax.clear()
+        summary_df = aggregates.summary() if aggregates is not None else None
+        series = None
+        if summary_df is not None and not summary_df.empty:
+            largest = summary_df.reindex(summary_df["Total"].abs().sort_values(ascending=False).index)
+            series = self.timeseries_source(largest["Category"].head(MAX_SERIES).tolist())
+        if series is None or series.empty:
+            self.ax.text(
+                0.5, 0.5, "No dated data to visualize", ha="center", va="center", color="gray"
+            )
+        else:
+            for category in series.columns:
+                self.ax.plot(series.index, series[category], marker="o", markersize=3, label=category)
+            self.ax.set_ylabel("Net Amount")
+            self.ax.set_title("Net Amount by Month")
+            self.ax.axhline(0, color="gray", linewidth=0.8)
+            self.ax.tick_params(axis="x", colors="white", labelsize=8, rotation=30)
+            self.ax.tick_params(axis="y", colors="white", labelsize=9)
+            self.ax.spines["top"].set_visible(False)
+            self.ax.spines["right"].set_visible(False)
+            self.ax.grid(axis="y", color="gray", linestyle="--", linewidth=0.5, alpha=0.5)
+            self.ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f"{x:,.0f}"))
+            self.ax.legend(
+                loc="upper center",
+                bbox_to_anchor=(0.5, -0.25),
+                ncol=min(3, len(series.columns)),
+                fontsize=8,
+                frameon=False,
+                labelcolor="white",
+            )
+        self.figure.tight_layout(pad=2.0)
+        self.canvas.draw()
 
+    def draw_categories(self, aggregates: CategoryAggregates | None):
+        """
+        Clears the old chart and draws a new one from the aggregates of the view:
+        per category, expenses and income as stacked bars, in the order of the summary table.
+        """
         self.ax.clear()
 
+        summary_df = aggregates.summary() if aggregates is not None else None
         if summary_df is None or summary_df.empty:
             self.ax.text(
                 0.5, 0.5, "No data to visualize", ha="center", va="center", color="gray"
@@ -68,16 +139,20 @@ class SummaryChartFrame(ctk.CTkFrame):
                 "#607D8B", "#795548", "#FFEB3B", "#2196F3", "#FFC107"
             ]
 
-            # Use absolute values for bar heights
-            bar_heights = summary_df["Total"].abs()
+            # Expense and income split of each category, from the same aggregation pass as the summary table
+            positions = [aggregates.categories.index(category) for category in summary_df["Category"]]
+            expenses = -aggregates.negative[positions]
+            income = aggregates.positive[positions]
+            counts = aggregates.counts[positions]
 
             # Assign colors to categories (cycle through palette if more categories than colors)
             colors = [color_palette[i % len(color_palette)] for i in range(len(summary_df))]
 
-            # Create the vertical bar chart with different colors for each category
-            self.ax.bar(range(len(summary_df)), bar_heights, color=colors)
-            self.ax.set_ylabel("Total (Absolute)")
-            self.ax.set_title("Total by Category")
+            # Expenses in the category color, income stacked on top in a lighter shade
+            self.ax.bar(range(len(summary_df)), expenses, color=colors)
+            self.ax.bar(range(len(summary_df)), income, bottom=expenses, color=colors, alpha=0.45)
+            self.ax.set_ylabel("Expenses + Income (Absolute)")
+            self.ax.set_title("Expenses and Income by Category")
 
             # Remove x-axis labels and ticks since we'll use a legend
             self.ax.set_xticks([])
@@ -98,7 +173,9 @@ class SummaryChartFrame(ctk.CTkFrame):
             # Create legend with category names and colors
             legend_elements = []
             for i, category in enumerate(summary_df["Category"]):
-                legend_elements.append(plt.Rectangle((0, 0), 1, 1, facecolor=colors[i], label=category))
+                legend_elements.append(
+                    plt.Rectangle((0, 0), 1, 1, facecolor=colors[i], label=f"{category} ({counts[i]})")
+                )
 
             # Add legend below the chart
             self.ax.legend(
@@ -1,11 +1,33 @@
 # new file: gui/frames/table_frame.py
 import customtkinter as ctk
 from tkinter import ttk
+from typing import Callable, Dict, List, Set, Tuple
+import pandas as pd
+from core.table_window import TableRows, clamp_offset, diff_window, offset_for_fraction, scroll_fractions
+from config.constants import TABLE_ROW_HEIGHT, TABLE_BUFFER_ROWS, TABLE_WHEEL_ROWS
+
+# Modifier bits of Tk event.state
+SHIFT_MASK = 0x1
+CONTROL_MASK = 0x4
 
 
 class TableFrame(ctk.CTkFrame):
+    """
+    A table showing a DataFrame as a virtualized Treeview: only the rows in the viewport plus a small buffer
+    exist as Treeview items. The scrollbar maps to a row offset in the data, and scrolling re-renders that
+    window from the column arrays of TableRows, so rendering cost does not depend on the number of rows.
+    """
     def __init__(self, master):
         super().__init__(master)
+        self.rows = TableRows()
+        self.offset = 0  # First data row in the viewport
+        self.use_labels = False  # Item ids are the row labels (else row numbers)
+        self.selected_labels: Set[object] = set()  # Selected row labels, kept while they scroll out of the window
+        self._item_labels: Dict[str, object] = {}  # Item id (as Tk returns it) -> row label
+        self._shown: List[Tuple[object, tuple]] = []  # (item id, (values, tag)) of the items, in order
+        self._schema: Tuple[str, ...] | None = ()  # Configured columns (None: the 'No Data' column)
+        self._headings: Dict[str, str] = {}  # Column -> heading text shown
+        self._on_heading: Callable[[str], None] | None = None  # Heading click handler bound
 
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
@@ -19,7 +41,7 @@ class TableFrame(ctk.CTkFrame):
             foreground="white",
             fieldbackground="#2a2d2e",
             borderwidth=0,
-            rowheight=25,
+            rowheight=TABLE_ROW_HEIGHT,
         )
         style.map("Treeview", background=[("selected", "#22559b")])
         style.configure(
@@ -39,7 +61,160 @@ class TableFrame(ctk.CTkFrame):
         self.tree.tag_configure("oddrow", background="#343638")
         self.tree.tag_configure("evenrow", background="#2a2d2e")
 
-        # Add a scrollbar
-        scrollbar = ctk.CTkScrollbar(self, command=self.tree.yview)
-        scrollbar.grid(row=0, column=1, sticky="ns")
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # Add a scrollbar; it scrolls the data window, not the Treeview, which never holds more than a viewport
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.tree.bind("<Configure>", lambda event: self.render())
+        self.tree.bind("<Button-1>", self.on_click)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-TABLE_WHEEL_ROWS))  # X11 wheel up
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(TABLE_WHEEL_ROWS))  # X11 wheel down
+        self.tree.bind("<Up>", lambda event: self.on_arrow(-1))
+        self.tree.bind("<Down>", lambda event: self.on_arrow(1))
+        self.tree.bind("<Prior>", lambda event: self.scroll_by(-self.visible_rows()))
+        self.tree.bind("<Next>", lambda event: self.scroll_by(self.visible_rows()))
+
+    def show(
+        self,
+        dataframe: pd.DataFrame | None,
+        headings: Dict[str, str] | None = None,
+        on_heading: Callable[[str], None] | None = None,
+        use_labels: bool = False,
+    ) -> None:
+        """
+        Show a DataFrame. headings optionally maps columns to heading texts, on_heading(column) is called
+        on a heading click, and with use_labels the item ids are the row labels instead of row numbers.
+        Columns are only reconfigured when they change and the shown items are reconciled with the new
+        rows, so re-showing an edited view costs a few Treeview calls. The scroll position is kept
+        (within the new rows), and so are the selected rows that are still in the new rows.
+        """
+        tree = self.tree
+        selected = self.selection()
+        self.rows = TableRows(dataframe)
+        self.selected_labels = self.rows.present(selected)
+
+        empty = dataframe is None or dataframe.empty
+        schema = None if empty else tuple(self.rows.columns)
+        if schema != self._schema or use_labels != self.use_labels:
+            # New columns (or item ids of another kind): start from an empty Treeview
+            tree.delete(*tree.get_children())
+            self._item_labels, self._shown = {}, []
+            tree["columns"] = schema or "1"
+            self._schema, self._headings, self._on_heading = schema, {}, None
+            for col in schema or ("1",):
+                tree.column(col, width=150, anchor="center")
+        self.use_labels = use_labels
+
+        if empty:
+            self._set_headings({"1": "No Data"}, None)
+            self.scrollbar.set(0.0, 1.0)
+            return
+        self._set_headings({col: (headings or {}).get(col, col) for col in schema}, on_heading)
+        self._render()
+
+    def _set_headings(self, texts: Dict[str, str], on_heading: Callable[[str], None] | None) -> None:
+        """Set the heading texts and click handler, touching only the headings that changed."""
+        rebind = on_heading != self._on_heading
+        for col, text in texts.items():
+            if rebind or self._headings.get(col) != text:
+                heading_options = {"text": text}
+                if rebind:
+                    heading_options["command"] = (lambda c=col: on_heading(c)) if on_heading is not None else ""
+                self.tree.heading(col, **heading_options)
+        self._headings, self._on_heading = texts, on_heading
+
+    def visible_rows(self) -> int:
+        """Rows that fit in the viewport, below the heading row."""
+        return max(1, self.tree.winfo_height() // TABLE_ROW_HEIGHT - 1)
+
+    def render(self) -> None:
+        """
+        Show the rows in the viewport plus TABLE_BUFFER_ROWS, reconciling the Treeview items with them by
+        item id (see diff_window) instead of re-creating them, and update the scrollbar.
+        """
+        self.selected_labels = set(self.selection())
+        self._render()
+
+    def _render(self) -> None:
+        """Reconcile the items with the rows of the viewport and select the items of selected_labels."""
+        tree = self.tree
+        total, visible = len(self.rows), self.visible_rows()
+        self.offset = clamp_offset(self.offset, visible, total)
+        labels, values = self.rows.window(self.offset, self.offset + visible + TABLE_BUFFER_ROWS)
+        rows, item_labels = [], {}
+        for i, (label, row) in enumerate(zip(labels, values)):
+            number = self.offset + i
+            tag = "oddrow" if number % 2 != 0 else "evenrow"  # Stripes follow the data row, not the item
+            iid = label if self.use_labels else number
+            rows.append((iid, (row, tag)))
+            item_labels[str(iid)] = label  # Tk returns item ids as strings
+
+        diff = diff_window(self._shown, rows)
+        if diff.deleted:
+            tree.delete(*diff.deleted)
+        for iid, (row, tag) in diff.updated:
+            tree.item(iid, values=row, tags=(tag,))
+        for iid, index in diff.placed:
+            if iid in diff.inserted:
+                row, tag = diff.inserted[iid]
+                tree.insert("", index, iid=iid, values=row, tags=(tag,))
+            else:
+                tree.detach(iid)  # Indexes count the other items, so take the item out first
+                tree.move(iid, "", index)
+        self._shown, self._item_labels = rows, item_labels
+
+        selected = [iid for iid, label in item_labels.items() if label in self.selected_labels]
+        if set(tree.selection()) != set(selected):
+            tree.selection_set(selected)
+        self.scrollbar.set(*scroll_fractions(self.offset, visible, total))
+
+    def selection(self) -> List[object]:
+        """Return the labels of the selected rows: those selected in the window and those scrolled out of it."""
+        shown = [self._item_labels[iid] for iid in self.tree.selection() if iid in self._item_labels]
+        window = set(self._item_labels.values())
+        return [*(label for label in self.selected_labels if label not in window), *shown]
+
+    def on_click(self, event) -> None:
+        """A plain click starts a new selection, so rows selected out of the window are dropped."""
+        if not event.state & (SHIFT_MASK | CONTROL_MASK):
+            self.selected_labels = set()
+
+    def scroll_by(self, rows: int) -> str:
+        """Move the viewport by a number of rows."""
+        self.offset = clamp_offset(self.offset + rows, self.visible_rows(), len(self.rows))
+        self.render()
+        return "break"
+
+    def on_scrollbar(self, action: str, value: str, unit: str | None = None) -> None:
+        """Handle scrollbar drags ('moveto', fraction) and arrow/page clicks ('scroll', count, unit)."""
+        visible = self.visible_rows()
+        if action == "moveto":
+            self.offset = offset_for_fraction(float(value), visible, len(self.rows))
+            self.render()
+        elif action == "scroll":
+            self.scroll_by(int(value) * (visible if unit == "pages" else 1))
+
+    def on_mousewheel(self, event) -> str:
+        """Scroll TABLE_WHEEL_ROWS rows per wheel step (Windows and macOS deltas)."""
+        return self.scroll_by(-TABLE_WHEEL_ROWS if event.delta > 0 else TABLE_WHEEL_ROWS)
+
+    def on_arrow(self, step: int) -> str | None:
+        """Scroll the window when the arrow keys move the selection past the first or last shown row."""
+        items = self.tree.get_children()
+        focus = self.tree.focus()
+        if not items or focus not in items:
+            return None
+        position = items.index(focus) + step
+        if 0 <= position < min(len(items), self.visible_rows()):
+            return None  # The Treeview moves the selection within the window itself
+        number = self.offset + items.index(focus) + step
+        if not 0 <= number < len(self.rows):
+            return "break"
+        self.scroll_by(step)
+        iid = self.rows.labels[number] if self.use_labels else number
+        self.selected_labels = set()
+        if self.tree.exists(iid):
+            self.tree.focus(iid)
+            self.tree.selection_set(iid)
+        return "break"
@@ -5,7 +5,7 @@ import customtkinter as ctk
 class TopActionsFrame(ctk.CTkFrame):
     """
     Frame containing the top row of action buttons for the Finance Analyzer app.
-    Includes file loading, analysis, saving, exporting, and window controls.
+    Includes file loading, analysis, saving, exporting, window controls and the progress of background tasks.
     """
     def __init__(self, master, controller):
         """Initialize the top actions frame and all its buttons."""
@@ -62,6 +62,21 @@ class TopActionsFrame(ctk.CTkFrame):
         )
         self.export_keywords_button.pack(side="left", padx=(4, 0), pady=10)
 
+        # Clear the cache of parsed workbooks
+        self.clear_cache_button = ctk.CTkButton(
+            self.button_row,
+            text="Clear Cache",
+            fg_color="#7f8c8d",
+            hover_color="#95a5a6",
+            text_color="white",
+            command=lambda: master.clear_workbook_cache(),
+            height=36,
+            width=160,
+            corner_radius=8,
+            font=ctk.CTkFont(size=14, weight="bold"),
+        )
+        self.clear_cache_button.pack(side="left", padx=(4, 0), pady=10)
+
         # Exit Fullscreen button
         self.exit_fullscreen_button = ctk.CTkButton(
             self.button_row,
@@ -88,6 +103,39 @@ class TopActionsFrame(ctk.CTkFrame):
             text_color="white",
             font=ctk.CTkFont(size=18, weight="bold"),
             corner_radius=18,
-            command=master.quit,
+            command=master.close_app,
         )
         self.close_button.grid(row=0, column=1, padx=(15, 20), pady=10, sticky="e")
+
+        # Progress of a background load/analysis/export, hidden while idle
+        self.progress_row = ctk.CTkFrame(self, fg_color="transparent")
+        self.progress_row.grid(row=1, column=0, columnspan=2, sticky="ew")
+        self.progress_bar = ctk.CTkProgressBar(self.progress_row, width=320)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(side="left", padx=(0, 10), pady=(0, 5))
+        self.progress_label = ctk.CTkLabel(self.progress_row, text="")
+        self.progress_label.pack(side="left", padx=5, pady=(0, 5))
+        self.cancel_button = ctk.CTkButton(
+            self.progress_row,
+            text="Cancel",
+            fg_color="#C0392B",
+            hover_color="#E74C3C",
+            text_color="white",
+            command=lambda: master.cancel_task(),
+            height=28,
+            width=100,
+            corner_radius=8,
+        )
+        self.cancel_button.pack(side="left", padx=5, pady=(0, 5))
+        self.progress_row.grid_remove()
+
+    def show_progress(self, fraction: float, message: str) -> None:
+        """Show the progress row with the given fraction and message."""
+        self.progress_bar.set(fraction)
+        self.progress_label.configure(text=message)
+        self.cancel_button.configure(state="normal")
+        self.progress_row.grid()
+
+    def hide_progress(self) -> None:
+        """Hide the progress row."""
+        self.progress_row.grid_remove()
@@ -2,6 +2,8 @@
 Main entry point for the Finance Analyzer application.
 Handles application startup and error reporting.
 """
+import multiprocessing
+
 from gui.app_ui import App
 
 
@@ -20,4 +22,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Required for parallel analysis workers in the frozen executable
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,125 @@
+import os
+import pandas as pd
+from core import data_processor
+from core.categorization_cache import CategorizationCache
+from core.categorizer import KeywordMatcher, categorize_descriptions
+from core.data_processor import keywords_fingerprint, save_keywords
+from core.lru_cache import LRUCache
+
+
+def sample_keywords():
+    """Return a small keywords map."""
+    return {"Subscription": {"exact": ["COMVIQ.SE"], "contains": ["spotify"]}}
+
+
+def use_tmp_cache(tmp_path, monkeypatch):
+    """Point the keywords file and the categorization cache at a temporary directory."""
+    monkeypatch.setattr(data_processor, "KEYWORDS_FILE", str(tmp_path / "keywords.json"))
+    monkeypatch.setattr(
+        data_processor, "CATEGORIZATION_CACHE_PATTERN", str(tmp_path / "cache" / "categorization_cache_{}.json")
+    )
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test that the oldest untouched entry is evicted once the cache is full."""
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert [key for key, _ in cache.items()] == ["a", "c"]
+
+
+def test_cache_round_trip(tmp_path, monkeypatch):
+    """Test that cached categorizations survive a save and reload for the same keywords map."""
+    use_tmp_cache(tmp_path, monkeypatch)
+    matcher = KeywordMatcher(sample_keywords())
+    descriptions = pd.Series(["COMVIQ.SE", "Spotify AB", "Rent", "COMVIQ.SE"])
+    cache = CategorizationCache()
+    first = categorize_descriptions(matcher, descriptions, cache)
+    assert first.cache_hits == 0
+    cache.save()
+
+    second = categorize_descriptions(matcher, descriptions, CategorizationCache())
+    assert second.cache_hits == 3
+    assert second.categories.tolist() == first.categories.tolist()
+
+
+def test_cache_is_tagged_with_fingerprint(tmp_path, monkeypatch):
+    """Test that a cache built for one keywords map is not reused for another."""
+    use_tmp_cache(tmp_path, monkeypatch)
+    cache = CategorizationCache()
+    cache.bind(keywords_fingerprint(sample_keywords()))
+    cache.put("Rent", ())
+    cache.save()
+    other = CategorizationCache()
+    other.bind(keywords_fingerprint({"Housing": {"exact": ["Rent"], "contains": []}}))
+    assert other.get("Rent") is None
+
+
+def test_cache_size_bound(tmp_path, monkeypatch):
+    """Test that the persistent cache keeps only the most recent entries."""
+    use_tmp_cache(tmp_path, monkeypatch)
+    cache = CategorizationCache(max_entries=2)
+    cache.bind("fp")
+    for description in ["A", "B", "C"]:
+        cache.put(description, ())
+    cache.save()
+    reloaded = CategorizationCache(max_entries=2)
+    reloaded.bind("fp")
+    assert reloaded.get("A") is None
+    assert reloaded.get("C") == ()
+
+
+def test_save_keywords_invalidates_cache(tmp_path, monkeypatch):
+    """Test that writing a different keywords map removes the cache built for the old one."""
+    use_tmp_cache(tmp_path, monkeypatch)
+    keywords = sample_keywords()
+    save_keywords(keywords)
+    cache = CategorizationCache()
+    categorize_descriptions(KeywordMatcher(keywords), pd.Series(["COMVIQ.SE"]), cache)
+    cache.save()
+    assert os.path.exists(cache.path)
+
+    save_keywords(keywords)  # same map: cache is kept
+    assert os.path.exists(cache.path)
+
+    keywords["Subscription"]["exact"].append("APPLE.COM/BILL")
+    save_keywords(keywords)
+    assert not os.path.exists(cache.path)
+
+
+def test_cached_descriptions_count_towards_rule_stats(tmp_path, monkeypatch):
+    """Test that rule hits are still reported when descriptions come from the cache."""
+    use_tmp_cache(tmp_path, monkeypatch)
+    matcher = KeywordMatcher(sample_keywords())
+    descriptions = pd.Series(["COMVIQ.SE", "Spotify AB", "Spotify AB"])
+    cache = CategorizationCache()
+    categorize_descriptions(matcher, descriptions, cache)
+    cache.save()
+    result = categorize_descriptions(matcher, descriptions, CategorizationCache())
+    assert result.cache_hits == 2
+    assert result.stats.rule_hits == {
+        ("Subscription", "exact", "COMVIQ.SE"): 1,
+        ("Subscription", "contains", "spotify"): 2,
+    }
+
+
+def test_unsaved_keyword_edits_keep_the_saved_map_cache(tmp_path, monkeypatch):
+    """Test that saving the cache of an unsaved keywords map keeps the cache of the map saved on disk."""
+    use_tmp_cache(tmp_path, monkeypatch)
+    keywords = sample_keywords()
+    save_keywords(keywords)
+    saved = CategorizationCache()
+    categorize_descriptions(KeywordMatcher(keywords), pd.Series(["COMVIQ.SE"]), saved)
+    saved.save()
+
+    edited = {"Subscription": {"exact": ["COMVIQ.SE", "APPLE.COM/BILL"], "contains": ["spotify"]}}
+    unsaved = CategorizationCache()
+    categorize_descriptions(KeywordMatcher(edited), pd.Series(["COMVIQ.SE"]), unsaved)
+    unsaved.save()
+    assert os.path.exists(saved.path) and os.path.exists(unsaved.path)
+
+    save_keywords(edited)
+    assert not os.path.exists(saved.path) and os.path.exists(unsaved.path)
@@ -0,0 +1,208 @@
+import pandas as pd
+import pytest
+from core.categorizer import KeywordMatcher, categorize_descriptions, categorize_parallel
+
+
+def sample_keywords():
+    """Return a keywords map exercising exact and contains rules across categories."""
+    return {
+        "Subscription": {"exact": ["COMVIQ.SE", "APPLE.COM/BILL"], "contains": ["spotify"]},
+        "Food & Groceries": {"exact": ["STORA COOP LUND"], "contains": ["coop", "ica"]},
+        "Transport": {"exact": [], "contains": ["sj ab", "coop taxi"]},
+    }
+
+
+def legacy_categorize(df, keywords_map):
+    """Reference implementation: the original per-keyword loop from App.analyze_data."""
+    df = df.copy()
+    df["Category"] = ""
+    for category, rules in keywords_map.items():
+        exact_list = rules.get("exact", [])
+        if exact_list:
+            df.loc[df["Description"].isin(exact_list), "Category"] = category
+    uncategorized_mask = df["Category"] == ""
+    for category, rules in keywords_map.items():
+        for keyword in rules.get("contains", []):
+            contains_mask = df.loc[uncategorized_mask, "Description"].str.contains(keyword, case=False, na=False)
+            indices = df.loc[uncategorized_mask].index[contains_mask]
+            df.loc[indices, "Category"] = category
+            uncategorized_mask = df["Category"] == ""
+    return df["Category"]
+
+
+def test_exact_before_contains():
+    """Test that an exact match wins even when a contains keyword also matches."""
+    matcher = KeywordMatcher(sample_keywords())
+    assert matcher.match("STORA COOP LUND") == "Food & Groceries"
+    assert matcher.match("COMVIQ.SE") == "Subscription"
+
+
+def test_contains_first_category_wins():
+    """Test that the first category in map order wins, not the leftmost hit in the text."""
+    matcher = KeywordMatcher(sample_keywords())
+    # 'coop taxi' (Transport) appears first in the text, but 'coop' belongs to an earlier category
+    assert matcher.match("COOP TAXI MALMO") == "Food & Groceries"
+    assert matcher.match("Spotify P1234") == "Subscription"
+    assert matcher.match("SJ AB Lund") == "Transport"
+    assert matcher.match("Unknown merchant") == ""
+
+
+def test_last_exact_category_wins_on_duplicates():
+    """Test that a description listed under two categories keeps the old 'last assignment wins' behavior."""
+    keywords = {"A": {"exact": ["X"], "contains": []}, "B": {"exact": ["X"], "contains": []}}
+    assert KeywordMatcher(keywords).match("X") == "B"
+
+
+def test_categorize_matches_legacy_loop():
+    """Test that the compiled matcher gives the same result as the original per-keyword loop."""
+    keywords = sample_keywords()
+    descriptions = [
+        "COMVIQ.SE", "STORA COOP LUND", "Coop Nära", "ICA Kvantum", "coop taxi", "SJ AB",
+        "Spotify", "APPLE.COM/BILL", "Rent", "", None, 42, "spotify via coop",
+    ]
+    df = pd.DataFrame({"Description": descriptions * 3})
+    expected = legacy_categorize(df, keywords)
+    result = KeywordMatcher(keywords).categorize(df["Description"])
+    assert result.tolist() == expected.tolist()
+
+
+def test_keyword_with_groups_and_regex():
+    """Test that keywords containing their own regex groups still map to the right category."""
+    keywords = {
+        "Travel": {"exact": [], "contains": ["(sas|norwegian) air"]},
+        "Other": {"exact": [], "contains": ["air"]},
+    }
+    matcher = KeywordMatcher(keywords)
+    assert matcher.match("Norwegian Air 123") == "Travel"
+    assert matcher.match("Airbnb") == "Other"
+
+
+def test_empty_keywords_map():
+    """Test that an empty keywords map leaves every row uncategorized."""
+    result = KeywordMatcher({}).categorize(pd.Series(["A", "B"]))
+    assert result.tolist() == ["", ""]
+
+
+def test_categorize_descriptions_broadcasts_unique_results():
+    """Test that distinct descriptions are categorized once and mapped back to every row."""
+    descriptions = pd.Series(["COMVIQ.SE", "Rent", "COMVIQ.SE", None, "Coop Nära", "Rent"], index=[5, 3, 9, 1, 0, 2])
+    result = categorize_descriptions(KeywordMatcher(sample_keywords()), descriptions)
+    assert result.categories.tolist() == ["Subscription", "", "Subscription", "", "Food & Groceries", ""]
+    assert list(result.categories.index) == [5, 3, 9, 1, 0, 2]
+    assert result.distinct_descriptions == 3
+    assert result.uncategorized_descriptions == 1
+    assert result.uncategorized_rows == 3
+
+
+def test_parallel_matches_serial():
+    """Test that chunked multi-process categorization gives exactly the serial result."""
+    matcher = KeywordMatcher(sample_keywords())
+    descriptions = pd.Series(
+        [f"coop taxi {i}" if i % 3 == 0 else "STORA COOP LUND" if i % 3 == 1 else f"unknown {i}" for i in range(200)]
+        + ["COMVIQ.SE", None, "spotify via coop"]
+    )
+    expected = matcher.categorize(descriptions)
+    result = categorize_parallel(matcher, descriptions, workers=2, chunk_size=37)
+    assert result.tolist() == expected.tolist()
+    assert categorize_descriptions(matcher, descriptions, workers=2, chunk_size=10).categories.tolist() == expected.tolist()
+
+
+def test_prefix_rules_between_exact_and_contains():
+    """Test that prefix rules apply after exact and before contains, longest prefix first."""
+    keywords = {
+        "Subscription": {"exact": [], "prefix": ["PAYPAL *OPENAI"], "contains": []},
+        "Other": {"exact": ["PAYPAL *OPENAI *EXACT"], "prefix": ["PAYPAL *"], "contains": ["paypal"]},
+    }
+    matcher = KeywordMatcher(keywords)
+    descriptions = pd.Series(["PAYPAL *OPENAI *1234", "PAYPAL *OPENAI *EXACT", "PAYPAL *EBAY", "paypal *openai", None])
+    assert matcher.categorize(descriptions).tolist() == ["Subscription", "Other", "Other", "Other", ""]
+    assert matcher.match("PAYPAL *OPENAI *9") == "Subscription"
+
+
+def test_rule_stats_count_rows_per_rule():
+    """Test that rule hits are counted per row, and unused rules are reported as dead."""
+    keywords = sample_keywords()
+    descriptions = pd.Series(["COMVIQ.SE", "COMVIQ.SE", "Coop Nära", "Spotify", "Rent", None])
+    result = categorize_descriptions(KeywordMatcher(keywords), descriptions)
+    report = result.stats.to_report(keywords)
+    hits = {(rule["category"], rule["type"], rule["value"]): rule["hits"] for rule in report["rules"]}
+    assert hits[("Subscription", "exact", "COMVIQ.SE")] == 2
+    assert hits[("Food & Groceries", "contains", "coop")] == 1
+    assert report["category_hits"] == {"Subscription": 3, "Food & Groceries": 1}
+    assert report["rows"] == 6
+    assert report["uncategorized_rows"] == 2
+    assert {"category": "Transport", "type": "contains", "value": "sj ab", "hits": 0} in report["dead_rules"]
+    assert set(report["pass_seconds"]) == {"exact", "prefix", "contains"}
+
+
+def test_refresh_exact_rules_matches_recompile():
+    """Test that patching several exact rules at once gives the same matches as compiling the map again."""
+    keywords = sample_keywords()
+    matcher = KeywordMatcher(keywords)
+    keywords["Subscription"]["exact"].remove("COMVIQ.SE")
+    keywords["Transport"]["exact"] += ["COMVIQ.SE", "SJ AB 123"]
+    keywords["Food & Groceries"]["exact"].append("APPLE.COM/BILL")
+    matcher.refresh_exact_rules(keywords, ["COMVIQ.SE", "SJ AB 123", "APPLE.COM/BILL"])
+    descriptions = ["COMVIQ.SE", "SJ AB 123", "APPLE.COM/BILL", "STORA COOP LUND"]
+    assert [matcher.match(d) for d in descriptions] == [KeywordMatcher(keywords).match(d) for d in descriptions]
+    assert matcher.fingerprint == KeywordMatcher(keywords).fingerprint
+
+
+def test_refresh_exact_rules_replaces_stale_rules():
+    """Test that re-learning a description into another category leaves no rule of the old category behind."""
+    keywords = sample_keywords()
+    keywords["Transport"]["prefix"] = ["SJ "]
+    matcher = KeywordMatcher(keywords)
+    for category in ("Transport", "Food & Groceries", "Transport"):
+        for rules in keywords.values():
+            if "COMVIQ.SE" in rules["exact"]:
+                rules["exact"].remove("COMVIQ.SE")
+        keywords[category]["exact"].append("COMVIQ.SE")
+        matcher.refresh_exact_rules(keywords, ["COMVIQ.SE"])
+    keywords["Subscription"]["exact"].remove("APPLE.COM/BILL")
+    matcher.refresh_exact_rules(keywords, ["APPLE.COM/BILL"])
+    compiled = KeywordMatcher(keywords)
+    assert sorted(matcher.rules) == sorted(compiled.rules)
+    assert all(matcher.rule_index[key] == rule_id for rule_id, key in enumerate(matcher.rules))
+    descriptions = ["COMVIQ.SE", "APPLE.COM/BILL", "SJ 1234", "Spotify", "STORA COOP LUND"]
+    assert [matcher.match(d) for d in descriptions] == [compiled.match(d) for d in descriptions]
+    assert matcher.match("COMVIQ.SE") == "Transport"
+
+
+def test_duplicate_exact_and_prefix_rules_last_category_wins():
+    """Test that a description or prefix listed under several categories gets the last one, as in the old loop."""
+    keywords = {
+        "Subscription": {"exact": ["APPLE.COM/BILL"], "prefix": ["PAYPAL *"], "contains": []},
+        "Other": {"exact": ["APPLE.COM/BILL"], "prefix": ["PAYPAL *"], "contains": []},
+    }
+    matcher = KeywordMatcher(keywords)
+    assert matcher.match("APPLE.COM/BILL") == "Other"
+    assert matcher.match("PAYPAL *EBAY") == "Other"
+    df = pd.DataFrame({"Description": ["APPLE.COM/BILL"]})
+    assert legacy_categorize(df, keywords).tolist() == ["Other"]
+
+
+@pytest.mark.filterwarnings("ignore:This pattern is interpreted as a regular expression")
+def test_contains_keywords_match_like_str_contains():
+    """Test that inline flags, backreferences, named groups and '.' behave as with a per-keyword str.contains."""
+    keywords = {
+        "Flags": {"exact": [], "contains": ["(?i)klarna"]},
+        "Repeat": {"exact": [], "contains": [r"(\d)\1{2}"]},
+        "Named": {"exact": [], "contains": [r"(?P<shop>ikea) (?P=shop)"]},
+        "Dot": {"exact": [], "contains": ["swish.betalning"]},
+        "Other": {"exact": [], "contains": ["(ica|coop)", "betalning"]},
+    }
+    descriptions = [
+        "KLARNA AB", "Order 1119", "Order 1234", "IKEA IKEA", "Swish betalning", "Swish\nbetalning", "ICA Lund",
+    ]
+    df = pd.DataFrame({"Description": descriptions})
+    matcher = KeywordMatcher(keywords)
+    assert [matcher.match(d) for d in descriptions] == legacy_categorize(df, keywords).tolist()
+    assert matcher.match("Swish\nbetalning") == "Other"
+    assert matcher.match("Order 1119") == "Repeat"
+
+
+def test_invalid_contains_keyword_names_its_rule():
+    """Test that a keyword that is not a valid regular expression is reported with its category."""
+    with pytest.raises(ValueError, match="'coop\\(' in category 'Food'"):
+        KeywordMatcher({"Food": {"exact": [], "contains": ["coop("]}})
@@ -0,0 +1,304 @@
+import pytest
+import pandas as pd
+from core import data_processor
+from core.controller import Controller
+from core.excel_loader import HeaderLayout
+
+
+def make_controller(tmp_path, monkeypatch):
+    """Return a controller with sample data and keywords, writing config and cache files to tmp_path."""
+    monkeypatch.setattr(data_processor, "KEYWORDS_FILE", str(tmp_path / "keywords.json"))
+    monkeypatch.setattr(data_processor, "CATEGORIZATION_CACHE_PATTERN", str(tmp_path / "cache_{}.json"))
+    controller = Controller()
+    controller.keywords_map = {
+        "Subscription": {"exact": ["COMVIQ.SE"], "contains": ["spotify"]},
+        "Food & Groceries": {"exact": [], "contains": ["coop"]},
+    }
+    controller.selected_df = pd.DataFrame({
+        "Accounting date": ["2025-01-01", "2025-01-02", "2025-01-03", "2025-01-04", "2025-01-05"],
+        "Description": ["COMVIQ.SE", "Coop Lund", "Rent", "Rent", "Spotify"],
+        "Amount": [-99.0, -250.0, -8000.0, -8000.0, -109.0],
+    })
+    controller.analyze_data()
+    return controller
+
+
+def categories(controller):
+    """Return the Category column as a list."""
+    return controller.selected_df["Category"].tolist()
+
+
+def test_analyze_data(tmp_path, monkeypatch):
+    """Test that analysis categorizes rows and reports distinct descriptions."""
+    controller = make_controller(tmp_path, monkeypatch)
+    assert categories(controller) == ["Subscription", "Food & Groceries", "", "", "Subscription"]
+    assert isinstance(controller.selected_df["Category"].dtype, pd.CategoricalDtype)
+
+
+def test_update_row_with_new_category(tmp_path, monkeypatch):
+    """Test that a category missing from the Categorical column is added when a row is edited."""
+    controller = make_controller(tmp_path, monkeypatch)
+    controller.update_row(2, "Rent", -8000.0, "Brand new category")
+    assert categories(controller)[2] == "Brand new category"
+
+
+def test_learn_description_updates_same_merchant_rows(tmp_path, monkeypatch):
+    """Test that learning one row's description re-categorizes every row with that description."""
+    controller = make_controller(tmp_path, monkeypatch)
+    controller.update_row(2, "Rent", -8000.0, "Housing_Expense")
+    touched = controller.learn_description("Rent", "Rent", "Housing_Expense")
+    assert touched == 2
+    assert categories(controller) == ["Subscription", "Food & Groceries", "Housing_Expense", "Housing_Expense", "Subscription"]
+    assert controller.keywords_map["Housing_Expense"]["exact"] == ["Rent"]
+
+
+def test_removing_exact_rule_falls_back_to_contains(tmp_path, monkeypatch):
+    """Test that rows lose an exact rule's category but still get a matching contains rule."""
+    controller = make_controller(tmp_path, monkeypatch)
+    controller.add_rule("Other", "exact", "Spotify")
+    assert categories(controller)[4] == "Other"
+    controller.remove_rule("exact", "Spotify")
+    assert categories(controller)[4] == "Subscription"
+
+
+def test_contains_rule_changes(tmp_path, monkeypatch):
+    """Test that adding and removing a contains keyword only re-evaluates matching rows."""
+    controller = make_controller(tmp_path, monkeypatch)
+    assert controller.add_rule("Housing_Expense", "contains", "ren") == 2
+    assert categories(controller)[2:4] == ["Housing_Expense", "Housing_Expense"]
+    controller.remove_rule("contains", "ren", "Housing_Expense")
+    assert categories(controller)[2:4] == ["", ""]
+
+
+def test_update_keywords_applies_and_saves(tmp_path, monkeypatch):
+    """Test that update_keywords applies the rule to loaded rows and writes the keywords file."""
+    controller = make_controller(tmp_path, monkeypatch)
+    controller.update_keywords("Rent", "Housing_Expense")
+    assert categories(controller)[2:4] == ["Housing_Expense", "Housing_Expense"]
+    assert "Rent" in data_processor.load_keywords()["Housing_Expense"]["exact"]
+
+
+def test_edit_and_delete_keep_index_in_sync(tmp_path, monkeypatch):
+    """Test that edited and deleted rows are no longer touched through their old description."""
+    controller = make_controller(tmp_path, monkeypatch)
+    controller.update_row(3, "Rent garage", -500.0, "")
+    controller.delete_row(2)
+    assert controller.add_rule("Housing_Expense", "exact", "Rent") == 0
+    assert controller.add_rule("Transport", "exact", "Rent garage") == 1
+    assert controller.selected_df.loc[3, "Category"] == "Transport"
+
+
+def test_prefix_rule_changes(tmp_path, monkeypatch):
+    """Test that adding a prefix rule re-categorizes every description starting with it."""
+    controller = make_controller(tmp_path, monkeypatch)
+    assert controller.add_rule("Housing_Expense", "prefix", "Ren") == 2
+    assert categories(controller)[2:4] == ["Housing_Expense", "Housing_Expense"]
+    controller.remove_rule("prefix", "Ren")
+    assert categories(controller)[2:4] == ["", ""]
+
+
+def test_rule_report_persisted(tmp_path, monkeypatch):
+    """Test that the controller exposes the rule report and can save it next to the keywords file."""
+    monkeypatch.setattr(data_processor, "RULE_STATS_FILE", str(tmp_path / "keywords_stats.json"))
+    controller = make_controller(tmp_path, monkeypatch)
+    report = controller.get_rule_report(persist=True)
+    assert report["category_hits"] == {"Subscription": 2, "Food & Groceries": 1}
+    assert (tmp_path / "keywords_stats.json").exists()
+
+
+def test_rule_report_left_out_after_incremental_changes(tmp_path, monkeypatch):
+    """Test that re-learned rules make the rule stats stale until the next full analysis counts them again."""
+    monkeypatch.setattr(data_processor, "RULE_STATS_FILE", str(tmp_path / "keywords_stats.json"))
+    controller = make_controller(tmp_path, monkeypatch)
+    assert controller.add_rule("Housing_Expense", "exact", "Rent")
+    assert controller.get_rule_report(persist=True) is None
+    assert not (tmp_path / "keywords_stats.json").exists()
+    controller.analyze_data()
+    report = controller.get_rule_report()
+    assert report["category_hits"]["Housing_Expense"] == 2
+
+
+def test_analyze_data_async_applies_on_result(tmp_path, monkeypatch):
+    """Test that background analysis leaves the data untouched until Task.result() applies it."""
+    controller = make_controller(tmp_path, monkeypatch)
+    controller.add_rule("Housing_Expense", "exact", "Rent")
+    controller.selected_df = controller.selected_df.drop(columns="Category")
+    task = controller.analyze_data_async()
+    assert task.future.result(timeout=5)
+    assert "Category" not in controller.selected_df.columns
+    assert task.result().uncategorized_rows == 0
+    assert categories(controller) == ["Subscription", "Food & Groceries", "Housing_Expense", "Housing_Expense", "Subscription"]
+
+
+def test_filter_data_async(tmp_path, monkeypatch):
+    """Test that background filtering gives the same rows as filter_data."""
+    controller = make_controller(tmp_path, monkeypatch)
+    task = controller.filtered_view_async("All Categories", "co", "All")
+    pd.testing.assert_frame_equal(task.result(timeout=5).df, controller.filter_data("All Categories", "co", "All"))
+
+
+def test_filtered_view_cache_follows_data_version(tmp_path, monkeypatch):
+    """Test that filtered views are reused until an edit bumps the data version."""
+    controller = make_controller(tmp_path, monkeypatch)
+    view = controller.filtered_view("Subscription", "", "All")
+    cached = controller.filtered_view("Subscription", "", "All")
+    assert cached.positions is view.positions and cached.aggregates is view.aggregates
+    pd.testing.assert_frame_equal(cached.df, view.df)
+    assert not any(isinstance(part, pd.DataFrame) for _, entry in controller.filter_cache.items() for part in entry)
+    assert view.totals == (0, -208.0, -208.0)
+    controller.update_row(2, "Rent", -8000.0, "Subscription")
+    fresh = controller.filtered_view("Subscription", "", "All")
+    assert fresh is not view
+    assert len(fresh.df) == 3
+    assert fresh.summary["Total"].tolist() == [-8208.0]
+
+
+def test_partitions_follow_row_edits(tmp_path, monkeypatch):
+    """Test that category and value filters see edited and deleted rows."""
+    controller = make_controller(tmp_path, monkeypatch)
+    controller.update_row(2, "Rent", 8000.0, "Housing_Expense")
+    controller.delete_row(0)
+    assert controller.filter_data("Housing_Expense", "", "Positive")["Description"].tolist() == ["Rent"]
+    assert controller.filter_data("Subscription", "", "Negative")["Description"].tolist() == ["Spotify"]
+    assert controller.filter_data("Uncategorized", "", "All")["Description"].tolist() == ["Rent"]
+    controller.sort_data("Amount", ascending=False)
+    assert controller.filter_data("All Categories", "", "Negative")["Amount"].tolist() == [-109.0, -250.0, -8000.0]
+
+
+def test_range_filters_follow_row_edits(tmp_path, monkeypatch):
+    """Test that date and amount range filters see edited, deleted and sorted rows."""
+    controller = make_controller(tmp_path, monkeypatch)
+    assert controller.dates.dtype.kind == "M"
+    controller.update_row(2, "Rent", 8000.0, "Housing_Expense")
+    controller.delete_row(1)
+    controller.sort_data("Amount")
+    view = controller.filtered_view("All Categories", "", "All", ("2025-01-02", "2025-01-04"), (-10000.0, 0.0))
+    assert view.df["Description"].tolist() == ["Rent"]
+    assert controller.filter_data("All Categories", "", "All", amount_range=(0.0, None))["Amount"].tolist() == [8000.0]
+    assert controller.filter_data("Subscription", "", "All", date_range=(None, "2025-01-01"))["Description"].tolist() == [
+        "COMVIQ.SE"
+    ]
+
+
+def test_sort_applies_to_filtered_views(tmp_path, monkeypatch):
+    """Test that sorting orders the views only, reuses the rank codes and supports multi-key sorts."""
+    controller = make_controller(tmp_path, monkeypatch)
+    original = controller.selected_df.copy()
+    controller.sort_data("Description")
+    assert controller.filter_data("All Categories", "", "All")["Description"].tolist() == [
+        "COMVIQ.SE", "Coop Lund", "Rent", "Rent", "Spotify"
+    ]
+    codes = controller._sort_codes[("Description", controller.data_version)]
+    controller.sort_data("Description", ascending=False)
+    assert controller._sort_codes[("Description", controller.data_version)] is codes
+    assert controller.filter_data("Subscription", "", "All")["Description"].tolist() == ["Spotify", "COMVIQ.SE"]
+    controller.sort_data("Category")
+    controller.sort_data("Amount", ascending=False, add=True)
+    assert controller.sort_state == (("Category", True), ("Amount", False))
+    assert controller.filter_data("All Categories", "", "All")["Amount"].tolist() == [
+        -8000.0, -8000.0, -250.0, -99.0, -109.0
+    ]
+    pd.testing.assert_frame_equal(controller.selected_df, original)
+
+
+def test_running_aggregates_follow_edits(tmp_path, monkeypatch):
+    """Test that edits update the view totals row by row, checked against a full recomputation."""
+    controller = make_controller(tmp_path, monkeypatch)
+    controller.check_aggregates = True
+    controller.filtered_view("All Categories", "", "Negative")
+    aggregates = controller.aggregates
+    controller.update_row(2, "Rent", 8000.0, "Housing_Expense")
+    controller.learn_description("Rent", "Rent", "Housing_Expense")
+    controller.delete_row(1)
+    view = controller.filtered_view("All Categories", "", "Negative")
+    assert controller.aggregates is aggregates
+    assert view.summary.set_index("Category")["Total"].to_dict() == {"Housing_Expense": -8000.0, "Subscription": -208.0}
+    assert view.totals == (0.0, -8208.0, -8208.0)
+    controller.filtered_view("Subscription", "", "All")
+    assert controller.aggregates is not aggregates
+
+
+def test_rollup_follows_row_edits(tmp_path, monkeypatch):
+    """Test that the rollup cube sees edited and deleted rows."""
+    controller = make_controller(tmp_path, monkeypatch)
+    controller.update_row(2, "Rent", -7000.0, "Housing_Expense")
+    controller.delete_row(0)
+    table = controller.rollup_table("month", "expenses", ["Subscription", "Housing_Expense"])
+    assert table.loc["2025-01-01"].to_dict() == {"Subscription": -109.0, "Housing_Expense": -7000.0}
+    assert controller.rollup_table("day", "count", ["Subscription"])["Subscription"].tolist() == [0, 0, 0, 0, 1]
+
+
+def test_row_ids_address_duplicate_rows(tmp_path, monkeypatch):
+    """Test that views keep row ids and edits hit the exact row, even among identical transactions."""
+    controller = make_controller(tmp_path, monkeypatch)
+    controller.selected_df.loc[3, "Accounting date"] = controller.selected_df.loc[2, "Accounting date"]
+    controller.sort_data("Amount")
+    view = controller.filter_data("Uncategorized", "", "All")
+    assert view.index.tolist() == [2, 3]
+    controller.delete_row(0)
+    controller.update_row(3, "Rent", -8000.0, "Housing_Expense")
+    assert controller.get_row(3)["Category"] == "Housing_Expense"
+    assert controller.get_row(2)["Category"] == ""
+    assert controller.filter_data("Housing_Expense", "", "All").index.tolist() == [3]
+    with pytest.raises(KeyError):
+        controller.get_row(0)
+
+
+def test_apply_category_to_many_rows(tmp_path, monkeypatch):
+    """Test that a batch recategorization sets, learns and tallies every selected row in one data change."""
+    controller = make_controller(tmp_path, monkeypatch)
+    controller.filtered_view("All Categories", "", "All")
+    version = controller.data_version
+    assert controller.apply_category([2, 1], "Household") == 3
+    assert controller.data_version == version + 1
+    assert categories(controller) == ["Subscription", "Household", "Household", "Household", "Subscription"]
+    assert controller.keywords_map["Household"]["exact"] == ["Rent", "Coop Lund"]
+    view = controller.filtered_view("All Categories", "", "All")
+    assert dict(zip(view.summary["Category"], view.summary["Total"])) == {"Household": -16250.0, "Subscription": -208.0}
+    assert controller.filter_data("Household", "", "All").index.tolist() == [1, 2, 3]
+    controller.check_aggregates = True
+    assert controller.apply_category_to_descriptions(["Spotify"], "Music") == 1
+    assert categories(controller)[4] == "Music"
+    assert "Spotify" not in controller.keywords_map.get("Music", {}).get("exact", [])
+
+
+def test_dates_parsed_apart_from_the_column(tmp_path, monkeypatch):
+    """Test that day-first and mixed-format dates are parsed for filters and sorting, leaving the column as loaded."""
+    controller = make_controller(tmp_path, monkeypatch)
+    loaded = ["02.01.2025", "13.01.2025", "2025-01-05", "31/12/2024", "someday"]
+    controller.selected_df["Accounting date"] = loaded
+    controller.analyze_data()
+    assert controller.selected_df["Accounting date"].tolist() == loaded
+    assert controller.unparsed_dates.tolist() == [4]
+    assert controller.filter_data("All Categories", "", "All", date_range=("2025-01-01", "2025-01-10")).index.tolist() == [0, 2]
+    controller.sort_data("Accounting date")
+    assert controller.filter_data("All Categories", "", "All").index.tolist() == [3, 0, 2, 1, 4]
+    controller.delete_row(4)
+    assert controller.unparsed_dates.tolist() == []
+
+
+def test_filter_dates_follow_the_profile_day_order(tmp_path, monkeypatch):
+    """Test that dates typed into a filter are read in the day/month order of the loaded bank profile."""
+    controller = make_controller(tmp_path, monkeypatch)
+    assert controller.parse_date("03/04/2025") == pd.Timestamp("2025-04-03")
+    controller.header_layout = HeaderLayout(skiprows=0, profile="US", positions={})
+    controller.bank_profiles["US"] = {"dayfirst": False}
+    assert controller.parse_date("03/04/2025") == pd.Timestamp("2025-03-04")
+    controller.bank_profiles["US"]["date_format"] = "%m/%d/%y"
+    assert controller.parse_date("03/04/25") == pd.Timestamp("2025-03-04")
+    assert controller.parse_date("2025-03-04") == pd.Timestamp("2025-03-04")
+    assert controller.parse_date("") is None and controller.parse_date("someday") is None
+
+
+def test_edits_wait_for_background_searches(tmp_path, monkeypatch):
+    """Test that edits interleaved with background searches leave the running totals consistent."""
+    controller = make_controller(tmp_path, monkeypatch)
+    controller.check_aggregates = True
+    filters = [("All Categories", "", "All"), ("All Categories", "r", "Negative"), ("Uncategorized", "", "All")]
+    for i in range(30):
+        tasks = [controller.filtered_view_async(*filters[(i + j) % len(filters)]) for j in range(3)]
+        controller.update_row(2 + i % 2, "Rent", -8000.0 - i, ["Housing_Expense", ""][i % 2])
+        for task in tasks:
+            task.result(timeout=5)
+    view = controller.filtered_view(*filters[0])
+    assert view.totals == controller.calculate_summaries(controller.filter_data(*filters[0]))
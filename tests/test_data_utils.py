@@ -1,6 +1,7 @@
 import pandas as pd
 import pytest
-from core.data_utils import filter_dataframe, sort_dataframe, prepare_export, calculate_summaries
+from core.data_utils import aggregate_by_category, filter_dataframe, parse_dates, sort_dataframe, sort_codes, prepare_export, calculate_summaries, normalize_transactions, add_category
+from core.data_processor import get_category_summary
 
 def sample_df():
     return pd.DataFrame([
@@ -55,4 +56,67 @@ def test_calculate_summaries():
     income, expenses, net = calculate_summaries(df)
     assert income == 1500
     assert expenses == -1050
-    assert net == 450 
\ No newline at end of file
+    assert net == 450
+
+def test_normalize_transactions():
+    df = normalize_transactions(sample_df(), categories=["Transport"])
+    assert df["Amount"].dtype == "float64"
+    assert list(df["Category"].cat.categories) == ["", "Food", "Housing", "Income", "Transport"]
+    assert len(filter_dataframe(df, category="Income")) == 2
+    assert len(filter_dataframe(df, category="Uncategorized")) == 1
+
+def test_interned_descriptions_share_objects():
+    df = normalize_transactions(pd.DataFrame({"Description": ["Rent" + str(i % 2) for i in range(4)]}))
+    assert df["Description"][0] is df["Description"][2]
+
+def test_normalized_summary_and_sort():
+    df = normalize_transactions(sample_df(), categories=["Transport"])
+    df["Category"] = add_category(df["Category"], "Another")
+    summary = get_category_summary(df)
+    assert sorted(summary["Category"]) == ["Food", "Housing", "Income"]
+    assert sort_dataframe(df, "Category")["Category"].tolist() == ["", "Food", "Housing", "Income", "Income"]
+
+def test_sort_keys_match_sort_values():
+    df = normalize_transactions(pd.DataFrame({
+        "Description": ["b", "a", "b", None, "a", "c"],
+        "Amount": [3.0, float("nan"), 1.0, 2.0, 3.0, 1.0],
+        "Category": ["Food", "", "Food", "Income", "", "Food"],
+    }, index=[4, 1, 5, 0, 3, 2]))
+    codes = {name: sort_codes(df[name]) for name in df.columns}
+    for columns in [["Amount"], ["Description"], ["Category", "Amount"], ["Category", "Description", "Amount"]]:
+        for ascending in [True, False]:
+            for directions in [[ascending] * len(columns), [ascending] + [not ascending] * (len(columns) - 1)]:
+                keys = [(codes[name], order) for name, order in zip(columns, directions)]
+                expected = sort_dataframe(df, columns, directions)
+                pd.testing.assert_frame_equal(filter_dataframe(df, sort_keys=keys), expected)
+
+def test_aggregate_by_category_matches_groupby():
+    raw = pd.DataFrame({
+        "Amount": [100.0, -40.0, float("nan"), -10.0, 25.0, -5.0],
+        "Category": ["Food", "Food", "Income", None, "", "Housing"],
+    })
+    for df in [raw, normalize_transactions(raw.fillna({"Category": ""}), categories=["Transport"])]:
+        aggregates = aggregate_by_category(df)
+        amounts = df["Amount"].fillna(0)
+        keys = df["Category"].astype(object).fillna("").astype(str)
+        by_category = dict(zip(aggregates.categories, aggregates.counts))
+        assert {name: count for name, count in by_category.items() if count} == keys.value_counts().to_dict()
+        totals = dict(zip(aggregates.categories, aggregates.category_totals))
+        for name, total in amounts.groupby(keys).sum().items():
+            assert totals[name] == total
+        assert aggregates.totals() == calculate_summaries(df) == (125.0, -55.0, 70.0)
+        assert aggregates.summary()["Category"].tolist() == ["Housing", "Income", "Food"]
+
+def test_parse_dates_day_first_and_mixed_formats():
+    """Test that dates parse value by value, day-first by default, and that unparseable values are reported."""
+    values = pd.Series(
+        ["02.01.2025", "13.01.2025", "2025-01-05", None, "", "junk", pd.Timestamp("2025-03-04"), "01/02/2025"],
+        index=[10, 11, 12, 13, 14, 15, 16, 17],
+    )
+    dates, failed = parse_dates(values)
+    assert dates.dt.strftime("%Y-%m-%d").fillna("").tolist() == [
+        "2025-01-02", "2025-01-13", "2025-01-05", "", "", "", "2025-03-04", "2025-02-01"
+    ]
+    assert failed.tolist() == [15]
+    assert parse_dates(values, dayfirst=False)[0][17] == pd.Timestamp("2025-01-02")
+    assert parse_dates(values, date_format="%d.%m.%Y")[1].tolist() == [12, 15, 16, 17]
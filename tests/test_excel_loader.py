@@ -0,0 +1,104 @@
+import datetime
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+from core.excel_loader import detect_header, read_statement
+
+
+def write_statement(path, rows, header_row=8, header=None):
+    """Write a bank-style workbook: a few title rows, then the header and the transactions."""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.cell(row=1, column=1, value="Account statement")
+    header = header or ["Accounting date", "Transaction date", "Description", "Amount", "Balance"]
+    for column, name in enumerate(header, start=1):
+        sheet.cell(row=header_row, column=column, value=name)
+    for offset, row in enumerate(rows, start=1):
+        for column, value in enumerate(row, start=1):
+            sheet.cell(row=header_row + offset, column=column, value=value)
+    workbook.save(path)
+
+
+def sample_rows():
+    """Return sample transaction rows including a blank line and trailing formatted blank rows."""
+    return [
+        [datetime.datetime(2025, 1, 2), datetime.datetime(2025, 1, 1), "COMVIQ.SE", -99, 1000.5],
+        [datetime.datetime(2025, 1, 3), datetime.datetime(2025, 1, 2), "Salary", 25000.25, 26000],
+        [None, None, None, None, None],
+        [datetime.datetime(2025, 1, 5), datetime.datetime(2025, 1, 4), "Rent", -8000, 18000],
+        [None, None, None, None, None],
+    ]
+
+
+def test_streaming_loader_keeps_only_statement_columns(tmp_path):
+    """Test that only the needed columns are loaded and typed."""
+    path = tmp_path / "statement.xlsx"
+    write_statement(path, sample_rows())
+    df, stats = read_statement(str(path), skiprows=7, engine="openpyxl")
+    assert list(df.columns) == ["Accounting date", "Description", "Amount"]
+    assert df["Amount"].dtype == "float64"
+    assert df["Description"].tolist()[:2] == ["COMVIQ.SE", "Salary"]
+    assert df["Description"].tolist()[3] == "Rent"
+    assert stats.rows == 4
+    assert stats.rows_per_second > 0
+
+
+def test_streaming_loader_matches_read_excel(tmp_path):
+    """Test that the streaming loader returns the same values as pd.read_excel for the kept columns."""
+    path = tmp_path / "statement.xlsx"
+    write_statement(path, sample_rows())
+    df, _ = read_statement(str(path), skiprows=7, engine="openpyxl")
+    expected = pd.read_excel(path, skiprows=7)[["Accounting date", "Description", "Amount"]]
+    pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+
+
+def test_controller_reopens_from_workbook_cache(tmp_path):
+    """Test that loading the same workbook twice reads it back from the workbook cache."""
+    from core.controller import Controller
+    from core.workbook_cache import WorkbookCache
+    path = tmp_path / "statement.xlsx"
+    write_statement(path, sample_rows())
+    controller = Controller()
+    controller.workbook_cache = WorkbookCache(str(tmp_path / "cache"))
+    controller.load_data(str(path))
+    first = controller.df
+    controller.load_data(str(path))
+    assert controller.load_stats.engine == "cache"
+    assert controller.header_layout.skiprows == 7
+    pd.testing.assert_frame_equal(controller.df, first)
+
+
+def test_header_is_detected_with_profile_aliases(tmp_path):
+    """Test that the header row is found anywhere in the first rows and aliased columns get the standard names."""
+    path = tmp_path / "statement.xlsx"
+    header = ["Bokföringsdag", "Transaktionsdag", "Beskrivning", "Belopp", "Saldo"]
+    write_statement(path, sample_rows(), header_row=3, header=header)
+    profiles = {"Swedish": {"Accounting date": ["Bokföringsdag"], "Description": ["Beskrivning"], "Amount": ["Belopp"]}}
+    df, _ = read_statement(str(path), engine="openpyxl", profiles=profiles)
+    assert list(df.columns) == ["Accounting date", "Description", "Amount"]
+    assert df["Description"].tolist()[:2] == ["COMVIQ.SE", "Salary"]
+    assert df.attrs["header"] == {"skiprows": 2, "profile": "Swedish", "positions": {"Accounting date": 0, "Description": 2, "Amount": 3}}
+
+
+def test_header_not_found(tmp_path):
+    """Test that a sheet without the required columns in the sniffed rows is rejected."""
+    path = tmp_path / "statement.xlsx"
+    write_statement(path, sample_rows(), header_row=8)
+    assert detect_header(str(path)).skiprows == 7
+    with pytest.raises(ValueError):
+        detect_header(str(path), sniff_rows=5)
+    with pytest.raises(ValueError):
+        read_statement(str(path), skiprows=2, engine="openpyxl")
+
+
+def test_export_follows_detected_header(tmp_path):
+    """Test that an export puts the header on the row it was found on, so it loads back the same way."""
+    from core.controller import Controller
+    from core.workbook_cache import WorkbookCache
+    path = tmp_path / "statement.xlsx"
+    write_statement(path, sample_rows(), header_row=4)
+    controller = Controller()
+    controller.workbook_cache = WorkbookCache(str(tmp_path / "cache"))
+    controller.load_data(str(path))
+    controller.export_data(controller.selected_df, str(tmp_path / "export.xlsx"))
+    assert detect_header(str(tmp_path / "export.xlsx")).skiprows == 3
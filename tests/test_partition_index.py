@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+from core.data_utils import filter_dataframe, normalize_transactions
+from core.description_index import DescriptionIndex
+from core.partition_index import PartitionIndex
+
+
+def sample_df():
+    """Return normalized sample rows with non-sequential labels, a zero and a missing amount."""
+    return normalize_transactions(pd.DataFrame({
+        "Description": ["Salary", "Coop Lund", "Rent", "Coop Malmö", "Refund", "Fee"],
+        "Amount": [25000.0, -250.0, -8000.0, -90.0, 0.0, np.nan],
+        "Category": ["Income", "Food", "", "Food", "", "Bank"],
+    }, index=[5, 2, 9, 0, 7, 3]))
+
+
+def test_partition_filters_match_masks():
+    """Test that partition-backed filters return the same rows, in order, as the mask filters."""
+    df = sample_df()
+    partitions = PartitionIndex(df["Category"], df["Amount"])
+    search_index = DescriptionIndex(df["Description"])
+    for category in ["All Categories", "Uncategorized", "Food", "Missing"]:
+        for value_filter in ["All", "Positive", "Negative"]:
+            for term in ["", "coop", "e"]:
+                expected = filter_dataframe(df, category, term, value_filter)
+                actual = filter_dataframe(df, category, term, value_filter, search_index, partitions)
+                pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_partitions_follow_edits():
+    """Test that category, amount and delete updates keep the groups equal to a fresh build."""
+    df = sample_df()
+    partitions = PartitionIndex(df["Category"], df["Amount"])
+    partitions.set_category([2, 4], "Housing")
+    partitions.set_amount(4, 50.0)
+    partitions.remove(1)
+    assert partitions.rows("Housing").tolist() == [1, 3]
+    assert partitions.rows("").tolist() == []
+    assert partitions.rows("Food").tolist() == [2]
+    assert partitions.rows(None, "Positive").tolist() == [0, 3]
+    assert partitions.rows("Housing", "Negative").tolist() == [1]
+    assert len(partitions) == 5
@@ -0,0 +1,40 @@
+from core.prefix_trie import PrefixTrie
+
+
+def test_longest_prefix_wins():
+    """Test that the most specific stored prefix is returned."""
+    trie = PrefixTrie()
+    trie.insert("PAYPAL *", "Other")
+    trie.insert("PAYPAL *OPENAI", "Subscription")
+    assert trie.longest_match("PAYPAL *OPENAI *1234") == "Subscription"
+    assert trie.longest_match("PAYPAL *EBAY") == "Other"
+    assert trie.longest_match("PAYPA") is None
+
+
+def test_first_insert_kept_unless_overwritten():
+    """Test that an existing value for the same prefix is kept unless overwrite is requested."""
+    trie = PrefixTrie()
+    trie.insert("ICA", "Food")
+    trie.insert("ICA", "Other")
+    assert trie.longest_match("ICA KVANTUM") == "Food"
+    trie.insert("ICA", "Other", overwrite=True)
+    assert trie.longest_match("ICA KVANTUM") == "Other"
+    assert len(trie) == 1
+
+
+def test_empty_prefix_ignored():
+    """Test that an empty prefix is not stored, so it cannot match every text."""
+    trie = PrefixTrie()
+    trie.insert("", "Other")
+    assert len(trie) == 0
+    assert trie.longest_match("anything") is None
+
+
+def test_remap_replaces_values():
+    """Test that remapping replaces every stored value and keeps the prefixes."""
+    trie = PrefixTrie()
+    trie.insert("ICA", 3)
+    trie.insert("ICA MAXI", 5)
+    trie.remap({3: 1, 5: 2})
+    assert trie.longest_match("ICA MAXI LUND") == 2
+    assert trie.longest_match("ICA NÄRA") == 1
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.data_utils import normalize_transactions, parse_dates
+from core.rollup import PERIODS, RollupCube
+
+
+def sample_df():
+    """Return normalized sample rows across a year boundary, with a missing date and a missing amount; dates parsed."""
+    df = normalize_transactions(pd.DataFrame({
+        "Accounting date": ["2024-12-30", "2025-01-05", "2025-01-20", None, "2025-02-03", "2025-02-28", "2025-03-01"],
+        "Description": ["Coop", "Coop", "Salary", "Fee", "Rent", "Coop", "Refund"],
+        "Amount": [-120.0, -80.5, 25000.0, -10.0, -8000.0, np.nan, 300.0],
+        "Category": ["Food", "Food", "Income", "Bank", "", "Food", "Food"],
+    }))
+    df["Accounting date"] = parse_dates(df["Accounting date"])[0]
+    return df
+
+
+def build(df):
+    """Return the rollup cube of df."""
+    return RollupCube(df["Category"], df["Accounting date"], df["Amount"])
+
+
+def expected_table(df, freq, measure):
+    """Return the groupby reference of a cube table."""
+    dated = df.dropna(subset=["Accounting date"])
+    amounts = dated["Amount"].fillna(0)
+    values = {
+        "net": amounts, "income": amounts.clip(lower=0), "expenses": amounts.clip(upper=0),
+        "count": pd.Series(1, index=dated.index),
+    }[measure]
+    periods = dated["Accounting date"].dt.to_period(freq).dt.start_time
+    return values.groupby([periods, dated["Category"].astype(str)]).sum()
+
+
+@pytest.mark.parametrize("period,freq", [("day", "D"), ("week", "W-SUN"), ("month", "M"), ("year", "Y")])
+def test_cube_matches_groupby(period, freq):
+    """Test that every non-empty cube cell equals the groupby over the raw rows."""
+    df = sample_df()
+    cube = build(df)
+    for measure in ["net", "income", "expenses", "count"]:
+        table = cube.table(period, measure).stack()
+        expected = expected_table(df, freq, measure)
+        for (start, category), value in expected.items():
+            assert table[(start, category)] == pytest.approx(value)
+        assert table.abs().sum() == pytest.approx(expected.abs().sum())
+
+
+def test_cube_slices():
+    """Test category selection and date bounds of a table."""
+    cube = build(sample_df())
+    food = cube.table("month", "expenses", ["Food", "Transport"], start="2025-01-15", end="2025-02-01")
+    assert food.index.strftime("%Y-%m").tolist() == ["2025-01", "2025-02"]
+    assert food["Food"].tolist() == [-80.5, 0.0]
+    assert food["Transport"].tolist() == [0.0, 0.0]
+    with pytest.raises(ValueError):
+        cube.table("quarter")
+
+
+def test_cube_follows_edits():
+    """Test that category, amount and delete updates leave the cube equal to a fresh build."""
+    df = sample_df()
+    cube = build(df)
+    cube.set_category([1, 4], "Housing")
+    cube.set_amount(2, 26000.0)
+    cube.remove(0)
+    edited = df.copy()
+    edited["Category"] = edited["Category"].astype(str)
+    edited.loc[[1, 4], "Category"] = "Housing"
+    edited.loc[2, "Amount"] = 26000.0
+    edited = edited.drop(0).reset_index(drop=True)
+    fresh = build(edited)
+    assert len(cube) == len(edited)
+    for period in PERIODS:
+        for measure in ["net", "count"]:
+            actual = cube.table(period, measure)
+            expected = fresh.table(period, measure)
+            actual = actual.loc[expected.index[0]:, expected.columns]
+            pd.testing.assert_frame_equal(actual, expected[actual.columns], check_like=True)
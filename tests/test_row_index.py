@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.row_index import RowIndex, assign_row_ids
+
+
+def test_positions_follow_deletes():
+    """Test that row ids keep pointing at their rows while rows before them are deleted."""
+    df = assign_row_ids(pd.DataFrame({"Amount": [10.0, 20.0, 30.0, 40.0]}, index=[7, 7, 3, 1]))
+    index = RowIndex(df.index)
+    assert df.index.tolist() == [0, 1, 2, 3]
+    assert index.positions([3, 0]).tolist() == [3, 0]
+    for row_id in [1, 0]:
+        df = df.drop(row_id)
+        index.remove(row_id)
+        assert index.positions(df.index).tolist() == list(range(len(df)))
+    assert index.position(3) == 1 and len(index) == 2
+    assert 0 not in index and 2 in index
+    with pytest.raises(KeyError):
+        index.position(1)
+    with pytest.raises(KeyError):
+        index.positions([2, 9])
+    assert len(RowIndex(pd.RangeIndex(0))) == 0
+    assert RowIndex(np.array([2, 0])).positions([0, 2]).tolist() == [1, 0]
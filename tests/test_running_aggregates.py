@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+from core.data_processor import get_category_summary
+from core.data_utils import calculate_summaries, normalize_transactions
+from core.running_aggregates import RunningAggregates
+
+
+def sample_df():
+    """Return normalized sample rows with an uncategorized row, a zero and a missing amount."""
+    return normalize_transactions(pd.DataFrame({
+        "Description": ["Salary", "Coop Lund", "Rent", "Coop Malmö", "Refund", "Fee"],
+        "Amount": [25000.0, -250.5, -8000.0, -90.25, 0.0, np.nan],
+        "Category": ["Income", "Food", "", "Food", "", "Bank"],
+    }))
+
+
+def assert_matches_full(aggregates, df):
+    """Assert that summary and totals equal the full recomputations over df."""
+    expected = get_category_summary(df)
+    actual = aggregates.summary()
+    assert actual["Category"].astype(str).tolist() == expected["Category"].astype(str).tolist()
+    assert actual["Total"].tolist() == expected["Total"].tolist()
+    assert aggregates.totals() == pytest.approx(calculate_summaries(df))
+
+
+def test_aggregates_match_full_recomputation():
+    """Test that a full build and row-by-row updates agree with get_category_summary and calculate_summaries."""
+    df = sample_df()
+    aggregates = RunningAggregates(df)
+    assert_matches_full(aggregates, df)
+    aggregates.remove("Food", -250.5)
+    aggregates.add("Housing", -8000.0)
+    aggregates.remove("Bank", np.nan)
+    edited = df.drop([1, 5])
+    edited.loc[len(df)] = ["Rent", -8000.0, "Housing"]
+    assert_matches_full(aggregates, edited)
+    aggregates.verify(edited)
+    assert RunningAggregates(None).totals() == (0.0, 0.0, 0.0)
+
+
+def test_verify_reports_drift():
+    """Test that verify raises when the running totals no longer match the rows."""
+    df = sample_df()
+    aggregates = RunningAggregates(df)
+    aggregates.add("Food", -1.0)
+    with pytest.raises(AssertionError):
+        aggregates.verify(df)
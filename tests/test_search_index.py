@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+from core.description_index import DescriptionIndex
+from core.data_utils import filter_dataframe
+from core.search_index import TrigramIndex
+
+
+def test_trigram_search_matches_substring_scan():
+    """Test that indexed search gives the same texts as a case-insensitive substring scan."""
+    texts = ["COMVIQ.SE", "Coop Lund", "Coop Malmö", "Rent", "Spotify AB", "ICA Nära"]
+    index = TrigramIndex(texts)
+    for term in ["coop", "CO", "o", "nära", "ify ab", "xyz", "Rent", ".se"]:
+        assert index.search(term) == {t for t in texts if term.lower() in t.lower()}
+
+
+def test_trigram_remove_drops_postings():
+    """Test that removed texts are no longer found."""
+    index = TrigramIndex(["Coop Lund", "Coop Malmö"])
+    index.remove("Coop Lund")
+    assert index.search("coop") == {"Coop Malmö"}
+    assert len(index) == 1
+
+
+def test_description_index_search_follows_edits():
+    """Test that edits and deletes through the description index update the search results."""
+    df = pd.DataFrame({"Description": ["Coop Lund", "Rent", "Coop Lund", None]})
+    index = DescriptionIndex(df["Description"])
+    assert index.search("coop") == {0, 2}
+    index.move(0, "Coop Lund", "Willys")
+    index.remove(2, "Coop Lund")
+    assert index.search("coop") == set()
+    assert index.search("willys") == {0}
+
+
+def test_filter_with_search_index_keeps_row_order():
+    """Test that filtering through the index returns the same rows, in order, as the column scan."""
+    df = pd.DataFrame({
+        "Description": ["Spotify", "Coop Lund", "Rent", "COOP Malmö", "Coop (ATM)"],
+        "Amount": [-109.0, -250.0, -8000.0, -90.0, 100.0],
+        "Category": ["Subscription", "Food", "", "Food", ""],
+    }, index=[10, 3, 7, 1, 4])
+    index = DescriptionIndex(df["Description"])
+    for term in ["coop", "(atm", "o"]:
+        expected = filter_dataframe(df, "All Categories", term, "Negative")
+        pd.testing.assert_frame_equal(filter_dataframe(df, "All Categories", term, "Negative", index), expected)
+
+
+def test_refined_search_retests_previous_matches(monkeypatch):
+    """Test that a term extending the previous one narrows the previous matches without a fresh index search."""
+    index = DescriptionIndex(pd.Series(["Spotify", "Spotlight", "Coop Lund"]))
+    assert index.matching_descriptions("spot") == {"Spotify", "Spotlight"}
+    monkeypatch.setattr(index._search, "search", lambda term: pytest.fail("expected a refinement"))
+    assert index.matching_descriptions("SPOTI") == {"Spotify"}
+    assert index.matching_descriptions("spotif") == {"Spotify"}
+
+
+def test_refinement_is_dropped_after_edits():
+    """Test that a new description added after a search is found by the next, longer term."""
+    index = DescriptionIndex(pd.Series(["Spotify", "Coop Lund"]))
+    assert index.matching_descriptions("coo") == {"Coop Lund"}
+    index.move(0, "Spotify", "Coop Malmö")
+    assert index.matching_descriptions("coop") == {"Coop Lund", "Coop Malmö"}
+
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from core.data_utils import filter_dataframe, normalize_transactions, parse_dates
+from core.sorted_index import SortedIndex
+
+
+def sample_df():
+    """Return normalized sample rows with non-sequential labels, a missing date and a missing amount."""
+    return normalize_transactions(pd.DataFrame({
+        "Accounting date": ["2025-01-03", "2025-01-01", "not a date", "2025-02-10", "2025-01-03", "2025-01-20"],
+        "Description": ["Salary", "Coop Lund", "Rent", "Coop Malmö", "Refund", "Fee"],
+        "Amount": [25000.0, -250.0, -8000.0, -90.0, 0.0, np.nan],
+        "Category": ["Income", "Food", "", "Food", "", "Bank"],
+    }, index=[5, 2, 9, 0, 7, 3]))
+
+
+def test_range_filters_match_masks():
+    """Test that index-backed date and amount ranges return the same rows, in order, as the mask filters."""
+    df = sample_df()
+    date_index, amount_index = SortedIndex(parse_dates(df["Accounting date"])[0]), SortedIndex(df["Amount"])
+    date_ranges = [None, ("2025-01-03", None), (None, "2025-01-20"), ("2025-01-02", "2025-01-31"), ("2026-01-01", None)]
+    amount_ranges = [None, (-250.0, 0.0), (None, -100.0), (0.0, None), (1.0, 2.0)]
+    for date_range in date_ranges:
+        for amount_range in amount_ranges:
+            expected = filter_dataframe(df, "All Categories", "", "All", date_range=date_range, amount_range=amount_range)
+            actual = filter_dataframe(
+                df, "All Categories", "", "All", date_range=date_range, amount_range=amount_range,
+                date_index=date_index, amount_index=amount_index,
+            )
+            pd.testing.assert_frame_equal(actual, expected)
+    assert filter_dataframe(df, date_range=("2025-01-03", "2025-01-03"), date_index=date_index)["Description"].tolist() == [
+        "Salary", "Refund"
+    ]
+
+
+def test_sorted_index_follows_edits():
+    """Test that value and delete updates keep range queries equal to a fresh build."""
+    df = sample_df()
+    index = SortedIndex(df["Amount"])
+    index.set_value(5, 10.0)
+    index.set_value(2, np.nan)
+    index.remove(0)
+    assert index.between(-500.0, 50.0).tolist() == [0, 2, 3, 4]
+    assert index.between(None, -100.0).tolist() == [0]
+    assert len(index) == 4
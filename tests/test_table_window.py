@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+from core.data_utils import normalize_transactions
+from core.table_window import TableRows, clamp_offset, diff_window, offset_for_fraction, scroll_fractions
+
+
+def sample_df():
+    """Return normalized rows with a date, a categorical and a missing value in each column."""
+    return normalize_transactions(pd.DataFrame({
+        "Accounting date": ["2025-01-03", None, "2025-02-10"],
+        "Description": ["Salary", None, "Rent"],
+        "Amount": [25000.0, np.nan, -8000.0],
+        "Category": ["Income", "", "Housing"],
+    }, index=[7, 3, 5]))
+
+
+def test_window_reads_rows_from_arrays():
+    """Test that a window returns the labels and display values of just its rows."""
+    rows = TableRows(sample_df())
+    assert len(rows) == 3
+    assert rows.columns == ["Accounting date", "Description", "Amount", "Category"]
+    labels, values = rows.window(1, 10)
+    assert labels == [3, 5]
+    assert values == [["", "", "", ""], ["2025-02-10", "Rent", -8000.0, "Housing"]]
+    assert rows.window(3, 5) == ([], [])
+    assert len(TableRows(None)) == 0
+
+
+def test_viewport_math():
+    """Test offset clamping and the mapping between scrollbar fractions and row offsets."""
+    assert clamp_offset(95, 10, 100) == 90
+    assert clamp_offset(-3, 10, 100) == 0
+    assert clamp_offset(5, 10, 4) == 0
+    assert scroll_fractions(45, 10, 100) == (0.45, 0.55)
+    assert scroll_fractions(0, 10, 4) == (0.0, 1.0)
+    assert offset_for_fraction(0.45, 10, 100) == 45
+    assert offset_for_fraction(1.0, 10, 100) == 90
+
+
+def apply_diff(shown, diff):
+    """Apply a WindowDiff to a list of (item id, values) pairs the way the table applies it to the Treeview."""
+    values = dict(shown)
+    items = [iid for iid, _ in shown if iid not in diff.deleted]
+    values.update(diff.updated)
+    for iid, index in diff.placed:
+        if iid in diff.inserted:
+            values[iid] = diff.inserted[iid]
+        else:
+            items.remove(iid)
+        items.insert(index, iid)
+    return [(iid, values[iid]) for iid in items]
+
+
+def test_diff_window_touches_changed_rows_only():
+    """Test that edits, scrolls and reorders reconcile with the fewest item operations."""
+    shown = [(i, f"row {i}") for i in range(10)]
+    edited = shown[:4] + [(4, "edited")] + shown[5:]
+    diff = diff_window(shown, edited)
+    assert len(diff) == 1 and diff.updated == [(4, "edited")]
+    scrolled = shown[1:] + [(10, "row 10")]
+    diff = diff_window(shown, scrolled)
+    assert diff.deleted == [0] and diff.placed == [(10, 9)] and not diff.updated
+    moved = shown[1:] + shown[:1]
+    diff = diff_window(shown, moved)
+    assert len(diff) == 1
+    assert apply_diff(shown, diff) == moved
+    assert len(diff_window(shown, shown)) == 0
+
+
+def test_diff_window_reconciles_any_change():
+    """Test that applying the diff always yields the new rows."""
+    rng = np.random.default_rng(7)
+    for _ in range(200):
+        shown = [(int(i), int(rng.integers(3))) for i in rng.permutation(12)[:int(rng.integers(0, 9))]]
+        rows = [(int(i), int(rng.integers(3))) for i in rng.permutation(12)[:int(rng.integers(0, 9))]]
+        assert apply_diff(shown, diff_window(shown, rows)) == rows
+
+
+def test_selection_survives_refilter():
+    """Test that the selected rows still in a re-filtered view are kept and the ones filtered out are dropped."""
+    df = sample_df()
+    selected = TableRows(df).present([7, 5, 42])
+    assert selected == {7, 5}
+    refiltered = TableRows(df.loc[[5, 3]])
+    assert refiltered.present(selected) == {5}
+    assert TableRows(None).present(selected) == set()
@@ -0,0 +1,51 @@
+import threading
+
+import pytest
+from core.tasks import TaskCancelled, TaskRunner
+
+
+def test_result_is_committed_once():
+    """Test that a task's result is applied by its commit callable exactly once."""
+    runner = TaskRunner()
+    commits = []
+    task = runner.submit("Double", lambda progress: 21, lambda value: commits.append(value) or value * 2)
+    assert task.result(timeout=5) == 42
+    assert task.result(timeout=5) == 42
+    assert commits == [21]
+    runner.shutdown()
+
+
+def test_progress_events_are_queued():
+    """Test that progress reports reach the task's queue in order."""
+    runner = TaskRunner()
+
+    def job(progress):
+        progress(0.5, "half")
+        progress(1.0, "done")
+
+    task = runner.submit("Report", job)
+    task.result(timeout=5)
+    assert [(e.fraction, e.message) for e in task.drain_progress()] == [(0.0, "Report"), (0.5, "half"), (1.0, "done")]
+    runner.shutdown()
+
+
+def test_cancel_stops_job_at_next_report():
+    """Test that a cancelled task stops at its next progress report and its result is never applied."""
+    runner = TaskRunner()
+    started, release = threading.Event(), threading.Event()
+    commits = []
+
+    def job(progress):
+        started.set()
+        release.wait(5)
+        progress(0.5, "checkpoint")
+        return "finished"
+
+    task = runner.submit("Slow", job, commits.append)
+    started.wait(5)
+    task.cancel()
+    release.set()
+    with pytest.raises(TaskCancelled):
+        task.result(timeout=5)
+    assert commits == []
+    runner.shutdown()
@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+import pandas as pd
+from core import workbook_cache
+from core.workbook_cache import WorkbookCache
+
+
+def sample_df():
+    """Return a small parsed statement with a missing description."""
+    return pd.DataFrame({
+        "Accounting date": ["2025-01-01", "2025-01-02", "2025-01-03"],
+        "Description": ["Coop Lund", np.nan, "Spotify"],
+        "Amount": [-250.0, 100.0, -109.0],
+    })
+
+
+def write_source(path, content=b"statement"):
+    """Write a stand-in workbook file and return its path."""
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_round_trip(tmp_path):
+    """Test that a cached workbook is read back with the same values and dtypes."""
+    cache = WorkbookCache(str(tmp_path / "cache"))
+    source = write_source(tmp_path / "a.xlsx")
+    assert cache.get(source) is None
+    cache.put(source, sample_df())
+    pd.testing.assert_frame_equal(cache.get(source), sample_df())
+
+
+def test_miss_then_store_hashes_once(tmp_path, monkeypatch):
+    """Test that a key computed for the lookup is reused by the store, so the workbook is hashed once."""
+    digests = []
+    file_digest = workbook_cache._file_digest
+    monkeypatch.setattr(workbook_cache, "_file_digest", lambda path: digests.append(path) or file_digest(path))
+    cache = WorkbookCache(str(tmp_path / "cache"))
+    source = write_source(tmp_path / "a.xlsx")
+    key = cache.key(source)
+    assert cache.get(source, key=key) is None
+    cache.put(source, sample_df(), key=key)
+    assert len(digests) == 1
+    pd.testing.assert_frame_equal(cache.get(source), sample_df())
+
+
+def test_changed_file_or_options_miss(tmp_path):
+    """Test that changing the file content or the parse options invalidates the entry."""
+    cache = WorkbookCache(str(tmp_path / "cache"))
+    source = write_source(tmp_path / "a.xlsx")
+    cache.put(source, sample_df(), "skiprows=7")
+    assert cache.get(source, "skiprows=8") is None
+    write_source(tmp_path / "a.xlsx", b"changed statement")
+    assert cache.get(source, "skiprows=7") is None
+
+
+def test_eviction_keeps_recently_used(tmp_path):
+    """Test that the least recently used entry is evicted once the size cap is exceeded."""
+    cache = WorkbookCache(str(tmp_path / "cache"))
+    first = write_source(tmp_path / "a.xlsx", b"a")
+    second = write_source(tmp_path / "b.xlsx", b"b")
+    cache.put(first, sample_df())
+    os.utime(os.path.join(cache.cache_dir, cache.key(first), "meta.json"), (0, 0))
+    cache.max_bytes = cache.size_bytes() + 1
+    cache.put(second, sample_df())
+    assert cache.get(first) is None
+    assert cache.get(second) is not None
+
+
+def test_clear(tmp_path):
+    """Test that clear removes every entry and reports how many there were."""
+    cache = WorkbookCache(str(tmp_path / "cache"))
+    cache.put(write_source(tmp_path / "a.xlsx", b"a"), sample_df())
+    cache.put(write_source(tmp_path / "b.xlsx", b"b"), sample_df())
+    assert cache.clear() == 2
+    assert cache.size_bytes() == 0